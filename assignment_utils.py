@@ -1,16 +1,10 @@
 import sqlite3
 import os
+import threading
 import streamlit as st
 import pandas as pd
 from config import get_allowed_assignment_types
-from google_drive_utils import (
-    authenticate_google_drive,
-    search_file,
-    update_file,
-    upload_file,
-    delete_file
-)
-from googleapiclient.discovery import build
+from drive_sync import enqueue_delete, enqueue_upload
 
 def _active_assignment_types():
     """
@@ -24,23 +18,37 @@ def _active_assignment_types():
     # Fallback to global/default
     return [str(x) for x in get_allowed_assignment_types()]
 
-def init_db(db_name: str = "assignments.db"):
-    """
-    Initialize (or connect to) the SQLite database for assignments.
-    """
-    conn = sqlite3.connect(db_name)
-    cursor = conn.cursor()
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS assignments (
-            student_id TEXT NOT NULL,
-            assignment_type TEXT NOT NULL,
-            course TEXT NOT NULL,
-            PRIMARY KEY (student_id, assignment_type)
-        )
-    ''')
-    conn.commit()
+_SCHEMA = '''
+    CREATE TABLE IF NOT EXISTS assignments (
+        student_id TEXT NOT NULL,
+        assignment_type TEXT NOT NULL,
+        course TEXT NOT NULL,
+        PRIMARY KEY (student_id, assignment_type)
+    )
+'''
+
+# One connection per database file, reused by every session (Streamlit runs each session's
+# script in its own thread, hence the lock around every use)
+_connections = {}
+_db_lock = threading.RLock()
+
+def _connection(db_path: str):
+    """The shared connection to `db_path`, opened in WAL mode on first use. Hold _db_lock."""
+    key = os.path.abspath(db_path)
+    conn = _connections.get(key)
+    if conn is None:
+        conn = sqlite3.connect(db_path, check_same_thread=False, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(_SCHEMA)
+        conn.commit()
+        _connections[key] = conn
     return conn
 
+def _close_connection(db_path: str):
+    conn = _connections.pop(os.path.abspath(db_path), None)
+    if conn is not None:
+        conn.close()
+
 def save_assignment(conn, student_id: str, course_code: str, assignment_type: str):
     """
     Insert (or replace) a single assignment row into the SQLite DB.
@@ -97,11 +105,10 @@ def load_assignments(db_path: str = "assignments.db", csv_path: str = "sce_fec_a
             st.warning(f"Could not read assignments CSV '{csv_path}': {e}")
 
     # 2) Fallback to SQLite DB
-    conn = init_db(db_path)
-    cursor = conn.cursor()
-    cursor.execute('SELECT student_id, course, assignment_type FROM assignments')
-    rows = cursor.fetchall()
-    conn.close()
+    with _db_lock:
+        rows = _connection(db_path).execute(
+            'SELECT student_id, course, assignment_type FROM assignments'
+        ).fetchall()
 
     assignments = {}
     for student_id, course_code, assignment_type in rows:
@@ -179,7 +186,7 @@ def save_assignments(
     assignments: dict,
     db_path: str = "assignments.db",
     csv_path: str = "sce_fec_assignments.csv"
-):
+) -> bool:
     """
     Persist `assignments` both to the local SQLite DB and to a CSV for Drive syncing.
 
@@ -189,49 +196,66 @@ def save_assignments(
         "2017012345": {"S.C.E.": "PBHL201"},
          ...
       }
+
+    The DB (shared by all Majors) receives only the difference to its rows, in one
+    transaction. The CSV, this Major's source of truth (see load_assignments), is rewritten
+    and queued for Drive only when its content changes.
+    Returns whether the CSV changed.
     """
-    # --- 1) Persist to SQLite DB ---
-    conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
-    # Clear table to exactly mirror the in-memory mapping
-    cursor.execute('DELETE FROM assignments')
-    for student_id, assign_map in assignments.items():
-        for assignment_type, course in assign_map.items():
-            if assignment_type == "_note":
-                continue
-            cursor.execute('''
+    rows = {
+        (str(student_id), assignment_type): course
+        for student_id, assign_map in assignments.items()
+        for assignment_type, course in assign_map.items()
+        if assignment_type != "_note"
+    }
+
+    # --- 1) Apply the delta to the SQLite DB, which mirrors the in-memory mapping ---
+    with _db_lock:
+        conn = _connection(db_path)
+        stored = {
+            (student_id, assignment_type): course
+            for student_id, assignment_type, course in conn.execute(
+                'SELECT student_id, assignment_type, course FROM assignments'
+            )
+        }
+        removed = [key for key in stored if key not in rows]
+        changed = [
+            (sid, atype, course) for (sid, atype), course in rows.items()
+            if stored.get((sid, atype)) != course
+        ]
+        with conn:
+            conn.executemany(
+                'DELETE FROM assignments WHERE student_id = ? AND assignment_type = ?', removed
+            )
+            conn.executemany('''
                 INSERT OR REPLACE INTO assignments (student_id, assignment_type, course)
                 VALUES (?, ?, ?)
-            ''', (student_id, assignment_type, course))
-    conn.commit()
-    conn.close()
+            ''', changed)
+
+    if _csv_rows(csv_path) == rows:
+        return False
 
     # --- 2) Persist to CSV for Google Drive syncing ---
-    rows = []
-    for student_id, assign_map in assignments.items():
-        for assignment_type, course in assign_map.items():
-            if assignment_type == "_note":
-                continue
-            rows.append({
-                "student_id": student_id,
-                "assignment_type": assignment_type,
-                "course": course
-            })
-    pd.DataFrame(rows).to_csv(csv_path, index=False)
+    pd.DataFrame(
+        [(sid, atype, course) for (sid, atype), course in rows.items()],
+        columns=["student_id", "assignment_type", "course"]
+    ).to_csv(csv_path, index=False)
 
-    # --- 3) Sync to Google Drive ---
+    # --- 3) Sync to Google Drive in the background (see drive_sync) ---
+    enqueue_upload(csv_path, csv_path)
+    st.info("Assignments saved; they are syncing to Google Drive in the background.")
+    return True
+
+def _csv_rows(csv_path: str):
+    """(student_id, assignment_type) → course as stored in the CSV; None if it is missing or unreadable."""
     try:
-        creds = authenticate_google_drive()
-        service = build("drive", "v3", credentials=creds)
-        file_id = search_file(service, csv_path)
-        if file_id:
-            update_file(service, file_id, csv_path)
-            st.info("Assignments file updated on Google Drive.")
-        else:
-            upload_file(service, csv_path, csv_path)
-            st.info("Assignments file uploaded to Google Drive.")
-    except Exception as e:
-        st.error(f"Error syncing assignments with Google Drive: {e}")
+        df = pd.read_csv(csv_path, dtype=str, keep_default_na=False)
+        return {
+            (sid, atype): course
+            for sid, atype, course in df[["student_id", "assignment_type", "course"]].itertuples(index=False)
+        }
+    except Exception:
+        return None
 
 def reset_assignments(csv_path: str = "sce_fec_assignments.csv", db_path: str = "assignments.db"):
     """
@@ -244,16 +268,12 @@ def reset_assignments(csv_path: str = "sce_fec_assignments.csv", db_path: str =
     if os.path.exists(csv_path):
         os.remove(csv_path)
 
-    # 2) Remove from Google Drive
-    try:
-        creds = authenticate_google_drive()
-        service = build("drive", "v3", credentials=creds)
-        file_id = search_file(service, csv_path)
-        if file_id:
-            delete_file(service, file_id)
-    except Exception as e:
-        st.error(f"Error resetting assignments on Google Drive: {e}")
+    # 2) Remove from Google Drive (in the background, see drive_sync)
+    enqueue_delete(csv_path)
 
-    # 3) Remove local DB
-    if os.path.exists(db_path):
-        os.remove(db_path)
+    # 3) Remove local DB (with its WAL files), closing the shared connection first
+    with _db_lock:
+        _close_connection(db_path)
+        for path in (db_path, f"{db_path}-wal", f"{db_path}-shm"):
+            if os.path.exists(path):
+                os.remove(path)
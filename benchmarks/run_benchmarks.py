@@ -0,0 +1,168 @@
+"""
+Times the ingestion → processing → export path on synthetic progress reports.
+
+    python benchmarks/run_benchmarks.py                       # 500, 2000, 5000 students
+    python benchmarks/run_benchmarks.py --students 10000 --formats wide --file-types csv
+    python benchmarks/run_benchmarks.py --engines vectorized,legacy --output results.json
+
+For every scale and format a report is generated, written to a temporary file and pushed
+through read_progress_report, transform_wide_format (wide only), process_progress_report,
+calculate_credits (row‐wise and batch), extract_primary_grade_from_full_value and
+save_report_with_formatting. Each stage reports the best and median of --repeat runs, in
+seconds; results are printed as JSON (and written to --output if given).
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import warnings
+from datetime import datetime
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from config import extract_primary_grade_from_full_value  # noqa: E402
+from data_processing import (  # noqa: E402
+    calculate_credits,
+    calculate_credits_batch,
+    process_progress_report,
+    read_progress_report,
+    save_report_with_formatting,
+    transform_wide_format,
+)
+from synthetic import (  # noqa: E402
+    SyntheticConfig,
+    generate_assignments,
+    generate_long,
+    generate_rules,
+    to_wide,
+)
+
+
+def _time(func, repeat: int, setup=None):
+    """
+    Runs func() `repeat` times; returns (last result, {best, median, runs}).
+    With `setup`, each run is func(setup()) and setup() is not timed.
+    """
+    timings, result = [], None
+    for _ in range(repeat):
+        args = () if setup is None else (setup(),)
+        start = time.perf_counter()
+        result = func(*args)
+        timings.append(time.perf_counter() - start)
+    return result, {"best": min(timings), "median": statistics.median(timings), "runs": len(timings)}
+
+
+def _write_report(df: pd.DataFrame, folder: str, name: str, file_type: str) -> str:
+    path = os.path.join(folder, f"{name}.{file_type}")
+    if file_type == "csv":
+        df.to_csv(path, index=False)
+    else:
+        df.to_excel(path, index=False)
+    return path
+
+
+def run_case(cfg: SyntheticConfig, fmt: str, file_type: str, engines: list, repeat: int, folder: str) -> dict:
+    long_df = generate_long(cfg)
+    target_courses, intensive_courses, target_rules, intensive_rules = generate_rules(cfg)
+    assignments = generate_assignments(long_df, seed=cfg.seed)
+    sheet = to_wide(long_df) if fmt == "wide" else long_df
+    path = _write_report(sheet, folder, f"report_{fmt}_{cfg.students}", file_type)
+
+    stages = {}
+    df, stages["read_progress_report"] = _time(lambda: read_progress_report(path), repeat)
+    if fmt == "wide":
+        _, stages["transform_wide_format"] = _time(lambda: transform_wide_format(sheet), repeat)
+
+    args = (target_courses, intensive_courses, target_rules, intensive_rules, assignments, {})
+    for engine in engines:
+        # Every run gets its own copy: the legacy engine adds columns to the frame it is given
+        result, stages[f"process_progress_report[{engine}]"] = _time(
+            lambda frame: process_progress_report(frame, *args, engine=engine), repeat, setup=df.copy
+        )
+    required = result[0]
+
+    _, stages["calculate_credits"] = _time(
+        lambda: required.apply(lambda row: calculate_credits(row, target_courses), axis=1), repeat
+    )
+    credits, stages["calculate_credits_batch"] = _time(
+        lambda: calculate_credits_batch(required, target_courses), repeat
+    )
+    course_cols = list(target_courses)
+    _, stages["extract_primary_grade_from_full_value"] = _time(
+        lambda: required[course_cols].map(extract_primary_grade_from_full_value), repeat
+    )
+    displayed = pd.concat([required, credits], axis=1)
+    intensive = result[1]
+    _, stages["save_report_with_formatting"] = _time(
+        lambda: save_report_with_formatting(displayed, intensive, "benchmark"), repeat
+    )
+
+    return {
+        "students": cfg.students,
+        "format": fmt,
+        "file_type": file_type,
+        "rows": len(long_df),
+        "courses": cfg.courses,
+        "rule_ranges": cfg.rule_ranges,
+        "file_bytes": os.path.getsize(path),
+        "stages": stages,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--students", default="500,2000,5000", help="comma‐separated scales")
+    parser.add_argument("--courses", type=int, default=80)
+    parser.add_argument("--attempts", type=int, default=30, help="mean attempts per student")
+    parser.add_argument("--rule-ranges", type=int, default=2, help="term‐bounded rules per course")
+    parser.add_argument("--formats", default="long,wide")
+    parser.add_argument("--file-types", default="xlsx", help="xlsx and/or csv")
+    parser.add_argument("--engines", default="vectorized", help="vectorized and/or legacy")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="also write the JSON results to this path")
+    args = parser.parse_args(argv)
+
+    results = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "platform": platform.platform(),
+        "cases": [],
+    }
+    # read_progress_report reports problems through st.error; outside Streamlit that only warns
+    warnings.filterwarnings("ignore")
+    with tempfile.TemporaryDirectory() as folder:
+        for students in [int(s) for s in args.students.split(",")]:
+            cfg = SyntheticConfig(
+                students=students,
+                courses=args.courses,
+                attempts_per_student=args.attempts,
+                rule_ranges=args.rule_ranges,
+                seed=args.seed,
+            )
+            for fmt in args.formats.split(","):
+                for file_type in args.file_types.split(","):
+                    case = run_case(cfg, fmt, file_type, args.engines.split(","), args.repeat, folder)
+                    results["cases"].append(case)
+                    print(f"{students} students, {fmt}/{file_type}: " + ", ".join(
+                        f"{name} {timing['best']:.3f}s" for name, timing in case["stages"].items()
+                    ), file=sys.stderr)
+
+    text = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text)
+    print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Times the Drive sync paths offline, against a LocalBackend with injected latency and failures.
+
+    python benchmarks/sync_benchmark.py                          # 50 ms per call, no failures
+    python benchmarks/sync_benchmark.py --latency 0.2 --failure-rate 0.1 --saves 50
+
+Two stages, each in a fresh temporary directory:
+
+    prefetch   fetching a Major's artifacts one after another, then with prefetch_major
+    sync       draining --saves queued uploads through the write‐behind queue; failed
+               transfers are retried (with the backoff disabled) until the queue is empty
+
+Results are printed as JSON (and written to --output if given).
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import drive_sync  # noqa: E402
+from drive_sync import DriveSyncQueue, storage_transfer  # noqa: E402
+from storage import MAJOR_ARTIFACTS, LocalBackend, fetch_artifact, prefetch_major, set_storage  # noqa: E402
+
+
+def _seed_store(backend: LocalBackend, major: str, folder: str):
+    for name in [names[-1] for names in MAJOR_ARTIFACTS]:  # the original upload, not a snapshot
+        path = os.path.join(folder, name)
+        with open(path, "w") as f:
+            f.write("x" * 4096)
+        backend.upload(path, f"configs/{major}/{name}")
+
+
+def bench_prefetch(latency: float, major: str = "PBHL") -> dict:
+    with tempfile.TemporaryDirectory() as folder:
+        os.chdir(folder)
+        backend = LocalBackend(os.path.join(folder, "store"), latency=latency)
+        _seed_store(backend, major, folder)
+        os.makedirs(os.path.join("configs", major))
+
+        start = time.perf_counter()
+        for names in MAJOR_ARTIFACTS:
+            for name in names:
+                if fetch_artifact(f"configs/{major}/{name}", os.path.join("configs", major, name), backend):
+                    break
+        sequential = time.perf_counter() - start
+
+        for name in os.listdir(os.path.join("configs", major)):
+            os.remove(os.path.join("configs", major, name))
+        start = time.perf_counter()
+        for future in prefetch_major(major, backend):
+            future.result()
+        concurrent = time.perf_counter() - start
+    return {"artifacts": len(MAJOR_ARTIFACTS), "sequential": sequential, "concurrent": concurrent}
+
+
+def bench_sync(latency: float, failure_rate: float, saves: int, seed: int) -> dict:
+    with tempfile.TemporaryDirectory() as folder:
+        backend = LocalBackend(os.path.join(folder, "store"), latency=latency, failure_rate=failure_rate, seed=seed)
+        set_storage(backend)
+        queue = DriveSyncQueue(os.path.join(folder, "sync.db"), storage_transfer, background=False)
+        for i in range(saves):
+            path = os.path.join(folder, f"save_{i}.csv")
+            with open(path, "w") as f:
+                f.write(f"{i}\n")
+            queue.enqueue(path, f"configs/PBHL/save_{i}.csv")
+
+        start, rounds = time.perf_counter(), 0
+        while queue.process_due() is not None:
+            rounds += 1
+        elapsed = time.perf_counter() - start
+        set_storage(None)
+    return {
+        "saves": saves,
+        "seconds": elapsed,
+        "saves_per_second": saves / elapsed if elapsed else None,
+        "transfers": backend.calls["upload"],
+        "retry_rounds": rounds,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds per storage call")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="share of storage calls that fail")
+    parser.add_argument("--saves", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="also write the JSON results to this path")
+    args = parser.parse_args(argv)
+
+    # Retry failed transfers at once instead of after the production backoff
+    drive_sync.BACKOFF_BASE_SECONDS = 0
+    cwd = os.getcwd()
+    try:
+        results = {
+            "latency": args.latency,
+            "failure_rate": args.failure_rate,
+            "prefetch": bench_prefetch(args.latency),
+            "sync": bench_sync(args.latency, args.failure_rate, args.saves, args.seed),
+        }
+    finally:
+        os.chdir(cwd)
+
+    text = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text)
+    print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Synthetic progress reports for benchmarking.
+
+Reports mimic the uploaded "Students Academic Progress" sheets: per student a random
+number of attempts over a course catalogue (with retakes), grades drawn from the grade mix
+of a real sheet (blank = currently registered), and each course configured with one or more
+term‐bounded rules, as courses_config.csv would define them.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from config import sem_to_ord
+
+# Grade mix of a real COPH sheet; "" is a current registration
+GRADE_WEIGHTS = {
+    "": 164, "F": 120, "C": 117, "P": 112, "D": 90, "C-": 89, "D+": 77, "B-": 68, "D-": 64,
+    "C+": 58, "B": 49, "B+": 39, "W": 33, "A-": 24, "A": 15, "R": 13, "P*": 7,
+}
+SEMESTERS = ["FALL", "SPRING", "SUMMER"]  # academic‐year order (config.SEMESTER_OFFSETS)
+PASSING_GRADES = ["A+,A,A-,B+,B,B-,C+,C,C-,D+,D,D-,P", "A+,A,A-,B+,B,B-,C+,C,C-,P", "A+,A,A-,B+,B,B-,P"]
+
+
+@dataclass
+class SyntheticConfig:
+    students: int = 1000
+    courses: int = 80                 # catalogue size; about a third are outside the rules (extras)
+    attempts_per_student: int = 30    # mean; actual counts vary ±50%
+    intensive_share: float = 0.15     # share of configured courses that are Intensive
+    rule_ranges: int = 2              # term‐bounded rules per configured course
+    first_year: int = 2015
+    last_year: int = 2024
+    seed: int = 0
+
+
+def generate_long(cfg: SyntheticConfig) -> pd.DataFrame:
+    """Long‐format report: ['ID','NAME','Course','Grade','Year','Semester'] (strings, as read)."""
+    rng = np.random.default_rng(cfg.seed)
+    low = max(1, cfg.attempts_per_student // 2)
+    counts = rng.integers(low, cfg.attempts_per_student + low + 1, size=cfg.students)
+    student = np.repeat(np.arange(cfg.students), counts)
+    n = len(student)
+
+    grades = np.array(list(GRADE_WEIGHTS))
+    weights = np.array(list(GRADE_WEIGHTS.values()), dtype=float)
+    catalogue = np.array(course_codes(cfg.courses))
+
+    return pd.DataFrame({
+        "ID": (2015000000 + student).astype(str),
+        "NAME": np.char.add("Student ", student.astype(str)),
+        "Course": catalogue[rng.integers(0, cfg.courses, size=n)],
+        "Grade": grades[rng.choice(len(grades), size=n, p=weights / weights.sum())],
+        "Year": rng.integers(cfg.first_year, cfg.last_year + 1, size=n).astype(str),
+        "Semester": np.array([s.title() for s in SEMESTERS])[rng.integers(0, 3, size=n)],
+    })
+
+
+def to_wide(long_df: pd.DataFrame) -> pd.DataFrame:
+    """Wide‐format sheet: STUDENT ID, NAME, CURRICULUM, COURSE 1..N cells 'CODE/SEM-YYYY/GRADE'."""
+    cells = (
+        long_df["Course"] + "/" + long_df["Semester"].str.upper() + "-" + long_df["Year"] + "/" + long_df["Grade"]
+    )
+    slot = long_df.groupby("ID", sort=False).cumcount() + 1
+    wide = (
+        pd.DataFrame({"STUDENT ID": long_df["ID"], "NAME": long_df["NAME"], "Slot": slot, "Cell": cells})
+        .pivot(index=["STUDENT ID", "NAME"], columns="Slot", values="Cell")
+        .reset_index()
+    )
+    wide.columns = ["STUDENT ID", "NAME"] + [f"COURSE {c}" for c in wide.columns[2:]]
+    wide.insert(2, "CURRICULUM", "PUBHEA")
+    return wide
+
+
+def course_codes(count: int) -> list:
+    prefixes = ["PBHL", "MATH", "ENGL", "BIOL", "CHEM", "ARAB", "INEG", "SPTH", "PSYC", "HIST"]
+    return [f"{prefixes[i % len(prefixes)]}{200 + i:03d}" for i in range(count)]
+
+
+def generate_rules(cfg: SyntheticConfig):
+    """
+    Returns (target_courses, intensive_courses, target_rules, intensive_rules) for the first
+    two thirds of the catalogue, each course with `rule_ranges` consecutive term ranges.
+    """
+    rng = np.random.default_rng(cfg.seed + 1)
+    configured = course_codes(cfg.courses)[: max(1, cfg.courses * 2 // 3)]
+    n_intensive = int(len(configured) * cfg.intensive_share)
+
+    years = np.linspace(cfg.first_year, cfg.last_year + 1, cfg.rule_ranges + 1).astype(int)
+    target_courses, intensive_courses, target_rules, intensive_rules = {}, {}, {}, {}
+    for i, course in enumerate(configured):
+        credits = int(rng.choice([0, 3, 3, 3, 4]))
+        rules = []
+        for r in range(cfg.rule_ranges):
+            rules.append({
+                "Credits": credits,
+                "PassingGrades": PASSING_GRADES[(i + r) % len(PASSING_GRADES)],
+                "FromOrd": sem_to_ord("" if r == 0 else f"FALL-{years[r]}", lower=True),
+                "ToOrd": sem_to_ord(
+                    "" if r == cfg.rule_ranges - 1 else f"SUMMER-{years[r + 1] - 1}", lower=False
+                ),
+            })
+        if i < n_intensive:
+            intensive_courses[course] = credits
+            intensive_rules[course] = rules
+        else:
+            target_courses[course] = credits
+            target_rules[course] = rules
+    return target_courses, intensive_courses, target_rules, intensive_rules
+
+
+def generate_assignments(long_df: pd.DataFrame, share: float = 0.3, seed: int = 0) -> dict:
+    """S.C.E/F.E.C assignments for a share of students, using one of their own courses."""
+    rng = np.random.default_rng(seed)
+    firsts = long_df.drop_duplicates("ID")
+    picked = firsts[rng.random(len(firsts)) < share]
+    return {sid: {"S.C.E": course} for sid, course in zip(picked["ID"], picked["Course"])}
@@ -0,0 +1,183 @@
+"""
+Bulk loading of progress reports: every sheet of every workbook, every CSV and every report
+inside a zip archive (read in memory, never extracted), parsed concurrently in a process pool
+and concatenated in the `apply_report_schema` layout.
+"""
+
+import io
+import multiprocessing
+import os
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import NamedTuple
+
+import pandas as pd
+
+from data_processing import (
+    _normalize_long_format,
+    _stream_xlsx_columns,
+    apply_report_schema,
+    parse_wide_sheet,
+)
+from logging_utils import log_action
+
+REPORT_EXTENSIONS = ('.xlsx', '.xls', '.csv')
+
+
+class ReportSource(NamedTuple):
+    """One sheet to parse: a file on disk, or a member of a zip archive at `path`."""
+    path: str
+    member: str = None
+    sheet: str = None  # None for CSV files
+
+    @property
+    def label(self) -> str:
+        return self.label_for(os.path.basename(self.path))
+
+    def label_for(self, name: str) -> str:
+        """The label with `name` shown for the file at `path` (e.g. the name it was uploaded as)."""
+        if self.member:
+            name = f"{name}/{self.member}"
+        return f"{name} [{self.sheet}]" if self.sheet else name
+
+
+class SourceResult(NamedTuple):
+    source: ReportSource
+    rows: int
+    malformed: pd.DataFrame  # wide‐format cells that were skipped (see transform_wide_format)
+    error: str               # why nothing was read from the source, else None
+
+
+def _is_report_name(name: str) -> bool:
+    base = os.path.basename(name)
+    # Skip macOS resource forks and Office lock files
+    return (
+        name.lower().endswith(REPORT_EXTENSIONS)
+        and '__MACOSX/' not in name
+        and not base.startswith(('.', '~$'))
+    )
+
+
+def _open(path: str, member: str = None):
+    """A binary file object for a file, or for a zip member read into memory."""
+    if member is None:
+        return open(path, 'rb')
+    with zipfile.ZipFile(path) as archive:
+        return io.BytesIO(archive.read(member))
+
+
+def _sheet_names(path: str, member: str = None) -> list:
+    name = (member or path).lower()
+    if name.endswith('.csv'):
+        return [None]
+    with _open(path, member) as f:
+        if name.endswith('.xlsx'):
+            from openpyxl import load_workbook
+            workbook = load_workbook(f, read_only=True)
+            try:
+                return list(workbook.sheetnames)
+            finally:
+                workbook.close()
+        return list(pd.ExcelFile(f).sheet_names)
+
+
+def list_report_sources(paths) -> list:
+    """
+    Every sheet to parse under `paths` (report files and .zip archives of them).
+    A file whose sheets cannot be listed yields one source, so its parse reports the error.
+    Within an archive, repeated copies of a file are listed once.
+    """
+    sources = []
+    for path in paths:
+        if path.lower().endswith('.zip'):
+            try:
+                with zipfile.ZipFile(path) as archive:
+                    # Copies of the same file (same CRC and size) are parsed once
+                    members = list({
+                        (info.CRC, info.file_size): info.filename
+                        for info in reversed(archive.infolist()) if _is_report_name(info.filename)
+                    }.values())[::-1]
+            except (OSError, zipfile.BadZipFile):
+                sources.append(ReportSource(path))
+                continue
+        else:
+            members = [None]
+        for member in members:
+            try:
+                sheets = _sheet_names(path, member)
+            except Exception:
+                sheets = [None]
+            sources.extend(ReportSource(path, member, sheet) for sheet in sheets)
+    return sources
+
+
+def _read_sheet(source: ReportSource) -> pd.DataFrame:
+    name = (source.member or source.path).lower()
+    with _open(source.path, source.member) as f:
+        if name.endswith('.csv'):
+            return pd.read_csv(f)
+        if name.endswith('.xlsx'):
+            return _stream_xlsx_columns(f, source.sheet)[1]
+        if name.endswith('.xls'):
+            return pd.read_excel(f, sheet_name=source.sheet)
+    raise ValueError("Unsupported file format.")
+
+
+def parse_report_source(source: ReportSource):
+    """
+    Parses one sheet, long format first, else wide. Runs in worker processes, so it makes
+    no Streamlit calls. Returns (SourceResult, DataFrame in the report schema or None).
+    """
+    no_cells = pd.DataFrame(columns=['Row', 'ID', 'Column', 'Value'])
+    try:
+        raw = _read_sheet(source)
+        long_df = _normalize_long_format(raw)
+        malformed = no_cells
+        if long_df is None:
+            long_df, malformed, problem = parse_wide_sheet(raw)
+            if problem:
+                return SourceResult(source, 0, no_cells, problem), None
+        df = apply_report_schema(long_df)
+    except Exception as e:
+        return SourceResult(source, 0, no_cells, f"{type(e).__name__}: {e}"), None
+    return SourceResult(source, len(df), malformed, None), df
+
+
+def concat_reports(frames: list) -> pd.DataFrame:
+    """Concatenates frames in the report schema, unioning their categories."""
+    columns = {}
+    for col in frames[0].columns:
+        if isinstance(frames[0][col].dtype, pd.CategoricalDtype):
+            columns[col] = pd.api.types.union_categoricals(
+                [f[col].array for f in frames], sort_categories=True
+            )
+        else:
+            columns[col] = pd.concat([f[col] for f in frames], ignore_index=True)
+    return pd.DataFrame(columns)
+
+
+def load_progress_reports(paths, max_workers: int = None):
+    """
+    Parses every report sheet under `paths` concurrently and concatenates the results;
+    rows repeated across sources (e.g. overlapping term archives) are kept once.
+    Returns (DataFrame or None if nothing was read, [SourceResult, ...] in source order).
+    """
+    start = time.perf_counter()
+    sources = list_report_sources(paths)
+    workers = min(len(sources), max_workers or os.cpu_count() or 1)
+    if workers > 1:
+        # Spawned, not forked: the Streamlit server process runs many threads
+        with ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context('spawn')) as pool:
+            parsed = list(pool.map(parse_report_source, sources))
+    else:
+        parsed = [parse_report_source(source) for source in sources]
+
+    results = [result for result, _ in parsed]
+    frames = [df for _, df in parsed if df is not None and len(df)]
+    df = concat_reports(frames).drop_duplicates(ignore_index=True) if frames else None
+    log_action(
+        f"Bulk loaded {len(frames)} of {len(sources)} sheets from {len(paths)} files: "
+        f"{0 if df is None else len(df)} rows in {time.perf_counter() - start:.2f}s"
+    )
+    return df, results
@@ -1,3 +1,4 @@
+import pandas as pd
 import streamlit as st
 
 # Your existing grade order, with "CR" first so it's highest priority if you collapse later.
@@ -9,6 +10,35 @@ GRADE_ORDER = [
     "D+", "D", "D-"
 ]
 
+# Term ordinals used by the per‐term course rules (FromSemester/ToSemester) and to order
+# attempts. Terms are labelled by academic year, which starts in the fall: FALL-2016 is
+# followed by SPRING-2016, SUMMER-2016 and then FALL-2017
+SEMESTER_OFFSETS = {"FALL": 0, "SPRING": 1, "SUMMER": 2}
+
+def sem_to_ord(s: str, lower: bool):
+    """
+    Converts a 'FALL-2016' style bound into its term ordinal.
+    Blank bounds are open: -inf for a lower bound, +inf for an upper bound.
+    """
+    if pd.isna(s) or str(s).strip() == "":
+        return float('-inf') if lower else float('inf')
+    sem, yr = str(s).split("-")
+    return int(yr) * 3 + SEMESTER_OFFSETS[sem.upper()]
+
+def grade_term_ord(semester, year):
+    """
+    Term ordinal of a single grade row (same scale as `sem_to_ord`),
+    or None if the Semester/Year cannot be interpreted.
+    """
+    offset = SEMESTER_OFFSETS.get(str(semester).strip().upper())
+    try:
+        yr = float(str(year).strip())
+    except ValueError:
+        return None
+    if offset is None or yr != yr:
+        return None
+    return yr * 3 + offset
+
 def get_allowed_assignment_types():
     """
     Returns the list of assignment types.
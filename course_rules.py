@@ -0,0 +1,124 @@
+"""Compiled, cached course rules for a Major's courses_config.csv."""
+
+import glob
+import os
+import pickle
+from dataclasses import dataclass
+
+import pandas as pd
+
+from config import SEMESTER_OFFSETS, sem_to_ord
+from data_processing import RuleIndex, compile_rule_index
+from utilities import file_sha256
+
+REQUIRED_COLUMNS = {"Course", "Credits", "PassingGrades", "Type", "FromSemester", "ToSemester"}
+
+# Bump when the pickled layout of CourseRuleSet/RuleIndex changes
+_CACHE_VERSION = 1
+_MEMORY_CACHE_SIZE = 16
+_memory_cache: dict = {}
+
+
+@dataclass(frozen=True, eq=False)
+class CourseRuleSet:
+    """
+    courses_config.csv compiled once: per‐course credits, the rule lists in the dict form the
+    pages and the legacy engine use, and a RuleIndex (credit, term‐range and frozen
+    passing‐grade arrays) that the vectorized engine consumes directly.
+    """
+    sha: str
+    target_courses: dict    # Required: { course: credits }
+    intensive_courses: dict # Intensive: { course: credits }
+    target_rules: dict      # { course: [ {Credits, PassingGrades, FromOrd, ToOrd}, ... ] }
+    intensive_rules: dict
+    index: RuleIndex
+
+
+def compile_course_rules(courses_df: pd.DataFrame, sha: str = "") -> CourseRuleSet:
+    """
+    Compiles a courses configuration table. Raises ValueError if required columns are missing
+    or a FromSemester/ToSemester value is not 'FALL-YYYY', 'SPRING-YYYY' or 'SUMMER-YYYY'.
+    """
+    missing = REQUIRED_COLUMNS - set(courses_df.columns)
+    if missing:
+        raise ValueError("CSV must contain columns: " + ", ".join(sorted(REQUIRED_COLUMNS)))
+
+    try:
+        table = pd.DataFrame({
+            "Course": courses_df["Course"].astype(str).str.strip().str.upper(),
+            "Credits": courses_df["Credits"].astype(int),
+            "PassingGrades": courses_df["PassingGrades"].astype(str).str.strip(),
+            "Type": courses_df["Type"].astype(str).str.strip().str.lower(),
+            "FromOrd": [sem_to_ord(s, lower=True) for s in courses_df["FromSemester"]],
+            "ToOrd": [sem_to_ord(s, lower=False) for s in courses_df["ToSemester"]],
+        })
+    except (KeyError, ValueError) as e:
+        raise ValueError(f"Invalid courses configuration: {e}") from e
+
+    target_rules, intensive_rules = {}, {}
+    required_credits, intensive_credits = {}, {}
+    for course, creds, pg, typ, fr_ord, to_ord in table.itertuples(index=False, name=None):
+        rule_dict = {
+            "Credits":       int(creds),
+            "PassingGrades": pg,
+            "FromOrd":       fr_ord,
+            "ToOrd":         to_ord
+        }
+        if typ == "required":
+            required_credits[course] = int(creds)
+            target_rules.setdefault(course, []).append(rule_dict)
+        else:
+            intensive_credits[course] = int(creds)
+            intensive_rules.setdefault(course, []).append(rule_dict)
+
+    return CourseRuleSet(
+        sha=sha,
+        target_courses=required_credits,
+        intensive_courses=intensive_credits,
+        target_rules=target_rules,
+        intensive_rules=intensive_rules,
+        index=compile_rule_index(target_rules, intensive_rules),
+    )
+
+
+def _pickle_version() -> tuple:
+    """Pickles are only valid for this layout and the term scale their FromOrd/ToOrd are on."""
+    return _CACHE_VERSION, tuple(sorted(SEMESTER_OFFSETS.items()))
+
+
+def load_course_rule_set(csv_path: str) -> CourseRuleSet:
+    """
+    Returns the compiled rules for `csv_path`, keyed by the SHA‐256 of its bytes:
+      1) from the in‐process cache,
+      2) else from `.course_rules-<sha>.pkl` next to the CSV (e.g. configs/{major}/),
+      3) else by compiling the CSV, writing the pickle for later sessions.
+    """
+    sha = file_sha256(csv_path)
+    if sha in _memory_cache:
+        return _memory_cache[sha]
+
+    folder = os.path.dirname(csv_path)
+    pickle_path = os.path.join(folder, f".course_rules-{sha}.pkl")
+    rule_set = None
+    if os.path.exists(pickle_path):
+        try:
+            with open(pickle_path, "rb") as f:
+                version, rule_set = pickle.load(f)
+            if version != _pickle_version():
+                rule_set = None
+        except Exception:
+            rule_set = None
+
+    if rule_set is None:
+        rule_set = compile_course_rules(pd.read_csv(csv_path), sha=sha)
+        # Only the current configuration's pickle is kept
+        for stale in glob.glob(os.path.join(folder, ".course_rules-*.pkl")):
+            if stale != pickle_path:
+                os.remove(stale)
+        with open(pickle_path, "wb") as f:
+            pickle.dump((_pickle_version(), rule_set), f)
+
+    if len(_memory_cache) >= _MEMORY_CACHE_SIZE:
+        _memory_cache.pop(next(iter(_memory_cache)))
+    _memory_cache[sha] = rule_set
+    return rule_set
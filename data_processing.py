@@ -1,6 +1,28 @@
+import glob
+import os
+import time
+from typing import NamedTuple
+
+import numpy as np
 import pandas as pd
 import streamlit as st
-from config import GRADE_ORDER, is_passing_grade, get_allowed_assignment_types
+from config import (
+    GRADE_ORDER,
+    SEMESTER_OFFSETS,
+    is_passing_grade,
+    get_allowed_assignment_types,
+    grade_term_ord
+)
+from logging_utils import log_action
+from utilities import file_sha256
+from grade_cells import (
+    CellStatus,
+    attempt_labels,
+    build_grade_cells,
+    format_attempt,
+    render_full,
+    value_status
+)
 
 def _normalize_long_format(df: pd.DataFrame):
     """
@@ -31,36 +53,43 @@ def _normalize_long_format(df: pd.DataFrame):
     return df[['ID', 'NAME', 'Course', 'Grade', 'Year', 'Semester']]
 
 
-def read_progress_report(filepath):
+def read_progress_report(filepath, streaming: bool = True):
     """
     Reads an uploaded progress report (Excel or CSV), in either:
       - “long” format with columns [ID or STUDENT ID, NAME, Course, Grade, Year, Semester]
       - “wide” format with columns ID/NAME plus COURSE_* or COURSE * columns
-    Returns a long‐format DataFrame with exactly ['ID','NAME','Course','Grade','Year','Semester'] or None on error.
+    .xlsx sheets are streamed in read‐only mode keeping only those columns (`streaming=False`
+    reads the whole sheet with pandas instead). The parse time and memory use are logged.
+    Returns a long‐format DataFrame in the `apply_report_schema` layout or None on error.
     """
     try:
+        start = time.perf_counter()
         # Excel files
         if filepath.lower().endswith(('.xlsx', '.xls')):
-            xls = pd.ExcelFile(filepath)
-            # If there is a sheet literally named "Progress Report", read that long‐form
-            if 'Progress Report' in xls.sheet_names:
-                df = pd.read_excel(xls, sheet_name='Progress Report')
+            if streaming and filepath.lower().endswith('.xlsx'):
+                sheet_name, df = _stream_xlsx_columns(filepath)
+            else:
+                xls = pd.ExcelFile(filepath)
+                # If there is a sheet literally named "Progress Report", read that long‐form,
+                # otherwise pull the first sheet
+                sheet_name = 'Progress Report' if 'Progress Report' in xls.sheet_names else xls.sheet_names[0]
+                df = pd.read_excel(xls, sheet_name=sheet_name)
+            if sheet_name == 'Progress Report':
                 normalized = _normalize_long_format(df)
                 if normalized is None:
                     st.error(f"'Progress Report' sheet is missing required columns. Found: {list(df.columns)}")
                     return None
-                return normalized
-            # Otherwise, pull the first sheet
-            df = pd.read_excel(xls, sheet_name=xls.sheet_names[0])
+                return _finish_parse(filepath, normalized, start)
             # Try long format first (case-insensitive, handles STUDENT ID alias)
             normalized = _normalize_long_format(df)
             if normalized is not None:
-                return normalized
+                return _finish_parse(filepath, normalized, start)
             # Otherwise, attempt to transform wide → long
-            transformed = transform_wide_format(df)
+            transformed = _transform_wide_sheet(df)
             if transformed is None:
                 st.error("Failed to read the uploaded progress report file.")
-            return transformed
+                return None
+            return _finish_parse(filepath, transformed, start)
 
         # CSV files
         elif filepath.lower().endswith('.csv'):
@@ -68,12 +97,13 @@ def read_progress_report(filepath):
             # Try long format first (case-insensitive)
             normalized = _normalize_long_format(df)
             if normalized is not None:
-                return normalized
+                return _finish_parse(filepath, normalized, start)
             # otherwise try wide form
-            transformed = transform_wide_format(df)
+            transformed = _transform_wide_sheet(df)
             if transformed is None:
                 st.error("Failed to read the uploaded progress report file.")
-            return transformed
+                return None
+            return _finish_parse(filepath, transformed, start)
 
         else:
             st.error("Unsupported file format. Upload an Excel or CSV.")
@@ -84,12 +114,330 @@ def read_progress_report(filepath):
         return None
 
 
-def transform_wide_format(df: pd.DataFrame) -> pd.DataFrame | None:
+# Bump when read_progress_report's output for the same bytes changes
+_PARSE_CACHE_VERSION = 3
+# Cached parses kept per folder, least recently used evicted first: enough for the full
+# report and the term updates merged into it
+PARSE_CACHE_ENTRIES = 4
+
+
+def load_progress_report(filepath: str, cache_folder: str = None, sha256: str = None):
+    """
+    `read_progress_report` behind a Parquet cache keyed by the SHA‐256 of the file's bytes:
+    the normalized long‐format frame is stored as `.progress_report-<sha>.parquet` in
+    `cache_folder` (default: the file's folder, e.g. configs/{major}/), and loading the same
+    bytes again reads that file instead of parsing the spreadsheet. The PARSE_CACHE_ENTRIES
+    most recently used parses are kept per folder. Pass `sha256` when the digest is already
+    known (see utilities.store_upload). Returns None on error.
+    """
+    folder = cache_folder or os.path.dirname(filepath)
+    try:
+        sha = sha256 or file_sha256(filepath)
+    except OSError as e:
+        st.error(f"Error reading file: {e}")
+        return None
+    cache_path = os.path.join(folder, f".progress_report-v{_PARSE_CACHE_VERSION}-{sha}.parquet")
+
+    if os.path.exists(cache_path):
+        try:
+            start = time.perf_counter()
+            df = pd.read_parquet(cache_path)
+            os.utime(cache_path)  # most recently used
+            log_action(f"Loaded {os.path.basename(filepath)} from parse cache: {len(df)} rows in {time.perf_counter() - start:.2f}s")
+            return df
+        except Exception as e:
+            log_action(f"Ignoring unreadable parse cache {cache_path}: {e}")
+
+    df = read_progress_report(filepath)
+    if df is not None:
+        try:
+            # Written aside and renamed, so a concurrent load never sees a partial file
+            partial = f"{cache_path}.{os.getpid()}.tmp"
+            df.to_parquet(partial)
+            os.replace(partial, cache_path)
+            _evict_parse_cache(folder)
+        except Exception as e:
+            log_action(f"Could not cache parsed {os.path.basename(filepath)}: {e}")
+    return df
+
+
+def _evict_parse_cache(folder: str):
+    """Removes parses from older parser versions and all but the most recently used ones."""
+    current = f".progress_report-v{_PARSE_CACHE_VERSION}-"
+    cached = []
+    for path in glob.glob(os.path.join(folder, ".progress_report-*.parquet")):
+        if os.path.basename(path).startswith(current):
+            cached.append(path)
+        else:
+            os.remove(path)
+    cached.sort(key=os.path.getmtime, reverse=True)
+    for path in cached[PARSE_CACHE_ENTRIES:]:
+        os.remove(path)
+
+
+# The normalized report as stored next to the original on Drive; Reload prefers it
+REPORT_SNAPSHOT_NAME = 'progress_report.parquet'
+_SNAPSHOT_VERSION_KEY = b'progress_report_version'
+
+
+def save_report_snapshot(df: pd.DataFrame, path: str):
+    """
+    Writes a frame in the `apply_report_schema` layout as a zstd‐compressed Parquet file,
+    tagged with the parse version so a snapshot from an older parser is not trusted.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    metadata = dict(table.schema.metadata or {})
+    metadata[_SNAPSHOT_VERSION_KEY] = str(_PARSE_CACHE_VERSION).encode()
+    # Written aside and renamed, so a concurrent reader never sees a partial file
+    partial = f"{path}.{os.getpid()}.tmp"
+    pq.write_table(table.replace_schema_metadata(metadata), partial, compression='zstd')
+    os.replace(partial, path)
+
+
+def load_report_snapshot(path: str):
+    """The frame saved by `save_report_snapshot`; None if it is unreadable or from another parse version."""
+    import pyarrow.parquet as pq
+
+    try:
+        start = time.perf_counter()
+        table = pq.read_table(path)
+        version = (table.schema.metadata or {}).get(_SNAPSHOT_VERSION_KEY)
+        if version != str(_PARSE_CACHE_VERSION).encode():
+            log_action(f"Ignoring snapshot {path} from parse version {version}")
+            return None
+        df = table.to_pandas()
+    except Exception as e:
+        log_action(f"Ignoring unreadable snapshot {path}: {e}")
+        return None
+    log_action(f"Loaded snapshot {os.path.basename(path)}: {len(df)} rows in {time.perf_counter() - start:.2f}s")
+    return df
+
+
+def _transform_wide_sheet(df: pd.DataFrame):
+    """transform_wide_format, listing any skipped malformed cells to the user."""
+    result = transform_wide_format(df, return_malformed=True)
+    if result is None:
+        return None
+    transformed, malformed = result
+    if len(malformed):
+        st.warning(f"Skipped {len(malformed)} course cells not in 'CODE/SEM-YYYY/GRADE' form:")
+        st.dataframe(malformed)
+    return transformed
+
+
+def _finish_parse(filepath: str, df: pd.DataFrame, start: float) -> pd.DataFrame:
+    df = apply_report_schema(df)
+    log_action(
+        f"Parsed {os.path.basename(filepath)}: {len(df)} rows in {time.perf_counter() - start:.2f}s, "
+        f"{frame_memory_usage(df)['Total'] / 1e6:.1f} MB"
+    )
+    return df
+
+
+def _as_text(values):
+    """
+    A Series or DataFrame as strings, keeping missing values missing: pandas < 3 turns
+    them into the text 'nan' (or 'None') on astype('str').
+    """
+    return values.astype('str').where(values.notna())
+
+
+def normalize_student_ids(ids: pd.Series) -> pd.Series:
+    """
+    Student IDs as stripped strings, the form assignments are keyed by. Whole numbers lose
+    any float formatting (201701579.0 → '201701579').
+    """
+    if ids.dtype.kind == 'f':
+        whole = ids.where(ids % 1 == 0)
+        if whole.notna().sum() == ids.notna().sum():
+            ids = whole.astype('Int64')
+    return _as_text(ids).str.strip()
+
+
+def apply_report_schema(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Canonical in‐session layout of a parsed progress report, applied once at ingestion:
+      ID        str (see `normalize_student_ids`)
+      NAME, Course, Grade, Semester   category (stripped; Semester title‐cased)
+      Year      Int16
+      TermOrd   Int32 term ordinal, on the `config.sem_to_ord` scale
+    Unparseable Year/Semester values become <NA>.
+    """
+    text = {
+        col: _as_text(df[col]).str.strip()
+        for col in ['NAME', 'Course', 'Grade', 'Semester']
+    }
+    text['Semester'] = text['Semester'].str.title()
+    years = pd.to_numeric(_as_text(df['Year']).str.strip(), errors='coerce')
+    years = years.where(years % 1 == 0)
+    offsets = text['Semester'].str.upper().map(SEMESTER_OFFSETS)
+
+    return pd.DataFrame({
+        'ID': normalize_student_ids(df['ID']),
+        'NAME': text['NAME'].astype('category'),
+        'Course': text['Course'].astype('category'),
+        'Grade': text['Grade'].astype('category'),
+        'Year': years.astype('Int16'),
+        'Semester': text['Semester'].astype('category'),
+        'TermOrd': (years * 3 + offsets).astype('Int32'),
+    }, index=df.index)
+
+
+def frame_memory_usage(df: pd.DataFrame) -> pd.Series:
+    """Deep memory usage in bytes per column (and the index), plus a 'Total'."""
+    usage = df.memory_usage(deep=True)
+    return pd.concat([usage, pd.Series({'Total': usage.sum()})])
+
+
+# A progress row is identified by these columns; a delta row replaces the row with the same key
+PROGRESS_KEY = ['ID', 'Course', 'Year', 'Semester']
+
+
+def merge_progress_delta(master: pd.DataFrame, delta: pd.DataFrame):
+    """
+    Upserts a delta export (e.g. one term's grades) into the master progress table, both in
+    the `apply_report_schema` layout. Each delta row replaces the master rows with the same
+    (ID, Course, Year, Semester) or is appended; duplicate keys within the delta keep the last.
+    Kept master rows keep their order and index labels, so per‐student results computed from
+    the master stay valid for students the delta leaves alone.
+
+    Returns (merged, changed_students): the set of str IDs with a new or different row.
+    """
+    delta = delta.drop_duplicates(subset=PROGRESS_KEY, keep='last')
+    replaced = pd.MultiIndex.from_frame(master[PROGRESS_KEY]).isin(
+        pd.MultiIndex.from_frame(delta[PROGRESS_KEY])
+    )
+
+    # Delta rows identical to a master row (same NAME and Grade) change nothing
+    compared = PROGRESS_KEY + ['NAME', 'Grade']
+    probe = delta[compared].astype(object).merge(
+        master.loc[replaced, compared].astype(object).drop_duplicates(),
+        on=compared, how='left', indicator=True
+    )
+    changed_students = set(probe.loc[probe['_merge'] == 'left_only', 'ID'].astype(str))
+    # Collapsed duplicate master rows count as a change too
+    collapsed = master.loc[replaced, PROGRESS_KEY].duplicated(keep=False)
+    changed_students |= set(master.loc[replaced].loc[collapsed.to_numpy(), 'ID'].astype(str))
+
+    kept = master[~replaced]
+    start = (int(master.index.max()) + 1) if len(master) and master.index.dtype.kind in 'iu' else len(master)
+    columns = {}
+    for col in master.columns:
+        if isinstance(master[col].dtype, pd.CategoricalDtype):
+            columns[col] = pd.api.types.union_categoricals(
+                [kept[col].array, delta[col].astype('category').array], sort_categories=True
+            )
+        else:
+            columns[col] = pd.concat([kept[col], delta[col]], ignore_index=True).astype(master[col].dtype)
+    merged = pd.DataFrame(columns)
+    merged.index = kept.index.append(pd.RangeIndex(start, start + len(delta)))
+    return merged, changed_students
+
+
+# Cell texts pandas reads as missing by default (read_excel/read_csv `na_values`)
+_NA_STRINGS = {
+    '', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND', '1.#QNAN',
+    '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null'
+}
+_LONG_FORMAT_HEADERS = {'ID', 'STUDENT ID', 'STUDENTID', 'STUDENT_ID', 'NAME', 'GRADE', 'YEAR', 'SEMESTER'}
+
+
+def _is_report_column(name: str) -> bool:
+    """Columns either report layout uses: the long‐format aliases, ID/NAME and any COURSE… column."""
+    upper = name.strip().upper()
+    return upper in _LONG_FORMAT_HEADERS or upper.startswith('COURSE')
+
+
+def _stream_xlsx_columns(filepath, sheet_name: str = None):
+    """
+    Streams a sheet of an .xlsx (path or binary file object) in read‐only mode, materializing
+    only the report columns: `sheet_name`, else 'Progress Report', else the first sheet.
+    Text columns get the string dtype and integer columns the smallest integer dtype that
+    holds them.
+    Returns (sheet_name, DataFrame).
+    """
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(filepath, read_only=True, data_only=True)
+    try:
+        if sheet_name is None:
+            sheet_name = 'Progress Report' if 'Progress Report' in workbook.sheetnames else workbook.sheetnames[0]
+        rows = workbook[sheet_name].iter_rows(values_only=True)
+        header = next(rows, ())
+        keep = [
+            (i, str(name)) for i, name in enumerate(header)
+            if name is not None and _is_report_column(str(name))
+        ]
+        values = [[] for _ in keep]
+        for row in rows:
+            picked = [row[i] if i < len(row) else None for i, _ in keep]
+            picked = [None if isinstance(v, str) and v in _NA_STRINGS else v for v in picked]
+            if all(v is None for v in picked):
+                continue
+            for column, value in zip(values, picked):
+                column.append(value)
+    finally:
+        workbook.close()
+
+    columns = {}
+    for (_, name), column in zip(keep, values):
+        series = pd.Series(column)
+        if series.dtype.kind not in 'iufM':
+            # Like pandas' reader, numeric‐looking text (e.g. IDs stored as text) becomes numeric
+            try:
+                series = pd.to_numeric(series)
+            except (ValueError, TypeError):
+                pass
+        if series.dtype.kind in 'iu':
+            series = pd.to_numeric(series, downcast='integer')
+        elif series.dtype.kind == 'O':
+            # Empty cells as NaN, as pandas' reader gives them (not None)
+            series = series.where(series.notna())
+        # Repeated headers get pandas' ".1", ".2" suffixes
+        unique, n = name, 0
+        while unique in columns:
+            n += 1
+            unique = f"{name}.{n}"
+        columns[unique] = series
+    return sheet_name, pd.DataFrame(columns, index=pd.RangeIndex(len(values[0]) if values else 0))
+
+
+# CODE/SEMESTER-YEAR/GRADE; the grade is blank for current registrations
+_WIDE_CELL_PATTERN = (
+    r"^\s*(?P<Course>[^/\s][^/]*?)\s*/\s*(?P<Semester>[A-Za-z]+)\s*-\s*(?P<Year>\d{4})"
+    r"\s*/\s*(?P<Grade>[^/]*?)\s*$"
+)
+
+
+def transform_wide_format(df: pd.DataFrame, return_malformed: bool = False):
     """
     Converts a wide‐format progress sheet into long form.
     Detects an ID column ('ID' or 'STUDENT ID') plus any 'COURSE…' columns.
     Expects each cell as 'COURSECODE/SEMESTER-YEAR/GRADE'.
-    Returns a DataFrame with columns ['ID','NAME','Course','Grade','Year','Semester'].
+    Returns a DataFrame with columns ['ID','NAME','Course','Grade','Year','Semester'],
+    or None if the sheet is not in wide format. Cells that do not parse are skipped;
+    with `return_malformed=True` the result is (DataFrame, malformed) where `malformed`
+    lists them as ['Row','ID','Column','Value'].
+    """
+    result, malformed, problem = parse_wide_sheet(df)
+    if problem:
+        st.error(problem)
+        return None
+    if len(malformed):
+        log_action(f"Skipped {len(malformed)} malformed course cells in wide‐format sheet")
+    if return_malformed:
+        return result, malformed
+    return result
+
+
+def parse_wide_sheet(df: pd.DataFrame):
+    """
+    `transform_wide_format` without Streamlit calls, safe to run in worker processes.
+    Returns (long DataFrame, malformed cells, None), or (None, None, problem) when the
+    sheet is not in wide format.
     """
     # 1) Find the student‐ID column
     if 'ID' in df.columns:
@@ -97,65 +445,59 @@ def transform_wide_format(df: pd.DataFrame) -> pd.DataFrame | None:
     elif 'STUDENT ID' in df.columns:
         id_col = 'STUDENT ID'
     else:
-        st.error("Wide format file missing an 'ID' or 'STUDENT ID' column.")
-        return None
+        return None, None, "Wide format file missing an 'ID' or 'STUDENT ID' column."
 
     # 2) Ensure we have a NAME column
     if 'NAME' not in df.columns and 'Name' in df.columns:
         df = df.rename(columns={'Name': 'NAME'})
     if 'NAME' not in df.columns:
-        st.error("Wide format file missing a 'NAME' column.")
-        return None
+        return None, None, "Wide format file missing a 'NAME' column."
 
     # 3) Detect all COURSE columns
-    course_cols = [c for c in df.columns if c.upper().startswith('COURSE')]
+    course_cols = [c for c in df.columns if str(c).upper().startswith('COURSE')]
     if not course_cols:
-        st.error("Wide format file missing any 'COURSE…' columns.")
-        return None
+        return None, None, "Wide format file missing any 'COURSE…' columns."
 
-    # 4) Melt into long form
-    id_vars = [c for c in df.columns if c not in course_cols]
-    df_melt = df.melt(
-        id_vars=id_vars,
-        value_vars=course_cols,
-        var_name='Course_Column',
-        value_name='CourseData'
+    # 4) Stack only the non‐empty cells, column by column (the order a melt would give)
+    values = df[course_cols].to_numpy(dtype=object)
+    filled = pd.notna(values)
+    filled[filled] = [str(v).strip() != '' for v in values[filled]]
+    col_pos, row_pos = np.nonzero(filled.T)
+    cells = pd.Series(
+        values[row_pos, col_pos].astype(str), index=col_pos * len(df) + row_pos, dtype="str"
     )
 
-    # 5) Drop empty entries
-    df_melt = df_melt[df_melt['CourseData'].notna() & (df_melt['CourseData'].str.strip() != '')]
-
-    # 6) Split COURSECODE/SEMESTER-YEAR/GRADE
-    parts = df_melt['CourseData'].str.split('/', expand=True)
-    if parts.shape[1] < 3:
-        st.error("Parsing error: expected 'CODE/SEM-YYYY/GRADE'.")
-        return None
-
-    df_melt['Course'] = parts[0].str.strip().str.upper()
-    df_melt['RawSemYear'] = parts[1].str.strip()
-    df_melt['Grade'] = parts[2].str.strip().str.upper()
-
-    # 7) Split Semester and Year
-    sem_parts = df_melt['RawSemYear'].str.split('-', expand=True)
-    if sem_parts.shape[1] < 2:
-        st.error("Expected Semester-Year in format 'FALL-2016'.")
-        return None
-
-    df_melt['Semester'] = sem_parts[0].str.strip().str.title()
-    df_melt['Year'] = sem_parts[1].str.strip()
+    # 5) Parse CODE/SEMESTER-YEAR/GRADE in one pass (with pyarrow, a vectorized RE2 extract)
+    try:
+        import pyarrow as pa
+        parts = cells.astype(pd.ArrowDtype(pa.string())).str.extract(_WIDE_CELL_PATTERN)
+    except ImportError:
+        parts = cells.str.extract(_WIDE_CELL_PATTERN)
+    parts = _as_text(parts)
+    parsed = parts['Course'].notna().to_numpy()
 
-    # 8) Rename ID column to 'ID'
-    if id_col != 'ID':
-        df_melt = df_melt.rename(columns={id_col: 'ID'})
+    malformed = pd.DataFrame({
+        'Row': df.index[row_pos[~parsed]],
+        'ID': df[id_col].to_numpy()[row_pos[~parsed]],
+        'Column': np.asarray(course_cols, dtype=object)[col_pos[~parsed]],
+        'Value': cells[~parsed].to_numpy(),
+    })
+    if not parsed.any() and len(cells):
+        return None, None, "Parsing error: expected 'CODE/SEM-YYYY/GRADE'."
 
-    # 9) Collect only needed columns
-    final_cols = ['ID', 'NAME', 'Course', 'Grade', 'Year', 'Semester']
-    missing = [c for c in final_cols if c not in df_melt.columns]
-    if missing:
-        st.error(f"Missing columns after transformation: {missing}")
-        return None
+    # 6) Collect only needed columns
+    parts = parts[parsed]
+    rows = row_pos[parsed]
+    result = pd.DataFrame({
+        'ID': df[id_col].to_numpy()[rows],
+        'NAME': df['NAME'].to_numpy()[rows],
+        'Course': parts['Course'].str.upper(),
+        'Grade': parts['Grade'].str.upper(),
+        'Year': parts['Year'],
+        'Semester': parts['Semester'].str.title(),
+    }, index=parts.index).drop_duplicates()
 
-    return df_melt[final_cols].drop_duplicates()
+    return result, malformed, None
 
 
 def read_equivalent_courses(equivalent_courses_df):
@@ -174,7 +516,9 @@ def process_progress_report(
     target_rules: dict,
     intensive_rules: dict,
     per_student_assignments: dict = None,
-    equivalent_courses_mapping: dict = None
+    equivalent_courses_mapping: dict = None,
+    engine: str = "vectorized",
+    rule_index: "RuleIndex" = None
 ):
     """
     df: the raw long‐format progress data
@@ -184,7 +528,311 @@ def process_progress_report(
     intensive_rules: { course_code: [ {Credits, PassingGrades, FromOrd, ToOrd}, ... ], ... }
     per_student_assignments: { student_id: { assign_type: course, ... }, ... }
     equivalent_courses_mapping: { alt_code: primary_code, ... }
+    engine: "vectorized" (default) or "legacy" for the original row‐wise implementation.
+            Both return identical Required, Intensive and extras outputs.
+    rule_index: optional precompiled rules (e.g. CourseRuleSet.index) for the vectorized engine;
+                compiled from target_rules/intensive_rules when omitted.
+    """
+    if engine == "legacy":
+        return _process_progress_report_legacy(
+            df, target_courses, intensive_courses, target_rules, intensive_rules,
+            per_student_assignments, equivalent_courses_mapping
+        )
+    if engine != "vectorized":
+        raise ValueError(f"Unknown engine '{engine}'. Use 'vectorized' or 'legacy'.")
+
+    required_cells, intensive_cells, extra_courses_df, extra_courses_list = build_progress_cells(
+        df, target_courses, intensive_courses, target_rules, intensive_rules,
+        per_student_assignments, equivalent_courses_mapping, rule_index
+    )
+    return render_full(required_cells), render_full(intensive_cells), extra_courses_df, extra_courses_list
+
+
+def build_progress_cells(
+    df: pd.DataFrame,
+    target_courses: dict,
+    intensive_courses: dict,
+    target_rules: dict,
+    intensive_rules: dict,
+    per_student_assignments: dict = None,
+    equivalent_courses_mapping: dict = None,
+    rule_index: "RuleIndex" = None
+):
     """
+    Vectorized engine. Same inputs as `process_progress_report`, but the Required and
+    Intensive tables are returned as typed `GradeCells` (render them with
+    grade_cells.render_full / render_primary / render_collapsed).
+
+    Returns (required_cells, intensive_cells, extra_courses_df, extra_courses_list).
+    """
+    if equivalent_courses_mapping is None:
+        equivalent_courses_mapping = {}
+
+    # 1) Map equivalents (dict lookup over the column, unmatched codes keep their own value,
+    #    kept at the Course dtype: an all‐NaN lookup would otherwise leave it as object;
+    #    a categorical Course maps to plain strings, as equivalents may not be categories)
+    mapped_dtype = df["Course"].dtype
+    if isinstance(mapped_dtype, pd.CategoricalDtype):
+        mapped_dtype = mapped_dtype.categories.dtype
+    courses = df["Course"].astype(mapped_dtype)
+    mapped = courses.map(equivalent_courses_mapping).fillna(courses)
+    df = df.assign(**{"Mapped Course": mapped.astype(mapped_dtype)})
+
+    # 2) Apply S.C.E./F.E.C. (or any assignment types) as a keyed join on (ID, Course)
+    if per_student_assignments:
+        assigned_type = _lookup_assignment_types(df, per_student_assignments, get_allowed_assignment_types())
+        df["Mapped Course"] = assigned_type.fillna(df["Mapped Course"]).astype(mapped_dtype)
+
+    # 3) Resolve each row's term rule, then evaluate each distinct (Grade, rule) pair once
+    terms = term_ordinals(df)
+    if rule_index is None:
+        rule_index = compile_rule_index(target_rules, intensive_rules)
+    outcomes, grades = _attempt_outcomes(df, terms, rule_index)
+    rows = df[["ID", "NAME", "Mapped Course"]].assign(**{c: outcomes[c].to_numpy() for c in outcomes})
+
+    # 4) Typed Required and Intensive tables from one pivot stage, attempts in chronological order
+    rows = rows.iloc[chronological_order(terms)]
+    tables = build_grade_cells(
+        rows, {"required": list(target_courses), "intensive": list(intensive_courses)}, grades
+    )
+    required_cells, intensive_cells = tables["required"], tables["intensive"]
+
+    # 5) Extras keep the row‐level display value
+    is_extra = (
+        ~df["Mapped Course"].isin(target_courses.keys()) &
+        ~df["Mapped Course"].isin(intensive_courses.keys())
+    )
+    extra_courses_df = _extra_rows(df, is_extra).assign(ProcessedValue=pd.Series(
+        attempt_labels(outcomes[is_extra], grades), index=df.index[is_extra], dtype="str"
+    ))
+
+    # 6) Remove assigned courses from extras
+    extra_courses_df = _drop_assigned_extras(extra_courses_df, per_student_assignments)
+
+    extra_courses_list = sorted(extra_courses_df["Course"].unique())
+    return required_cells, intensive_cells, extra_courses_df, extra_courses_list
+
+
+def _lookup_assignment_types(df: pd.DataFrame, per_student_assignments: dict, allowed_types: list) -> pd.Series:
+    """
+    For every row, returns the assignment type whose slot holds (str(ID), Course), or NaN.
+    When several slots hold the same course, the first type in `allowed_types` wins.
+    """
+    priority = {}
+    for pos, atype in enumerate(allowed_types):
+        priority.setdefault(atype, pos)
+    records = [
+        (str(sid), course, atype, priority[atype])
+        for sid, assigns in per_student_assignments.items()
+        for atype, course in assigns.items()
+        if atype in priority
+    ]
+    if not records:
+        return pd.Series(np.nan, index=df.index, dtype=object)
+
+    slots = (
+        pd.DataFrame(records, columns=["ID", "Course", "AssignedType", "Priority"])
+        .sort_values("Priority", kind="stable")
+        .drop_duplicates(subset=["ID", "Course"], keep="first")
+        .set_index(["ID", "Course"])["AssignedType"]
+    )
+    keys = pd.MultiIndex.from_arrays([df["ID"].astype(str), df["Course"]])
+    return pd.Series(slots.reindex(keys).to_numpy(dtype=object), index=df.index)
+
+
+class RuleIndex(NamedTuple):
+    """
+    Course rules compiled into flat arrays sorted by (course, FromOrd), so the rule for
+    every grade row can be found with one `np.searchsorted` instead of a per‐row scan.
+    """
+    course_codes: dict      # course → integer code
+    keys: np.ndarray        # sorted composite (course code, FromOrd) search keys
+    rule_course: np.ndarray # course code of each compiled rule
+    from_ord: np.ndarray
+    to_ord: np.ndarray
+    rules: list             # the original rule dicts, in compiled order
+    credits: np.ndarray     # Credits of each compiled rule
+    passing: tuple          # frozenset of passing grades of each compiled rule
+    fallback: np.ndarray    # per course code: position of that course's rules_list[0]
+
+    # Composite key stride: term ordinals are year * 3 + offset, far below this bound
+    STRIDE = 1_000_000.0
+
+    @classmethod
+    def _key(cls, codes, ords):
+        return codes * cls.STRIDE + np.clip(np.asarray(ords, dtype=float) + 1, 0, cls.STRIDE - 1)
+
+    def resolve(self, courses: pd.Series, term_ords: np.ndarray) -> np.ndarray:
+        """
+        Returns, for every row, the position in `self.rules` of the rule in effect for that
+        row's course and term (same choice as `select_rule`), or -1 if the course has no rules.
+        """
+        codes = pd.Index(list(self.course_codes)).get_indexer(courses).astype(np.int64)
+        known = codes >= 0
+        positions = np.full(len(codes), -1, dtype=np.int64)
+        if not known.any() or not len(self.rules):
+            return positions
+
+        terms = np.asarray(term_ords, dtype=float)
+        found = np.searchsorted(self.keys, self._key(codes, terms), side="right") - 1
+        positions[known] = self.fallback[codes[known]]
+
+        # Step back from the latest‐starting rule through the course's earlier‐starting ones
+        # until one still covers the term (ranges may overlap); rows left over keep the fallback
+        rows = np.flatnonzero(known & ~np.isnan(terms) & (found >= 0))
+        candidate = found[rows]
+        while len(rows):
+            same_course = self.rule_course[candidate] == codes[rows]
+            rows, candidate = rows[same_course], candidate[same_course]
+            covers = self.to_ord[candidate] >= terms[rows]
+            positions[rows[covers]] = candidate[covers]
+            rows, candidate = rows[~covers], candidate[~covers] - 1
+            rows, candidate = rows[candidate >= 0], candidate[candidate >= 0]
+        return positions
+
+
+def compile_rule_index(target_rules: dict, intensive_rules: dict) -> RuleIndex:
+    """
+    Compiles the per‐course rule lists into a `RuleIndex`.
+    As in the row‐wise engine, a course's target rules take precedence over intensive rules.
+    """
+    combined = {**(intensive_rules or {}), **(target_rules or {})}
+    combined = {course: rules for course, rules in combined.items() if rules}
+    course_codes = {course: code for code, course in enumerate(combined)}
+
+    flat = [
+        (course_codes[course], float(rule["FromOrd"]), float(rule["ToOrd"]), rule, pos == 0)
+        for course, rules in combined.items()
+        for pos, rule in enumerate(rules)
+    ]
+    # Stable sort keeps list order for equal FromOrd, so the later rule wins ties
+    flat.sort(key=lambda item: (item[0], item[1]))
+
+    rule_course = np.array([item[0] for item in flat], dtype=np.int64)
+    from_ord = np.array([item[1] for item in flat], dtype=float)
+    to_ord = np.array([item[2] for item in flat], dtype=float)
+    fallback = np.zeros(len(course_codes), dtype=np.int64)
+    for pos, item in enumerate(flat):
+        if item[4]:
+            fallback[item[0]] = pos
+
+    return RuleIndex(
+        course_codes=course_codes,
+        keys=RuleIndex._key(rule_course, from_ord),
+        rule_course=rule_course,
+        from_ord=from_ord,
+        to_ord=to_ord,
+        rules=[item[3] for item in flat],
+        credits=np.array([int(item[3]["Credits"]) for item in flat], dtype=np.int64),
+        passing=tuple(passing_grade_set(item[3]["PassingGrades"]) for item in flat),
+        fallback=fallback,
+    )
+
+
+def term_ordinals(df: pd.DataFrame) -> np.ndarray:
+    """
+    Vectorized `config.grade_term_ord` over the Semester/Year columns (NaN where unknown).
+    Reports in the `apply_report_schema` layout carry it precomputed as TermOrd.
+    """
+    if "TermOrd" in df.columns:
+        return df["TermOrd"].to_numpy(dtype=float, na_value=np.nan)
+    offsets = df["Semester"].astype(str).str.strip().str.upper().map(SEMESTER_OFFSETS)
+    years = pd.to_numeric(df["Year"], errors="coerce")
+    return (years * 3 + offsets).to_numpy(dtype=float)
+
+
+def chronological_order(terms: np.ndarray) -> np.ndarray:
+    """
+    Row positions sorted by term ordinal; rows without a usable term go last and ties keep
+    their original order, so the attempt order within a cell is deterministic.
+    """
+    return np.argsort(np.where(np.isnan(terms), np.inf, terms), kind="stable")
+
+
+def _attempt_outcomes(df: pd.DataFrame, terms: np.ndarray, rule_index: RuleIndex):
+    """
+    Typed outcome of every grade row. The rule in effect for each row's term is resolved in
+    one pass through a `RuleIndex`, then `grade_outcome` runs once per distinct (Grade, rule)
+    pair and the results are broadcast back.
+
+    Returns (outcomes, grades): outcomes has ['Grade','Credits','Awarded'] aligned with df,
+    'Grade' being a code into the `grades` vocabulary.
+    """
+    rule_pos = rule_index.resolve(df["Mapped Course"], terms)
+
+    keys = pd.DataFrame({"Grade": df["Grade"].to_numpy(), "Rule": rule_pos})
+    codes = keys.groupby(["Grade", "Rule"], dropna=False, sort=False).ngroup().to_numpy()
+    uniques = keys[~pd.Series(codes).duplicated().to_numpy()]
+
+    texts, credits, awarded = [], [], []
+    for grade, rule in uniques.itertuples(index=False, name=None):
+        if rule >= 0:
+            text, cred, ok = _compiled_outcome(grade, int(rule_index.credits[rule]), rule_index.passing[rule])
+        else:
+            text, cred, ok = _compiled_outcome(grade, 0, frozenset())
+        texts.append(text)
+        credits.append(cred)
+        awarded.append(ok)
+
+    text_codes, grades = pd.factorize(pd.Series(texts, dtype=object))
+    outcomes = pd.DataFrame(
+        {
+            "Grade": text_codes[codes].astype(np.int16),
+            "Credits": np.asarray(credits, dtype=np.int16)[codes],
+            "Awarded": np.asarray(awarded, dtype=bool)[codes],
+        },
+        index=df.index
+    )
+    return outcomes, pd.Index(grades, dtype=object)
+
+
+def assigned_course_mask(
+    df: pd.DataFrame,
+    per_student_assignments: dict,
+    assignment_types: list = None
+) -> pd.Series:
+    """
+    Boolean mask of the rows of `df` whose (ID, Course) sits in one of the student's
+    assignment slots ('_note' entries are ignored). Optionally restricted to `assignment_types`.
+    Membership is a hashed MultiIndex lookup, so the cost is linear in rows + assignments.
+    """
+    pairs = [
+        (str(sid), str(crs))
+        for sid, assigns in (per_student_assignments or {}).items()
+        for atype, crs in assigns.items()
+        if atype != "_note" and (assignment_types is None or atype in assignment_types)
+    ]
+    if not pairs or df.empty:
+        return pd.Series(False, index=df.index)
+    keys = pd.MultiIndex.from_arrays([df["ID"].astype(str), df["Course"].astype(str)])
+    return pd.Series(keys.isin(pairs), index=df.index)
+
+
+def _extra_rows(df: pd.DataFrame, is_extra) -> pd.DataFrame:
+    """
+    The extras table's rows, without TermOrd (present when the report went through
+    `apply_report_schema`, but not a display column). Shared by both engines.
+    """
+    return df.loc[is_extra, df.columns != "TermOrd"]
+
+
+def _drop_assigned_extras(extra_courses_df: pd.DataFrame, per_student_assignments: dict) -> pd.DataFrame:
+    """Removes extra‐course rows assigned to one of the student's slots (anti‐join)."""
+    if not per_student_assignments:
+        return extra_courses_df
+    return extra_courses_df[~assigned_course_mask(extra_courses_df, per_student_assignments)]
+
+
+def _process_progress_report_legacy(
+    df: pd.DataFrame,
+    target_courses: dict,
+    intensive_courses: dict,
+    target_rules: dict,
+    intensive_rules: dict,
+    per_student_assignments: dict = None,
+    equivalent_courses_mapping: dict = None
+):
+    """Row-wise reference implementation kept for the `engine="legacy"` switch."""
 
     if equivalent_courses_mapping is None:
         equivalent_courses_mapping = {}
@@ -217,18 +865,20 @@ def process_progress_report(
             intensive_courses if r["Mapped Course"] in intensive_courses else
             {},
             (target_rules.get(r["Mapped Course"], []) if r["Mapped Course"] in target_rules else
-             intensive_rules.get(r["Mapped Course"], []))
+             intensive_rules.get(r["Mapped Course"], [])),
+            grade_term_ord(r["Semester"], r["Year"])
         ),
         axis=1
     )
 
-    # 4) Split into required, intensive, extra
-    extra_courses_df = df[
+    # 4) Split into required, intensive, extra (attempts in chronological order for the pivot)
+    chrono_df = df.iloc[chronological_order(term_ordinals(df))]
+    extra_courses_df = _extra_rows(df, (
         (~df["Mapped Course"].isin(target_courses.keys())) &
         (~df["Mapped Course"].isin(intensive_courses.keys()))
-    ]
-    target_df = df[df["Mapped Course"].isin(target_courses.keys())]
-    intensive_df = df[df["Mapped Course"].isin(intensive_courses.keys())]
+    ))
+    target_df = chrono_df[chrono_df["Mapped Course"].isin(target_courses.keys())]
+    intensive_df = chrono_df[chrono_df["Mapped Course"].isin(intensive_courses.keys())]
 
     # 5) Pivot on ProcessedValue
     pivot_df = target_df.pivot_table(
@@ -277,7 +927,21 @@ def process_progress_report(
     extra_courses_list = sorted(extra_courses_df["Course"].unique())
     return result_df, intensive_result_df, extra_courses_df, extra_courses_list
 
-def determine_course_value(grade: str, course: str, courses_dict: dict, rules_list: list):
+def select_rule(rules_list: list, term_ord: float = None) -> dict:
+    """
+    Picks the rule revision in effect for `term_ord`: of the rules with
+    FromOrd ≤ term_ord ≤ ToOrd, the latest‐starting one (ties go to the later rule in the
+    list). Falls back to rules_list[0] when the term is unknown or no rule covers it.
+    This is the scalar counterpart of `RuleIndex.resolve`.
+    """
+    best = None
+    if term_ord is not None and term_ord == term_ord:
+        for rule in rules_list:
+            if rule["FromOrd"] <= term_ord <= rule["ToOrd"] and (best is None or rule["FromOrd"] >= best["FromOrd"]):
+                best = rule
+    return rules_list[0] if best is None else best
+
+def determine_course_value(grade: str, course: str, courses_dict: dict, rules_list: list, term_ord: float = None):
     """
     Processes a course grade, taking into account:
       - Numeric credits (for non‐zero‐credit courses)
@@ -289,38 +953,34 @@ def determine_course_value(grade: str, course: str, courses_dict: dict, rules_li
       {"Credits": int, "PassingGrades": "B+,B,B-", "FromOrd": 17, "ToOrd": 99},
       ...
     ]
+    term_ord: the grade row's term ordinal (see config.grade_term_ord); the rule is picked with
+              `select_rule`, so without a term the first rule in the list applies.
     """
 
-    # If the course isn't in our rule table at all, fallback:
-    info = {"Credits": 0, "PassingGrades": ""} if not rules_list else None
+    return format_attempt(*grade_outcome(grade, rules_list, term_ord))
 
+def grade_outcome(grade: str, rules_list: list, term_ord: float = None):
+    """
+    Typed form of `determine_course_value`: (grade_text, credits, awarded).
+    A blank grade is a current registration and renders as 'CR' with its credits awarded.
+    """
+    # If the course isn't in our rule table at all, fallback:
     if rules_list:
-        # We need to pick the rule entry whose FromOrd ≤ current term ≤ ToOrd.
-        # But since we don't know the student's term here, we skip that direct check.
-        # Instead, in this app, we assume all grade values use the same credits & passing‐grades
-        # that were specified when this value was computed in step 3.
-        # So at this point, rules_list was only passed in to show that this course was valid.
-        # The actual credits and passing logic come from the original credits & passing string.
-        # Thus, we simply pick the first rule in the list (which has the correct Credits+PassingGrades).
-        rule = rules_list[0]
-        credits = rule["Credits"]
-        passing = rule["PassingGrades"]
-    else:
-        credits = info["Credits"]
-        passing = info["PassingGrades"]
+        rule = select_rule(rules_list, term_ord)
+        return _compiled_outcome(grade, rule["Credits"], passing_grade_set(rule["PassingGrades"]))
+    return _compiled_outcome(grade, 0, frozenset())
 
-    if pd.isna(grade) or grade == "":
-        return f"CR | {credits}" if credits > 0 else "CR | PASS"
-    else:
-        tokens = [g.strip().upper() for g in grade.split(", ") if g.strip()]
-        all_toks = ", ".join(tokens)
-        allowed = [x.strip().upper() for x in passing.split(",")] if passing else []
-        passed = any(g in allowed for g in tokens)
+def passing_grade_set(passing: str) -> frozenset:
+    """Parses a 'A+,A,A-' PassingGrades string into a frozenset of upper‐case grades."""
+    return frozenset(x.strip().upper() for x in passing.split(",")) if passing else frozenset()
 
-        if credits > 0:
-            return f"{all_toks} | {credits}" if passed else f"{all_toks} | 0"
-        else:
-            return f"{all_toks} | PASS" if passed else f"{all_toks} | FAIL"
+def _compiled_outcome(grade: str, credits: int, passing: frozenset):
+    """`grade_outcome` once the rule's credits and passing‐grade set are known."""
+    if pd.isna(grade) or grade == "":
+        return "CR", credits, True
+    tokens = [g.strip().upper() for g in grade.split(", ") if g.strip()]
+    passed = any(g in passing for g in tokens)
+    return ", ".join(tokens), credits, passed
 
 def calculate_credits(row: pd.Series, courses_dict: dict):
     """
@@ -369,6 +1029,44 @@ def calculate_credits(row: pd.Series, courses_dict: dict):
         index=["# of Credits Completed", "# Registered", "# Remaining", "Total Credits"]
     )
 
+CREDIT_COLUMNS = ["# of Credits Completed", "# Registered", "# Remaining", "Total Credits"]
+
+def calculate_credits_batch(table: pd.DataFrame, courses_dict: dict, status: np.ndarray = None) -> pd.DataFrame:
+    """
+    Same four columns as `calculate_credits`, for every row of `table` at once:
+    a (rows × courses) status matrix times the credit vector.
+
+    status: optional CellStatus matrix in `courses_dict` order (e.g. GradeCells.status);
+            when omitted it is derived from the table's strings, parsing each distinct
+            cell value once.
+    """
+    courses = list(courses_dict)
+    credits = np.array([courses_dict[c] for c in courses], dtype=np.int64)
+
+    if status is None:
+        present = [c for c in courses if c in table.columns]
+        status = np.full((len(table), len(courses)), CellStatus.FAILED, dtype=np.int8)
+        if present and len(table):
+            values = table[present].to_numpy(dtype=object).ravel()
+            codes, uniques = pd.factorize(values, use_na_sentinel=False)
+            per_value = np.array([value_status(v) for v in uniques], dtype=np.int8)
+            positions = [courses.index(c) for c in present]
+            status[:, positions] = per_value[codes].reshape(len(table), len(present))
+
+    completed = (status == CellStatus.PASSED).astype(np.int64) @ credits
+    registered = (status == CellStatus.REGISTERED).astype(np.int64) @ credits
+    total = int(credits.sum())
+    return pd.DataFrame(
+        {
+            "# of Credits Completed": completed,
+            "# Registered": registered,
+            "# Remaining": total - completed - registered,
+            "Total Credits": np.full(len(table), total, dtype=np.int64),
+        },
+        index=table.index,
+        columns=CREDIT_COLUMNS
+    )
+
 def save_report_with_formatting(displayed_df: pd.DataFrame, intensive_displayed_df: pd.DataFrame, timestamp: str):
     import io
     from openpyxl import Workbook
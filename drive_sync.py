@@ -0,0 +1,194 @@
+"""
+Write‐behind Google Drive sync.
+
+Saves write their local file and enqueue it here; a background thread pushes the file to
+Drive (or whichever storage backend is configured, see storage). The queue lives in
+SQLite, so pending syncs survive a restart, and holds one entry per Drive name: enqueueing
+the same artifact again replaces the pending entry, and the worker always uploads the
+file's content as it is at sync time. Failed transfers are retried with exponential backoff.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from typing import NamedTuple
+
+from logging_utils import log_action
+
+QUEUE_DB = "drive_sync.db"
+BACKOFF_BASE_SECONDS = 2
+BACKOFF_MAX_SECONDS = 300
+
+UPLOAD = "upload"
+DELETE = "delete"
+
+
+class PendingSync(NamedTuple):
+    drive_name: str
+    local_path: str
+    op: str                # UPLOAD or DELETE
+    enqueued_at: float
+    attempts: int
+    next_attempt: float
+    last_error: str
+
+
+def storage_transfer(op: str, local_path: str, drive_name: str):
+    """Performs one queued operation against the process-wide storage backend (see storage)."""
+    from storage import get_storage
+
+    backend = get_storage()
+    if op == UPLOAD:
+        backend.upload(local_path, drive_name)
+    else:
+        backend.delete(drive_name)
+
+
+class DriveSyncQueue:
+    """
+    Persistent, coalescing queue of Drive writes with one background worker thread.
+    `transfer(op, local_path, drive_name)` performs an operation and raises on failure.
+    With `background=False` nothing runs until `process_due` is called.
+    """
+
+    def __init__(self, db_path: str = QUEUE_DB, transfer=storage_transfer, background: bool = True):
+        self.db_path = db_path
+        self.transfer = transfer
+        self.background = background
+        self.last_synced = {}  # drive_name → time of the last successful transfer
+        self._wake = threading.Event()
+        self._lock = threading.Lock()
+        self._worker = None
+        with self._connect() as conn:
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS pending_sync (
+                    drive_name TEXT PRIMARY KEY,
+                    local_path TEXT NOT NULL,
+                    op TEXT NOT NULL,
+                    enqueued_at REAL NOT NULL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    next_attempt REAL NOT NULL,
+                    last_error TEXT
+                )
+            ''')
+
+    def _connect(self):
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    def enqueue(self, local_path: str, drive_name: str, op: str = UPLOAD):
+        """Queues `op` for `drive_name`, replacing any pending operation on it."""
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO pending_sync VALUES (?, ?, ?, ?, 0, ?, NULL)",
+                (drive_name, local_path, op, now, now)
+            )
+        if self.background:
+            self.start()
+            self._wake.set()
+
+    def pending(self, prefix: str = "") -> list:
+        """PendingSync entries whose Drive name starts with `prefix`, oldest first."""
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT * FROM pending_sync WHERE substr(drive_name, 1, ?) = ? ORDER BY enqueued_at",
+                (len(prefix), prefix)
+            ).fetchall()
+        return [PendingSync(*row) for row in rows]
+
+    def process_due(self) -> float:
+        """
+        Runs every operation that is due. Returns the seconds until the next retry is due
+        (None when the queue is empty).
+        """
+        now = time.time()
+        with self._connect() as conn:
+            due = [PendingSync(*row) for row in conn.execute(
+                "SELECT * FROM pending_sync WHERE next_attempt <= ? ORDER BY enqueued_at", (now,)
+            )]
+        for entry in due:
+            self._run(entry)
+
+        with self._connect() as conn:
+            (next_attempt,) = conn.execute("SELECT MIN(next_attempt) FROM pending_sync").fetchone()
+        return None if next_attempt is None else max(0.0, next_attempt - time.time())
+
+    def _run(self, entry: PendingSync):
+        # A file removed since it was queued has nothing left to upload; drop the entry
+        missing = entry.op == UPLOAD and not os.path.exists(entry.local_path)
+        error = None
+        if not missing:
+            try:
+                self.transfer(entry.op, entry.local_path, entry.drive_name)
+            except Exception as e:
+                error = f"{type(e).__name__}: {e}"
+
+        with self._connect() as conn:
+            # Only the entry that was run: a newer enqueue of the same name stays queued
+            match = "drive_name = ? AND enqueued_at = ?"
+            if error is None:
+                conn.execute(f"DELETE FROM pending_sync WHERE {match}", (entry.drive_name, entry.enqueued_at))
+            else:
+                delay = min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * 2 ** entry.attempts)
+                conn.execute(
+                    f"UPDATE pending_sync SET attempts = attempts + 1, next_attempt = ?, last_error = ? WHERE {match}",
+                    (time.time() + delay, error, entry.drive_name, entry.enqueued_at)
+                )
+
+        if missing:
+            log_action(f"Drive sync: dropped {entry.drive_name}, {entry.local_path} no longer exists")
+        elif error is None:
+            self.last_synced[entry.drive_name] = time.time()
+            log_action(f"Drive sync: {entry.op} {entry.drive_name}")
+        else:
+            log_action(f"Drive sync failed ({entry.op} {entry.drive_name}, attempt {entry.attempts + 1}): {error}")
+
+    def start(self):
+        """Starts the worker thread (once per queue); it also resumes syncs left from a previous run."""
+        with self._lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._loop, name="drive-sync", daemon=True)
+                self._worker.start()
+
+    def _loop(self):
+        while True:
+            self._wake.clear()
+            try:
+                wait = self.process_due()
+            except Exception as e:
+                log_action(f"Drive sync worker error: {e}")
+                wait = BACKOFF_MAX_SECONDS
+            self._wake.wait(wait)
+
+
+_queue = None
+_queue_lock = threading.Lock()
+
+
+def sync_queue() -> DriveSyncQueue:
+    """The process‐wide queue, started on first use."""
+    global _queue
+    with _queue_lock:
+        if _queue is None:
+            _queue = DriveSyncQueue()
+            _queue.start()
+        return _queue
+
+
+def enqueue_upload(local_path: str, drive_name: str):
+    sync_queue().enqueue(local_path, drive_name, UPLOAD)
+
+
+def enqueue_delete(drive_name: str):
+    sync_queue().enqueue("", drive_name, DELETE)
+
+
+def pending_op(drive_name: str):
+    """UPLOAD or DELETE if an operation on `drive_name` is still queued, else None."""
+    if _queue is None and not os.path.exists(QUEUE_DB):
+        return None
+    for entry in sync_queue().pending(drive_name):
+        if entry.drive_name == drive_name:
+            return entry.op
+    return None
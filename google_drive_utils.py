@@ -1,11 +1,27 @@
+import hashlib
 import io
+import json
+import os
+import threading
+import time
+from typing import NamedTuple
+import httplib2
 import streamlit as st
+from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
+from google_auth_httplib2 import AuthorizedHttp
 from googleapiclient.discovery import build
-from googleapiclient.http import MediaFileUpload, MediaIoBaseDownload
+from googleapiclient.http import HttpRequest, MediaFileUpload, MediaIoBaseDownload
 
 SCOPES = ['https://www.googleapis.com/auth/drive.file']
 
+# One Drive client per process, shared by every session and page. httplib2 connections are
+# not thread-safe, so requests go out over a per-thread authorized connection instead.
+_service_lock = threading.Lock()
+_service = None
+_credentials = None
+_thread_state = threading.local()
+
 def authenticate_google_drive():
     # Build credentials from st.secrets. We assume the user has added:
     # [google]
@@ -33,28 +49,248 @@ def authenticate_google_drive():
 
     return creds
 
+def get_drive_service():
+    """
+    The process-wide Drive v3 client, built on first use. The access token is refreshed
+    lazily, by the first request after it expires.
+    """
+    global _service, _credentials
+    with _service_lock:
+        if _service is None:
+            _credentials = authenticate_google_drive()
+            _service = build(
+                "drive", "v3",
+                credentials=_credentials,
+                requestBuilder=_thread_request,
+                cache_discovery=False
+            )
+        return _service
+
+def reset_drive_service():
+    """Drops the cached client, e.g. after the secrets changed or the refresh token was revoked."""
+    global _service, _credentials
+    with _service_lock:
+        _service = None
+        _credentials = None
+        _thread_state.__dict__.clear()
+    with _indexes_lock:
+        _indexes.clear()
+
+def _thread_request(http, *args, **kwargs):
+    """requestBuilder for the shared client: sends every request over this thread's connection."""
+    authorized = getattr(_thread_state, "http", None)
+    if authorized is None or authorized.credentials is not _credentials:
+        authorized = _thread_state.http = AuthorizedHttp(_credentials, http=httplib2.Http())
+    return HttpRequest(authorized, *args, **kwargs)
+
+# Metadata kept for every indexed file; one files().list call lists a whole prefix
+_FILE_FIELDS = 'id, name, md5Checksum, modifiedTime'
+
+class DriveFile(NamedTuple):
+    id: str
+    md5: str            # md5Checksum (None for Google Docs)
+    modified_time: str  # RFC 3339
+
+INDEX_TTL_SECONDS = 120
+
+class DriveIndex:
+    """
+    name → DriveFile for every file whose name starts with `prefix` (our artifacts are named
+    like 'configs/PBHL/equivalent_courses.csv'), listed at most once per `ttl` seconds.
+    Uploads, updates and deletes made through this module update it in place; changes made
+    elsewhere show up once the TTL runs out.
+    """
+
+    def __init__(self, prefix: str, ttl: float = INDEX_TTL_SECONDS):
+        self.prefix = prefix
+        self.ttl = ttl
+        self._files = None
+        self._listed_at = 0.0
+        self._lock = threading.Lock()
+
+    def lookup(self, service, name: str):
+        """The DriveFile named `name`, or None."""
+        with self._lock:
+            if self._files is None or time.monotonic() - self._listed_at > self.ttl:
+                self._files = self._list(service)
+                self._listed_at = time.monotonic()
+            return self._files.get(name)
+
+    def _list(self, service) -> dict:
+        files, page_token = {}, None
+        escaped = self.prefix.replace("\\", "\\\\").replace("'", "\\'")
+        while True:
+            response = service.files().list(
+                q=f"name contains '{escaped}' and trashed=false",
+                spaces='drive',
+                fields=f'nextPageToken, files({_FILE_FIELDS})',
+                orderBy='modifiedTime desc',
+                pageSize=1000,
+                pageToken=page_token
+            ).execute()
+            for item in response.get('files', []):
+                # Newest first: of several files with one name, the latest wins (as in search_file)
+                if item['name'].startswith(self.prefix) and item['name'] not in files:
+                    files[item['name']] = _drive_file(item)
+            page_token = response.get('nextPageToken')
+            if not page_token:
+                return files
+
+    def record(self, item: dict):
+        with self._lock:
+            if self._files is not None:
+                self._files[item['name']] = _drive_file(item)
+
+    def forget(self, file_id: str):
+        with self._lock:
+            if self._files is not None:
+                self._files = {n: f for n, f in self._files.items() if f.id != file_id}
+
+    def invalidate(self):
+        with self._lock:
+            self._files = None
+
+def _drive_file(item: dict) -> DriveFile:
+    return DriveFile(item['id'], item.get('md5Checksum'), item.get('modifiedTime'))
+
+# Process-wide, like the client: one index per name prefix (i.e. per Major)
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+def drive_index(prefix: str) -> DriveIndex:
+    with _indexes_lock:
+        if prefix not in _indexes:
+            _indexes[prefix] = DriveIndex(prefix)
+        return _indexes[prefix]
+
+def _index_for(file_name: str):
+    """The index covering 'configs/{major}/…' style names; None for names without a folder part."""
+    folder, _, _ = file_name.rpartition('/')
+    return drive_index(folder + '/') if folder else None
+
+def find_file(service, file_name: str):
+    """DriveFile for `file_name` (or None), served from its folder's index when it has one."""
+    index = _index_for(file_name)
+    if index is None:
+        file_id = search_file(service, file_name)
+        return DriveFile(file_id, None, None) if file_id else None
+    return index.lookup(service, file_name)
+
+def sync_to_drive(service, local_path: str, drive_name: str) -> str:
+    """Uploads `local_path` as `drive_name`, replacing the file's content if it exists. Returns 'updated' or 'uploaded'."""
+    existing = find_file(service, drive_name)
+    if existing:
+        update_file(service, existing.id, local_path)
+        return 'updated'
+    upload_file(service, local_path, drive_name)
+    return 'uploaded'
+
+def _record(item: dict):
+    index = _index_for(item.get('name', ''))
+    if index is not None:
+        index.record(item)
+
 def upload_file(service, file_path, file_name, folder_id=None):
     file_metadata = {'name': file_name}
     if folder_id:
         file_metadata['parents'] = [folder_id]
     media = MediaFileUpload(file_path, resumable=True)
-    file = service.files().create(body=file_metadata, media_body=media, fields='id').execute()
+    file = service.files().create(body=file_metadata, media_body=media, fields=_FILE_FIELDS).execute()
+    _record(file)
     return file.get('id')
 
 def update_file(service, file_id, file_path):
     media = MediaFileUpload(file_path, resumable=True)
-    file = service.files().update(fileId=file_id, media_body=media).execute()
+    file = service.files().update(fileId=file_id, media_body=media, fields=_FILE_FIELDS).execute()
+    _record(file)
     return file.get('id')
 
-def download_file(service, file_id, file_path):
-    request = service.files().get_media(fileId=file_id)
-    fh = io.FileIO(file_path, 'wb')
-    downloader = MediaIoBaseDownload(fh, request)
-    done = False
-    while not done:
-        status, done = downloader.next_chunk()
+def download_file(service, file_id, file_path, remote: DriveFile = None):
+    """
+    Downloads a file's content to `file_path`. Given `remote`, its DriveFile (e.g. from
+    find_file), the download is conditional: it is skipped when the local copy already is
+    that version, per the folder's manifest or else its md5. Returns whether it downloaded.
+    """
+    conditional = remote is not None and (remote.md5 or remote.modified_time)
+    # One transfer per local file at a time: a page's fetch waits for a prefetch of the same file
+    with download_lock(file_path):
+        if conditional and is_current_copy(file_path, remote):
+            record_download(file_path, remote)
+            return False
+
+        request = service.files().get_media(fileId=file_id)
+        fh = io.FileIO(file_path, 'wb')
+        downloader = MediaIoBaseDownload(fh, request)
+        done = False
+        while not done:
+            status, done = downloader.next_chunk()
+
+        fh.close()
+        if conditional:
+            record_download(file_path, remote)
+        return True
+
+_path_locks = {}
+_path_locks_lock = threading.Lock()
+
+def download_lock(file_path: str) -> threading.Lock:
+    """The lock serialising transfers into `file_path` (one per local file, process-wide)."""
+    with _path_locks_lock:
+        return _path_locks.setdefault(os.path.abspath(file_path), threading.Lock())
+
+# Per local folder: file name → the Drive version last downloaded there and the local file's
+# size/mtime right after, so an unchanged copy is recognised without hashing it
+MANIFEST_NAME = '.drive_manifest.json'
+_manifest_lock = threading.Lock()
+
+def _manifest_path(file_path: str) -> str:
+    return os.path.join(os.path.dirname(os.path.abspath(file_path)), MANIFEST_NAME)
+
+def _read_manifest(path: str) -> dict:
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def _local_stamp(file_path: str) -> list:
+    stat = os.stat(file_path)
+    return [stat.st_size, stat.st_mtime_ns]
+
+def file_md5(file_path: str) -> str:
+    digest = hashlib.md5()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def is_current_copy(file_path: str, remote: DriveFile) -> bool:
+    """Whether `file_path` already holds the version `remote` describes (see record_download)."""
+    if not os.path.exists(file_path):
+        return False
+    with _manifest_lock:
+        entry = _read_manifest(_manifest_path(file_path)).get(os.path.basename(file_path))
+    if entry == {
+        'id': remote.id, 'md5': remote.md5, 'modifiedTime': remote.modified_time,
+        'local': _local_stamp(file_path),
+    }:
+        return True
+    # Not downloaded by us, or touched since: compare the content itself
+    return remote.md5 is not None and file_md5(file_path) == remote.md5
 
-    fh.close()
+def record_download(file_path: str, remote: DriveFile):
+    """Notes in the folder's manifest that `file_path` now holds the version `remote` describes."""
+    path = _manifest_path(file_path)
+    with _manifest_lock:
+        manifest = _read_manifest(path)
+        manifest[os.path.basename(file_path)] = {
+            'id': remote.id, 'md5': remote.md5, 'modifiedTime': remote.modified_time,
+            'local': _local_stamp(file_path),
+        }
+        partial = f"{path}.{os.getpid()}.tmp"
+        with open(partial, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+        os.replace(partial, path)
 
 def search_file(service, file_name, folder_id=None):
     query = f"name='{file_name}' and trashed=false"
@@ -74,3 +310,7 @@ def search_file(service, file_name, folder_id=None):
 
 def delete_file(service, file_id):
     service.files().delete(fileId=file_id).execute()
+    with _indexes_lock:
+        indexes = list(_indexes.values())
+    for index in indexes:
+        index.forget(file_id)
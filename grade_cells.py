@@ -0,0 +1,295 @@
+"""Typed grade-cell tables produced by the vectorized processing engine.
+
+Each (student, course) cell is kept as a list of attempts with an integer grade
+code, the rule's integer credits and whether the grade was awarded; the cell
+itself carries a `CellStatus`. The "GRADE | credit" display strings are only
+rendered at the edge (`render_full`, `render_primary`, `render_collapsed`).
+"""
+
+from dataclasses import dataclass
+from enum import IntEnum
+
+import numpy as np
+import pandas as pd
+
+from config import GRADE_ORDER
+
+
+class CellStatus(IntEnum):
+    """Status of a cell; CR takes precedence, so a cell is the max over its attempts."""
+    NOT_REGISTERED = 0
+    FAILED = 1
+    PASSED = 2
+    REGISTERED = 3
+
+
+# Same colors as config.cell_color
+STATUS_STYLES = {
+    CellStatus.NOT_REGISTERED: "background-color: pink",
+    CellStatus.FAILED: "background-color: pink",
+    CellStatus.PASSED: "background-color: lightgreen",
+    CellStatus.REGISTERED: "background-color: #FFFACD",
+}
+
+# Same shorthand as completion_utils.collapse_pass_fail_value
+STATUS_SHORTHAND = {
+    CellStatus.NOT_REGISTERED: "nc",
+    CellStatus.FAILED: "nc",
+    CellStatus.PASSED: "c",
+    CellStatus.REGISTERED: "cr",
+}
+
+
+def format_attempt(grade_text: str, credits: int, awarded: bool) -> str:
+    """Renders one attempt as 'GRADE | credit' (or 'GRADE | PASS/FAIL' for zero‐credit courses)."""
+    if credits > 0:
+        return f"{grade_text} | {credits}" if awarded else f"{grade_text} | 0"
+    return f"{grade_text} | PASS" if awarded else f"{grade_text} | FAIL"
+
+
+def is_registration(grade_text: str) -> bool:
+    """True if the attempt counts as a current registration (any token starting with CR)."""
+    return any(piece.strip().startswith("CR") for piece in grade_text.split(","))
+
+
+def grade_rank(grade_text: str) -> int:
+    """Priority used for the primary grade: CR first, then GRADE_ORDER, then anything else."""
+    ranks = [GRADE_ORDER.index(tok) for tok in grade_text.split(", ") if tok in GRADE_ORDER]
+    return min(ranks) if ranks else len(GRADE_ORDER)
+
+
+def value_status(value) -> CellStatus:
+    """
+    Status of an already rendered cell value, read exactly like `calculate_credits`:
+    any CR entry → registered, any credit > 0 or PASS → passed, other text → failed.
+    Non‐string values count as not registered.
+    """
+    if not isinstance(value, str):
+        return CellStatus.NOT_REGISTERED
+    entries = [e.strip() for e in value.split(",") if e.strip()]
+    if any(e.upper().startswith("CR") for e in entries):
+        return CellStatus.REGISTERED
+    for e in entries:
+        parts = [p.strip() for p in e.split("|")]
+        if len(parts) == 2:
+            try:
+                if int(parts[1]) > 0:
+                    return CellStatus.PASSED
+            except ValueError:
+                if parts[1].upper() == "PASS":
+                    return CellStatus.PASSED
+    return CellStatus.FAILED
+
+
+@dataclass
+class GradeCells:
+    """
+    One progress table (Required or Intensive) in typed form.
+
+    students: DataFrame ['ID','NAME'], one row per table row, sorted like pivot_table
+    courses:  column order of the table
+    grades:   grade vocabulary; attempts refer to it by integer code
+    attempts: DataFrame ['Student','Course','Grade','Credits','Awarded'] with Student/Course
+              as row/column positions, sorted by cell and chronologically within a cell
+    status:   int8 matrix (students × courses) of CellStatus values
+    """
+    students: pd.DataFrame
+    courses: list
+    grades: pd.Index
+    attempts: pd.DataFrame
+    status: np.ndarray
+
+    def attempt_labels(self) -> np.ndarray:
+        """'GRADE | credit' string of every attempt."""
+        return attempt_labels(self.attempts, self.grades)
+
+
+def attempt_labels(attempts: pd.DataFrame, grades: pd.Index) -> np.ndarray:
+    """
+    Formats ['Grade','Credits','Awarded'] attempt rows as 'GRADE | credit' strings,
+    calling `format_attempt` once per distinct attempt value.
+    """
+    keys = attempts[["Grade", "Credits", "Awarded"]]
+    codes = keys.groupby(["Grade", "Credits", "Awarded"], sort=False).ngroup().to_numpy()
+    uniques = keys[~pd.Series(codes).duplicated().to_numpy()]
+    labels = np.array(
+        [format_attempt(grades[g], int(c), bool(a)) for g, c, a in uniques.itertuples(index=False, name=None)],
+        dtype=object
+    )
+    return labels[codes]
+
+
+def build_grade_cells(rows: pd.DataFrame, tables: dict, grades: pd.Index) -> dict:
+    """
+    Builds several progress tables (e.g. Required and Intensive) in one sort‐and‐group pass.
+
+    rows:   one row per grade attempt with ['ID','NAME','Mapped Course','Grade','Credits','Awarded'],
+            'Grade' being a code into `grades`; rows must already be in attempt order
+    tables: { table_name: [course, ...], ... }; a course may appear in several tables
+
+    Returns { table_name: GradeCells }.
+    """
+    all_courses = list(dict.fromkeys(c for courses in tables.values() for c in courses))
+    rows = rows[rows["Mapped Course"].isin(all_courses)]
+    keys = rows.groupby(["ID", "NAME"], sort=True, observed=True).ngroup().to_numpy()
+    valid = keys >= 0
+    rows, keys = rows[valid], keys[valid].astype(np.int32)
+
+    first = ~pd.Series(keys).duplicated().to_numpy()
+    students = (
+        rows.loc[first, ["ID", "NAME"]]
+        .assign(_key=keys[first])
+        .sort_values("_key")
+        .drop(columns="_key")
+        .reset_index(drop=True)
+    )
+
+    course_pos = pd.Index(all_courses).get_indexer(rows["Mapped Course"]).astype(np.int16)
+    order = np.lexsort((course_pos, keys))  # stable: attempt order is kept within each cell
+    attempts = pd.DataFrame({
+        "Student": keys[order],
+        "Course": course_pos[order],
+        "Grade": rows["Grade"].to_numpy(dtype=np.int16)[order],
+        "Credits": rows["Credits"].to_numpy(dtype=np.int16)[order],
+        "Awarded": rows["Awarded"].to_numpy(dtype=bool)[order],
+    })
+
+    registered = np.array([is_registration(g) for g in grades], dtype=bool)
+    attempt_statuses = np.where(
+        registered[attempts["Grade"]],
+        CellStatus.REGISTERED,
+        np.where(attempts["Awarded"], CellStatus.PASSED, CellStatus.FAILED)
+    ).astype(np.int8)
+
+    status = np.full((len(students), len(all_courses)), CellStatus.NOT_REGISTERED, dtype=np.int8)
+    np.maximum.at(status, (attempts["Student"].to_numpy(), attempts["Course"].to_numpy()), attempt_statuses)
+
+    result = {}
+    for name, courses in tables.items():
+        cols = np.array([all_courses.index(c) for c in courses], dtype=np.int64)
+        has_row = (status[:, cols] != CellStatus.NOT_REGISTERED).any(axis=1)
+        row_map = np.cumsum(has_row) - 1
+        col_map = np.full(len(all_courses), -1, dtype=np.int64)
+        col_map[cols] = np.arange(len(cols))
+
+        in_table = col_map[attempts["Course"].to_numpy()] >= 0
+        sub = attempts[in_table].reset_index(drop=True)
+        sub["Student"] = row_map[sub["Student"].to_numpy()].astype(np.int32)
+        sub["Course"] = col_map[sub["Course"].to_numpy()].astype(np.int16)
+        if np.any(np.diff(cols) < 0):
+            # Columns follow this table's order, so re‐sort cells (stable, keeps attempt order)
+            sub = sub.sort_values(["Student", "Course"], kind="stable", ignore_index=True)
+
+        result[name] = GradeCells(
+            students=students[has_row].reset_index(drop=True),
+            courses=list(courses),
+            grades=grades,
+            attempts=sub,
+            status=status[has_row][:, cols],
+        )
+    return result
+
+
+def replace_students(cells: GradeCells, drop: np.ndarray, new: GradeCells) -> GradeCells:
+    """
+    Patches a table: removes the student rows flagged in `drop` and merges in the rows of
+    `new` (built for the same courses), keeping the (ID, NAME) row order of a full build.
+    Student columns take the dtypes of `new`, which comes from the current report.
+    """
+    keep = ~np.asarray(drop, dtype=bool)
+    grades = cells.grades.append(new.grades[~new.grades.isin(cells.grades)])
+    grade_map = grades.get_indexer(new.grades).astype(np.int16)
+
+    students = pd.concat(
+        [cells.students[keep].astype(new.students.dtypes.to_dict()), new.students], ignore_index=True
+    )
+    order = students.sort_values(["ID", "NAME"], kind="stable").index.to_numpy()
+    position = np.empty(len(order), dtype=np.int32)
+    position[order] = np.arange(len(order), dtype=np.int32)
+
+    kept_rows = np.flatnonzero(keep)
+    old_to_combined = np.full(len(keep), -1, dtype=np.int32)
+    old_to_combined[kept_rows] = np.arange(len(kept_rows), dtype=np.int32)
+
+    old_attempts = cells.attempts[keep[cells.attempts["Student"].to_numpy()]]
+    old_attempts = old_attempts.assign(Student=position[old_to_combined[old_attempts["Student"].to_numpy()]])
+    new_attempts = new.attempts.assign(
+        Student=position[new.attempts["Student"].to_numpy() + len(kept_rows)],
+        Grade=grade_map[new.attempts["Grade"].to_numpy()],
+    )
+    attempts = (
+        pd.concat([old_attempts, new_attempts], ignore_index=True)
+        .sort_values(["Student", "Course"], kind="stable", ignore_index=True)
+        .astype(cells.attempts.dtypes.to_dict())
+    )
+
+    return GradeCells(
+        students=students.iloc[order].reset_index(drop=True),
+        courses=cells.courses,
+        grades=grades,
+        attempts=attempts,
+        status=np.vstack([cells.status[keep], new.status])[order],
+    )
+
+
+def _cell_starts(attempts: pd.DataFrame) -> np.ndarray:
+    """Boolean mask of the first attempt of every (Student, Course) cell."""
+    student = attempts["Student"].to_numpy()
+    course = attempts["Course"].to_numpy()
+    starts = np.ones(len(attempts), dtype=bool)
+    starts[1:] = (student[1:] != student[:-1]) | (course[1:] != course[:-1])
+    return starts
+
+
+def _frame(cells: GradeCells, matrix: np.ndarray) -> pd.DataFrame:
+    """Attaches a students × courses matrix to the ID/NAME columns as a table."""
+    table = pd.concat(
+        [cells.students, pd.DataFrame(matrix, columns=cells.courses)],
+        axis=1
+    )
+    table.columns.name = "Mapped Course"
+    return table
+
+
+def render_full(cells: GradeCells) -> pd.DataFrame:
+    """All attempts per cell joined with ', ' ('NR' where the student has none)."""
+    labels = cells.attempt_labels()
+    starts = _cell_starts(cells.attempts)
+    # Prefix every non‐first attempt with the separator, then concatenate each cell's run
+    pieces = np.where(starts, labels, ", " + labels)
+    joined = np.add.reduceat(pieces, np.flatnonzero(starts)) if len(pieces) else pieces
+
+    matrix = np.full(cells.status.shape, "NR", dtype=object)
+    first = cells.attempts[starts]
+    matrix[first["Student"].to_numpy(), first["Course"].to_numpy()] = joined
+    table = _frame(cells, matrix)
+    # Courses nobody attempted get a scalar fill, as the pivot's "NR" fill step does
+    for pos in np.flatnonzero(~cells.status.any(axis=0)):
+        table[cells.courses[pos]] = "NR"
+    return table
+
+
+def render_primary(cells: GradeCells) -> pd.DataFrame:
+    """Highest‐priority attempt per cell (see `grade_rank`); the first attempt wins ties."""
+    ranks = np.array([grade_rank(g) for g in cells.grades], dtype=np.int16)
+    best = (
+        cells.attempts.assign(Label=cells.attempt_labels(), Rank=ranks[cells.attempts["Grade"]])
+        .sort_values(["Student", "Course", "Rank"], kind="stable")
+        .drop_duplicates(subset=["Student", "Course"], keep="first")
+    )
+
+    matrix = np.full(cells.status.shape, "NR", dtype=object)
+    matrix[best["Student"].to_numpy(), best["Course"].to_numpy()] = best["Label"].to_numpy()
+    return _frame(cells, matrix)
+
+
+def render_collapsed(cells: GradeCells) -> pd.DataFrame:
+    """'c' / 'cr' / 'nc' per cell, straight from the status matrix."""
+    shorthand = np.array([STATUS_SHORTHAND[s] for s in CellStatus], dtype=object)
+    return _frame(cells, shorthand[cells.status])
+
+
+def status_styles(cells: GradeCells) -> pd.DataFrame:
+    """CSS background per cell, aligned with the rendered tables (index × course columns)."""
+    styles = np.array([STATUS_STYLES[s] for s in CellStatus], dtype=object)
+    return pd.DataFrame(styles[cells.status], columns=cells.courses)
@@ -1,16 +1,18 @@
 import streamlit as st
 import pandas as pd
 from datetime import datetime
-from utilities import save_uploaded_file
-from data_processing import read_progress_report
-from google_drive_utils import (
-    authenticate_google_drive,
-    search_file,
-    download_file,
-    upload_file,
-    update_file
+from utilities import store_upload
+from data_processing import (
+    REPORT_SNAPSHOT_NAME,
+    load_progress_report,
+    load_report_snapshot,
+    merge_progress_delta,
+    save_report_snapshot
 )
-from googleapiclient.discovery import build
+from bulk_reports import load_progress_reports
+from storage import fetch_artifact, get_storage, prefetch_major
+from drive_sync import enqueue_delete, enqueue_upload, sync_queue
+from ui_components import show_sync_status
 from logging_utils import setup_logging
 import os
 
@@ -39,6 +41,16 @@ st.session_state["selected_major"] = major
 # Ensure local folder for this major exists
 local_folder = os.path.join("configs", major)
 os.makedirs(local_folder, exist_ok=True)
+show_sync_status(major)
+
+# Start fetching everything this Major's pages read from Drive, all transfers at once, so the
+# pages (and the reload below) find current local copies. Once per Major per session.
+if st.session_state.get("prefetched_major") != major:
+    try:
+        prefetch_major(major)
+    except Exception as e:
+        st.warning(f"Could not prefetch this Major's files from Google Drive: {e}")
+    st.session_state["prefetched_major"] = major
 
 # === 1) File Uploader ===
 uploaded_file = st.file_uploader(
@@ -47,28 +59,50 @@ uploaded_file = st.file_uploader(
     help="You can upload the standard Progress Report (sheet named 'Progress Report') or the wide format."
 )
 
+# A term update only carries some terms' rows; merged, it replaces the loaded report's rows
+# with the same (ID, Course, Year, Semester) and only the students it touches are recomputed.
+merge_delta = st.checkbox(
+    "Merge the upload into the loaded report (term update)",
+    value=False,
+    disabled=f"{major}_raw_df" not in st.session_state,
+    help="Use for an export with only the latest term(s). The merged report is kept for this "
+         "session; the upload is stored on Google Drive as progress_delta, not as the progress report."
+)
+store_snapshot = st.checkbox(
+    "Also store a compressed snapshot for faster reloads",
+    value=True,
+    disabled=merge_delta,
+    help="Stores the parsed report on Google Drive as a Parquet file next to the original. "
+         "Reload prefers it: it is much smaller and needs no spreadsheet parsing."
+)
+
 # === 2) Reload from Google Drive (immediately under uploader) ===
 if st.button("Reload Progress from Google Drive"):
     try:
-        creds = authenticate_google_drive()
-        service = build("drive", "v3", credentials=creds)
-
-        # Look for any of the three extensions under "configs/{major}/progress_report.*"
-        drive_id = None
+        storage = get_storage()
+        df = None
         drive_filename = None
-        for ext in ("xlsx", "xls", "csv"):
-            candidate = f"configs/{major}/progress_report.{ext}"
-            fid = search_file(service, candidate)
-            if fid:
-                drive_id = fid
-                drive_filename = candidate
-                break
-
-        if drive_id:
-            local_path = os.path.join(local_folder, os.path.basename(drive_filename))
-            download_file(service, drive_id, local_path)
-
-            df = read_progress_report(local_path)
+
+        # The Parquet snapshot first: no spreadsheet to transfer or parse
+        snapshot_name = f"configs/{major}/{REPORT_SNAPSHOT_NAME}"
+        snapshot_path = os.path.join(local_folder, REPORT_SNAPSHOT_NAME)
+        if fetch_artifact(snapshot_name, snapshot_path, storage):
+            df = load_report_snapshot(snapshot_path)
+            drive_filename = snapshot_name if df is not None else None
+
+        # Else any of the three extensions under "configs/{major}/progress_report.*" (on Drive,
+        # one listing of the Major's index covers all three). The download is skipped when
+        # the local copy already is this version (then the parse cache hits too).
+        if df is None:
+            for ext in ("xlsx", "xls", "csv"):
+                candidate = f"configs/{major}/progress_report.{ext}"
+                local_path = os.path.join(local_folder, os.path.basename(candidate))
+                if storage.download(candidate, local_path):
+                    drive_filename = candidate
+                    df = load_progress_report(local_path)
+                    break
+
+        if drive_filename:
             if df is not None:
                 st.session_state[f"{major}_raw_df"] = df
                 st.success(f"Reloaded '{drive_filename}' from Google Drive.")
@@ -80,36 +114,109 @@ if st.button("Reload Progress from Google Drive"):
         st.error(f"Error reloading from Google Drive: {e}")
 
 # === 3) Handle new Upload & Sync to Google Drive ===
+# The widget keeps the file across reruns, so each step remembers the bytes (SHA‐256) it
+# last handled for this Major and is skipped while they are unchanged.
 if uploaded_file is not None:
-    # 3a) Save locally under `configs/{major}/`
-    local_path = os.path.join(local_folder, uploaded_file.name)
-    with open(local_path, "wb") as f:
-        f.write(uploaded_file.getbuffer())
+    # 3a) Store once under `configs/{major}/uploads/<sha256>.<ext>`, hashing while writing
+    stored_key = f"{major}_stored_upload"
+    stored = st.session_state.get(stored_key)
+    if stored is None or stored[0] != uploaded_file.file_id:
+        # Earlier uploads still waiting for the background sync must not be pruned
+        queued = [entry.local_path for entry in sync_queue().pending(f"configs/{major}/")]
+        local_path, digest = store_upload(uploaded_file, os.path.join(local_folder, "uploads"), pinned=queued)
+        st.session_state[stored_key] = (uploaded_file.file_id, local_path, digest)
+    _, local_path, digest = st.session_state[stored_key]
 
     # 3b) Sync to Drive under canonical name `configs/{major}/progress_report.<ext>`
-    try:
-        creds = authenticate_google_drive()
-        service = build("drive", "v3", credentials=creds)
-
-        ext = uploaded_file.name.split(".")[-1].lower()
-        drive_name = f"configs/{major}/progress_report.{ext}"
-
-        file_id = search_file(service, drive_name)
-        if file_id:
-            update_file(service, file_id, local_path)
-            st.info(f"Updated '{drive_name}' on Google Drive.")
-        else:
-            upload_file(service, local_path, drive_name)
-            st.info(f"Uploaded '{drive_name}' to Google Drive.")
-    except Exception as e:
-        st.error(f"Error syncing progress report to Google Drive: {e}")
+    ext = uploaded_file.name.split(".")[-1].lower()
+    drive_stem = "progress_delta" if merge_delta else "progress_report"
+    drive_name = f"configs/{major}/{drive_stem}.{ext}"
+    if st.session_state.get(f"{major}_synced_upload") != (digest, drive_name):
+        # Uploaded in the background (see drive_sync)
+        enqueue_upload(local_path, drive_name)
+        st.info(f"Syncing '{drive_name}' to Google Drive in the background.")
+        st.session_state[f"{major}_synced_upload"] = (digest, drive_name)
 
     # 3c) Parse & store DataFrame as session state under key "{major}_raw_df"
-    df = read_progress_report(local_path)
-    if df is not None:
-        st.session_state[f"{major}_raw_df"] = df
-        st.success("File uploaded and processed successfully. You may now proceed to Customize Courses or View Reports.")
+    parsed_key = f"{major}_parsed_upload"
+    if (
+        st.session_state.get(parsed_key) == (digest, merge_delta)
+        and f"{major}_raw_df" in st.session_state
+    ):
+        st.caption("This file is already loaded.")
     else:
-        st.error("Failed to read the uploaded progress report file.")
+        df = load_progress_report(local_path, cache_folder=local_folder, sha256=digest)
+        if df is not None and merge_delta and f"{major}_raw_df" in st.session_state:
+            base_df = st.session_state[f"{major}_raw_df"]
+            merged_df, changed_students = merge_progress_delta(base_df, df)
+            pending = st.session_state.get(f"{major}_report_delta")
+            if pending is not None and pending[1] is base_df:
+                # Several updates before the reports were rebuilt: patch from the older base
+                base_df, changed_students = pending[0], pending[2] | changed_students
+            st.session_state[f"{major}_report_delta"] = (base_df, merged_df, changed_students)
+            st.session_state[f"{major}_raw_df"] = merged_df
+            st.session_state[parsed_key] = (digest, merge_delta)
+            st.success(
+                f"Merged {len(df)} rows into the loaded report; {len(changed_students)} students changed."
+            )
+        elif df is not None:
+            st.session_state[f"{major}_raw_df"] = df
+            st.session_state.pop(f"{major}_report_delta", None)
+            st.session_state[parsed_key] = (digest, merge_delta)
+            st.success("File uploaded and processed successfully. You may now proceed to Customize Courses or View Reports.")
+        else:
+            st.error("Failed to read the uploaded progress report file.")
+
+    # 3d) Store the parsed report as a compressed Parquet snapshot next to the original on
+    # Drive, which Reload prefers. Without one, an older snapshot must not shadow this report.
+    snapshot_key = f"{major}_synced_snapshot"
+    if (
+        not merge_delta
+        and st.session_state.get(parsed_key) == (digest, False)
+        and st.session_state.get(snapshot_key) != (digest, store_snapshot)
+    ):
+        snapshot_name = f"configs/{major}/{REPORT_SNAPSHOT_NAME}"
+        try:
+            if store_snapshot:
+                snapshot_path = os.path.join(local_folder, REPORT_SNAPSHOT_NAME)
+                save_report_snapshot(st.session_state[f"{major}_raw_df"], snapshot_path)
+                enqueue_upload(snapshot_path, snapshot_name)
+            else:
+                enqueue_delete(snapshot_name)
+            st.session_state[snapshot_key] = (digest, store_snapshot)
+        except Exception as e:
+            st.warning(f"Could not store the report snapshot: {e}")
 else:
     st.info("Please upload a valid Excel or CSV file to proceed.")
+
+# === 4) Bulk load: several files, workbooks with one sheet per cohort, zip archives ===
+with st.expander("Load several reports at once"):
+    bulk_files = st.file_uploader(
+        "Progress reports and zip archives of them",
+        type=["xlsx", "xls", "csv", "zip"],
+        accept_multiple_files=True,
+        key="bulk_upload",
+        help="Every sheet of every file (and every report inside a zip) is read and the rows "
+             "are combined. The combined report is kept for this session only."
+    )
+    if bulk_files and st.button("Load and combine"):
+        bulk_folder = os.path.join(local_folder, "uploads", "bulk")
+        # Stored uploads are named by content hash; the results table shows the uploaded names
+        uploaded_names = {}
+        for f in bulk_files:
+            uploaded_names.setdefault(store_upload(f, bulk_folder, keep=len(bulk_files))[0], f.name)
+        paths = list(uploaded_names)
+        with st.spinner(f"Parsing {len(paths)} files..."):
+            df, results = load_progress_reports(paths)
+        st.dataframe(pd.DataFrame({
+            "Source": [r.source.label_for(uploaded_names[r.source.path]) for r in results],
+            "Rows": [r.rows for r in results],
+            "Skipped cells": [len(r.malformed) for r in results],
+            "Problem": [r.error or "" for r in results],
+        }))
+        if df is not None:
+            st.session_state[f"{major}_raw_df"] = df
+            st.session_state.pop(f"{major}_report_delta", None)
+            st.success(f"Combined {len(df)} rows from {sum(r.rows > 0 for r in results)} sheets.")
+        else:
+            st.error("None of the files could be read as a Progress Report.")
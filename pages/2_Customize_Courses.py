@@ -2,14 +2,10 @@ import streamlit as st
 import pandas as pd
 import os
 import json
-from google_drive_utils import (
-    authenticate_google_drive,
-    search_file,
-    update_file,
-    upload_file,
-    download_file
-)
-from googleapiclient.discovery import build
+from storage import fetch_artifact
+from drive_sync import enqueue_upload
+from ui_components import show_sync_status
+from course_rules import load_course_rule_set
 
 st.title("Customize Courses")
 st.markdown("---")
@@ -35,6 +31,7 @@ major = st.session_state["selected_major"]
 # Ensure local folder exists
 local_folder = os.path.join("configs", major)
 os.makedirs(local_folder, exist_ok=True)
+show_sync_status(major)
 
 # Small helpers for Drive paths
 def _drive_path(filename: str) -> str:
@@ -51,11 +48,7 @@ assign_types_drive = _drive_path(ASSIGN_TYPES_FILENAME)
 def _load_assignment_types():
     # Try Drive first → local file → default
     try:
-        creds = authenticate_google_drive()
-        service = build("drive", "v3", credentials=creds)
-        fid = search_file(service, assign_types_drive)
-        if fid:
-            download_file(service, fid, assign_types_local)
+        fetch_artifact(assign_types_drive, assign_types_local)
     except Exception:
         # Silently ignore if drive is not configured
         pass
@@ -138,13 +131,8 @@ with st.expander("Course Configuration Options", expanded=True):
     with col2:
         if st.button("Reload Courses Configuration from Google Drive"):
             try:
-                creds = authenticate_google_drive()
-                service = build("drive", "v3", credentials=creds)
                 drive_name = _drive_path("courses_config.csv")
-                file_id = search_file(service, drive_name)
-                if file_id:
-                    local_csv = _local_path("courses_config.csv")
-                    download_file(service, file_id, local_csv)
+                if fetch_artifact(drive_name, _local_path("courses_config.csv")):
                     st.success("Reloaded courses_config.csv from Google Drive.")
                 else:
                     st.error("No courses_config.csv found on Google Drive for this Major.")
@@ -152,82 +140,37 @@ with st.expander("Course Configuration Options", expanded=True):
                 st.error(f"Error reloading courses configuration: {e}")
 
     # --- Load or Sync the CSV ---
+    courses_csv = None
     if uploaded_courses is not None:
         try:
             courses_df = pd.read_csv(uploaded_courses)
             local_csv = _local_path("courses_config.csv")
             courses_df.to_csv(local_csv, index=False)
+            courses_csv = local_csv
 
-            # Sync to Drive
-            try:
-                creds = authenticate_google_drive()
-                service = build("drive", "v3", credentials=creds)
-                drive_name = _drive_path("courses_config.csv")
-                file_id = search_file(service, drive_name)
-                if file_id:
-                    update_file(service, file_id, local_csv)
-                else:
-                    upload_file(service, local_csv, drive_name)
-                st.success("Courses configuration synced to Google Drive.")
-            except Exception as e:
-                st.warning(f"Could not sync to Google Drive: {e}")
+            # Sync to Drive in the background
+            enqueue_upload(local_csv, _drive_path("courses_config.csv"))
+            st.success("Courses configuration saved; syncing to Google Drive in the background.")
         except Exception as e:
             st.error(f"Error reading uploaded courses CSV: {e}")
     elif os.path.exists(_local_path("courses_config.csv")):
-        courses_df = pd.read_csv(_local_path("courses_config.csv"))
-    else:
-        courses_df = None
-
-    # --- Parse into in‐memory rule tables and credit maps ---
-    if courses_df is not None:
-        required_cols = {
-            "Course", "Credits", "PassingGrades",
-            "Type", "FromSemester", "ToSemester"
-        }
-        if required_cols.issubset(courses_df.columns):
-            def sem_to_ord(s: str, lower: bool):
-                if pd.isna(s) or str(s).strip() == "":
-                    return float('-inf') if lower else float('inf')
-                sem, yr = str(s).split("-")
-                return int(yr) * 3 + {"FALL": 0, "SPRING": 1, "SUMMER": 2}[sem.upper()]
-
-            target_rules = {}
-            intensive_rules = {}
-            required_credits = {}
-            intensive_credits = {}
-
-            for _, row in courses_df.iterrows():
-                course   = str(row["Course"]).strip().upper()
-                creds    = int(row["Credits"])
-                pg       = str(row["PassingGrades"]).strip()
-                typ      = str(row["Type"]).strip().lower()
-                fr_ord   = sem_to_ord(row["FromSemester"], lower=True)
-                to_ord   = sem_to_ord(row["ToSemester"],   lower=False)
-                rule_dict = {
-                    "Credits":       creds,
-                    "PassingGrades": pg,
-                    "FromOrd":       fr_ord,
-                    "ToOrd":         to_ord
-                }
+        courses_csv = _local_path("courses_config.csv")
 
-                if typ == "required":
-                    required_credits[course] = creds
-                    target_rules.setdefault(course, []).append(rule_dict)
-                else:
-                    intensive_credits[course] = creds
-                    intensive_rules.setdefault(course, []).append(rule_dict)
+    # --- Compile into rule tables and credit maps (cached by the CSV's hash) ---
+    if courses_csv is not None:
+        try:
+            rule_set = load_course_rule_set(courses_csv)
 
             # Save into session_state under Major‐scoped keys
-            st.session_state[f"{major}_target_course_rules"]    = target_rules
-            st.session_state[f"{major}_intensive_course_rules"] = intensive_rules
-            st.session_state[f"{major}_target_courses"]         = required_credits
-            st.session_state[f"{major}_intensive_courses"]      = intensive_credits
+            st.session_state[f"{major}_course_rule_set"]        = rule_set
+            st.session_state[f"{major}_target_course_rules"]    = rule_set.target_rules
+            st.session_state[f"{major}_intensive_course_rules"] = rule_set.intensive_rules
+            st.session_state[f"{major}_target_courses"]         = rule_set.target_courses
+            st.session_state[f"{major}_intensive_courses"]      = rule_set.intensive_courses
 
             st.success("Courses configuration loaded successfully.")
-        else:
-            st.error(
-                "CSV must contain columns: " + ", ".join(sorted(required_cols))
-            )
+        except ValueError as e:
+            st.error(str(e))
     else:
         st.info("No courses configuration available. Please upload a file.")
 
@@ -239,11 +182,7 @@ with st.expander("Equivalent Courses", expanded=False):
     # Ensure file exists locally (download or create)
     local_eq = _local_path("equivalent_courses.csv")
     try:
-        creds = authenticate_google_drive()
-        service = build("drive", "v3", credentials=creds)
-        fid = search_file(service, _drive_path("equivalent_courses.csv"))
-        if fid:
-            download_file(service, fid, local_eq)
+        fetch_artifact(_drive_path("equivalent_courses.csv"), local_eq)
     except Exception:
         pass
 
@@ -253,10 +192,7 @@ with st.expander("Equivalent Courses", expanded=False):
         eq_df = pd.DataFrame(columns=["Course", "Equivalent"])
         # Create an empty file both locally and on Drive
         eq_df.to_csv(local_eq, index=False)
-        try:
-            upload_file(service, local_eq, _drive_path("equivalent_courses.csv"))
-        except Exception:
-            pass
+        enqueue_upload(local_eq, _drive_path("equivalent_courses.csv"))
 
     # Clean columns and show editor
     if "Course" not in eq_df.columns or "Equivalent" not in eq_df.columns:
@@ -281,24 +217,15 @@ with st.expander("Equivalent Courses", expanded=False):
                     cleaned = cleaned[(cleaned["Course"] != "") & (cleaned["Equivalent"] != "")]
                     cleaned.to_csv(local_eq, index=False)
 
-                    # Push to Drive
-                    try:
-                        fid = search_file(service, _drive_path("equivalent_courses.csv"))
-                        if fid:
-                            update_file(service, fid, local_eq)
-                        else:
-                            upload_file(service, local_eq, _drive_path("equivalent_courses.csv"))
-                        st.success("Equivalent courses saved to Google Drive.")
-                    except Exception as e:
-                        st.warning(f"Saved locally but could not sync to Drive: {e}")
+                    # Push to Drive in the background
+                    enqueue_upload(local_eq, _drive_path("equivalent_courses.csv"))
+                    st.success("Equivalent courses saved; syncing to Google Drive in the background.")
                 except Exception as e:
                     st.error(f"Error saving equivalent courses: {e}")
         with c2:
             if st.button("Reload from Google Drive"):
                 try:
-                    fid = search_file(service, _drive_path("equivalent_courses.csv"))
-                    if fid:
-                        download_file(service, fid, local_eq)
+                    if fetch_artifact(_drive_path("equivalent_courses.csv"), local_eq):
                         st.success("Reloaded equivalent courses from Google Drive.")
                         st.rerun()
                     else:
@@ -327,29 +254,16 @@ with st.expander("Assignment Types Configuration", expanded=False):
                 with open(assign_types_local, "w", encoding="utf-8") as f:
                     json.dump(new_types, f, ensure_ascii=False, indent=2)
 
-                # Sync to Drive
-                try:
-                    creds = authenticate_google_drive()
-                    service = build("drive", "v3", credentials=creds)
-                    fid = search_file(service, assign_types_drive)
-                    if fid:
-                        update_file(service, fid, assign_types_local)
-                    else:
-                        upload_file(service, assign_types_local, assign_types_drive)
-                    st.success("Assignment types saved to Google Drive.")
-                except Exception as e:
-                    st.warning(f"Saved locally but could not sync to Drive: {e}")
+                # Sync to Drive in the background
+                enqueue_upload(assign_types_local, assign_types_drive)
+                st.success("Assignment types saved; syncing to Google Drive in the background.")
             except Exception as e:
                 st.error(f"Error saving assignment types: {e}")
 
     with colB:
         if st.button("Reload Assignment Types from Google Drive"):
             try:
-                creds = authenticate_google_drive()
-                service = build("drive", "v3", credentials=creds)
-                fid = search_file(service, assign_types_drive)
-                if fid:
-                    download_file(service, fid, assign_types_local)
+                if fetch_artifact(assign_types_drive, assign_types_local):
                     with open(assign_types_local, "r", encoding="utf-8") as f:
                         loaded = json.load(f)
                     if isinstance(loaded, list) and loaded:
@@ -1,24 +1,20 @@
 import streamlit as st
 import pandas as pd
 from data_processing import (
-    process_progress_report,
-    calculate_credits,
+    calculate_credits_batch,
+    assigned_course_mask,
     save_report_with_formatting,
     read_equivalent_courses
 )
-from ui_components import display_dataframes, add_assignment_selection
+from ui_components import display_dataframes, add_assignment_selection, show_sync_status
 from assignment_utils import save_assignments, validate_assignments, reset_assignments, load_assignments
-from google_drive_utils import authenticate_google_drive, search_file, download_file
-from googleapiclient.discovery import build
+from storage import fetch_artifact
 from datetime import datetime
 import os
-from config import (
-    get_allowed_assignment_types,
-    GRADE_ORDER,
-    extract_primary_grade_from_full_value,
-    cell_color
-)
-from completion_utils import collapse_pass_fail_value
+from config import get_allowed_assignment_types
+from grade_cells import render_full, render_primary, render_collapsed, status_styles
+from progress_snapshot import build_progress_snapshot, update_snapshot_assignments, update_snapshot_report
+from report_cache import ReportCache, ReportTables, report_key, value_fingerprint
 
 st.title("View Reports")
 st.markdown("---")
@@ -31,6 +27,7 @@ if "selected_major" not in st.session_state or st.session_state["selected_major"
 major = st.session_state["selected_major"]
 local_folder = os.path.join("configs", major)
 os.makedirs(local_folder, exist_ok=True)
+show_sync_status(major)
 
 def _active_assignment_types_for_major(mj: str):
     """Resolve the assignment types currently active for this Major."""
@@ -66,16 +63,14 @@ target_courses    = st.session_state[target_key]
 intensive_courses = st.session_state[intensive_key]
 target_rules      = st.session_state[target_rules_key]
 intensive_rules   = st.session_state[intensive_rules_key]
+# Precompiled rules from Customize Courses (absent for sessions configured before it existed)
+rule_set          = st.session_state.get(f"{major}_course_rule_set")
 
 # === 3) Sync & load assignments from Google Drive for this Major ===
 csv_path_for_major = os.path.join(local_folder, "sce_fec_assignments.csv")
 try:
-    creds = authenticate_google_drive()
-    service = build("drive", "v3", credentials=creds)
     drive_name = f"configs/{major}/sce_fec_assignments.csv"
-    fid = search_file(service, drive_name)
-    if fid:
-        download_file(service, fid, csv_path_for_major)
+    if fetch_artifact(drive_name, csv_path_for_major):
         st.info("Loaded assignments from Google Drive.")
 except Exception:
     pass
@@ -94,31 +89,84 @@ else:
     equivalent_courses_mapping = {}
 
 # === 5) Process the progress report using explicitly passed rules ===
-full_req_df, intensive_req_df, extra_courses_df, _ = process_progress_report(
+# Rendered tables are memoized per Major, keyed by fingerprints of every input, so
+# toggles, searches and checkbox clicks re-render without recomputing them.
+report_cache = st.session_state.setdefault("report_cache", ReportCache())
+# (base report, merged report, changed student IDs) of a term update merged on the Upload page
+report_delta = st.session_state.pop(f"{major}_report_delta", None)
+cache_key = report_key(
     df,
-    target_courses,
-    intensive_courses,
-    target_rules,
-    intensive_rules,
+    value_fingerprint([target_courses, intensive_courses, target_rules, intensive_rules]),
+    equivalent_courses_mapping,
     per_student_assignments,
-    equivalent_courses_mapping
+    get_allowed_assignment_types()
 )
+tables = report_cache.get(major, cache_key)
+if tables is None:
+    # Cells stay typed (grade codes + status); display strings are rendered below.
+    # The last result is kept per Major: if only assignments or a merged term update
+    # changed since, just the affected students are recomputed.
+    snapshot_key = f"{major}_progress_snapshot"
+    snapshot = st.session_state.get(snapshot_key)
+    if (
+        snapshot is not None
+        and report_delta is not None
+        and report_delta[1] is df
+        and snapshot.depends_on(
+            report_delta[0],
+            target_courses,
+            intensive_courses,
+            target_rules,
+            intensive_rules,
+            equivalent_courses_mapping
+        )
+    ):
+        snapshot = update_snapshot_report(snapshot, df, report_delta[2])
+    if snapshot is not None and snapshot.depends_on(
+        df,
+        target_courses,
+        intensive_courses,
+        target_rules,
+        intensive_rules,
+        equivalent_courses_mapping
+    ):
+        snapshot = update_snapshot_assignments(snapshot, per_student_assignments)
+    else:
+        snapshot = build_progress_snapshot(
+            df,
+            target_courses,
+            intensive_courses,
+            target_rules,
+            intensive_rules,
+            per_student_assignments,
+            equivalent_courses_mapping,
+            rule_index=rule_set.index if rule_set is not None else None
+        )
+    st.session_state[snapshot_key] = snapshot
+
+    # === 6) Calculate credits for both Required & Intensive ===
+    full_req_df = render_full(snapshot.required)
+    intensive_req_df = render_full(snapshot.intensive)
+    credits_df = calculate_credits_batch(full_req_df, target_courses, snapshot.required.status)
+    int_credits_df = calculate_credits_batch(intensive_req_df, intensive_courses, snapshot.intensive.status)
+
+    # === 7) Build Primary‐Grade and Completed/Not Completed views (for toggling) ===
+    tables = ReportTables(
+        required_cells=snapshot.required,
+        intensive_cells=snapshot.intensive,
+        full_req_df=pd.concat([full_req_df, credits_df], axis=1),
+        intensive_req_df=pd.concat([intensive_req_df, int_credits_df], axis=1),
+        primary_req_df=pd.concat([render_primary(snapshot.required), credits_df], axis=1),
+        primary_int_df=pd.concat([render_primary(snapshot.intensive), int_credits_df], axis=1),
+        collapsed_req_df=render_collapsed(snapshot.required),
+        collapsed_int_df=render_collapsed(snapshot.intensive),
+        req_styles=status_styles(snapshot.required),
+        int_styles=status_styles(snapshot.intensive),
+        extra_courses_df=snapshot.extra_courses_df
+    )
+    report_cache.put(major, cache_key, tables)
 
-# === 6) Calculate credits for both Required & Intensive ===
-credits_df = full_req_df.apply(lambda r: calculate_credits(r, target_courses), axis=1)
-full_req_df = pd.concat([full_req_df, credits_df], axis=1)
-
-int_credits_df = intensive_req_df.apply(lambda r: calculate_credits(r, intensive_courses), axis=1)
-intensive_req_df = pd.concat([intensive_req_df, int_credits_df], axis=1)
-
-# === 7) Build Primary‐Grade view (for toggling) ===
-primary_req_df = full_req_df.copy()
-for c in target_courses:
-    primary_req_df[c] = primary_req_df[c].apply(extract_primary_grade_from_full_value)
-
-primary_int_df = intensive_req_df.copy()
-for c in intensive_courses:
-    primary_int_df[c] = primary_int_df[c].apply(extract_primary_grade_from_full_value)
+extra_courses_df = tables.extra_courses_df
 
 # === 8) Toggles: All Grades vs. Primary‐Only ===
 show_all_toggle = st.checkbox(
@@ -128,11 +176,11 @@ show_all_toggle = st.checkbox(
 )
 
 if show_all_toggle:
-    displayed_req_df = full_req_df.copy()
-    displayed_int_df = intensive_req_df.copy()
+    displayed_req_df = tables.full_req_df.copy()
+    displayed_int_df = tables.intensive_req_df.copy()
 else:
-    displayed_req_df = primary_req_df.copy()
-    displayed_int_df = primary_int_df.copy()
+    displayed_req_df = tables.primary_req_df.copy()
+    displayed_int_df = tables.primary_int_df.copy()
 
 # === 9) Toggle: Show Completed/Not Completed Only ===
 show_complete_toggle = st.checkbox(
@@ -141,13 +189,10 @@ show_complete_toggle = st.checkbox(
     help="If enabled, displays 'c' for passed courses, 'cr' for current registrations, and 'nc' for not completed."
 )
 if show_complete_toggle:
-    def collapse_pass_fail(val):
-        return collapse_pass_fail_value(val)
-
     for course in target_courses:
-        displayed_req_df[course] = displayed_req_df[course].apply(collapse_pass_fail)
+        displayed_req_df[course] = tables.collapsed_req_df[course]
     for course in intensive_courses:
-        displayed_int_df[course] = displayed_int_df[course].apply(collapse_pass_fail)
+        displayed_int_df[course] = tables.collapsed_int_df[course]
 
 # === 10) Search box for Progress Tables ===
 search_progress = st.text_input(
@@ -156,23 +201,26 @@ search_progress = st.text_input(
 )
 if search_progress:
     mask_req = (
-        displayed_req_df["ID"].astype(str).str.contains(search_progress, case=False, na=False)
+        displayed_req_df["ID"].str.contains(search_progress, case=False, na=False)
         | displayed_req_df["NAME"].str.contains(search_progress, case=False, na=False)
     )
     mask_int = (
-        displayed_int_df["ID"].astype(str).str.contains(search_progress, case=False, na=False)
+        displayed_int_df["ID"].str.contains(search_progress, case=False, na=False)
         | displayed_int_df["NAME"].str.contains(search_progress, case=False, na=False)
     )
     displayed_req_df = displayed_req_df[mask_req]
     displayed_int_df = displayed_int_df[mask_int]
 
 # === 11) Style and Display the DataFrames ===
-styled_req = displayed_req_df.style.applymap(
-    cell_color,
+# Colors come from the cell status matrix, aligned on the (possibly filtered) row index
+styled_req = displayed_req_df.style.apply(
+    lambda data: tables.req_styles.loc[data.index, data.columns],
+    axis=None,
     subset=pd.IndexSlice[:, list(target_courses.keys())]
 )
-styled_int = displayed_int_df.style.applymap(
-    cell_color,
+styled_int = displayed_int_df.style.apply(
+    lambda data: tables.int_styles.loc[data.index, data.columns],
+    axis=None,
     subset=pd.IndexSlice[:, list(intensive_courses.keys())]
 )
 
@@ -198,17 +246,10 @@ st.caption(f"Active assignment types for **{major}**: {', '.join(active_types) i
 # so selections don't disappear and can be un-checked/changed.
 ui_extras = extra_courses_df.copy()
 
-# Gather assigned (student_id, course) pairs
-assigned_pairs = set()
-for sid, mapping in per_student_assignments.items():
-    for atype, crs in mapping.items():
-        if atype == "_note":
-            continue
-        assigned_pairs.add((str(sid), str(crs)))
-
-if assigned_pairs:
-    # Re-add assigned rows from the raw df (ID, NAME, Course, Grade, Year, Semester)
-    add_back = df[df.apply(lambda r: (str(r.get("ID")), str(r.get("Course"))) in assigned_pairs, axis=1)]
+# Re-add assigned rows from the raw df (ID, NAME, Course, Grade, Year, Semester)
+assigned_mask = assigned_course_mask(df, per_student_assignments)
+if assigned_mask.any():
+    add_back = df[assigned_mask]
     cols = [c for c in ["ID", "NAME", "Course", "Grade", "Year", "Semester"] if c in add_back.columns]
     add_back = add_back[cols].drop_duplicates(subset=["ID", "Course"])
     if not add_back.empty:
@@ -219,14 +260,7 @@ if assigned_pairs:
 for at in active_types:
     if at not in ui_extras.columns:
         ui_extras[at] = False
-
-for sid, mapping in per_student_assignments.items():
-    for at, crs in mapping.items():
-        if at == "_note":
-            continue
-        if at in ui_extras.columns:
-            mask = (ui_extras["ID"].astype(str) == str(sid)) & (ui_extras["Course"].astype(str) == str(crs))
-            ui_extras.loc[mask, at] = True
+    ui_extras[at] = ui_extras[at] | assigned_course_mask(ui_extras, per_student_assignments, [at])
 
 # Search within the Assign Courses table
 search_assign = st.text_input(
@@ -236,7 +270,7 @@ search_assign = st.text_input(
 filtered_extras = ui_extras.copy()
 if search_assign:
     filtered_extras = filtered_extras[
-        filtered_extras["ID"].astype(str).str.contains(search_assign, case=False, na=False)
+        filtered_extras["ID"].str.contains(search_assign, case=False, na=False)
         | filtered_extras["NAME"].str.contains(search_assign, case=False, na=False)
         | filtered_extras["Course"].str.contains(search_assign, case=False, na=False)
     ]
@@ -264,9 +298,11 @@ if errors:
     for err in errors:
         st.write(f"- {err}")
 elif save_btn:
-    save_assignments(updated_assignments, csv_path=csv_path_for_major)
-    st.success("Assignments saved for this Major.")
-    st.rerun()
+    if save_assignments(updated_assignments, csv_path=csv_path_for_major):
+        st.success("Assignments saved for this Major.")
+        st.rerun()
+    else:
+        st.info("No assignment changes to save; this Major's assignments are already up to date.")
 
 if download_btn:
     output = save_report_with_formatting(
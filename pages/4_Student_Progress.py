@@ -34,39 +34,12 @@ def _require_major_and_data():
 @st.cache_data(show_spinner=False)
 def _prepare_student_progress_df(df: pd.DataFrame):
     """
-    Clean and prepare the long-format progress df:
-    Ensures consistent casing and a sortable term order column.
-    Expected input columns: ['ID','NAME','Course','Grade','Year','Semester']
+    Orders the long-format progress df chronologically, then by Course.
+    The df is already in the ingestion schema (data_processing.apply_report_schema):
+    stripped categorical text columns, integer Year and a TermOrd term ordinal.
+    Expected input columns: ['ID','NAME','Course','Grade','Year','Semester','TermOrd']
     """
-    work = df.copy()
-
-    # Clean common columns
-    for col in ["Course", "Grade"]:
-        if col in work.columns:
-            work[col] = work[col].astype(str).str.strip()
-
-    # Normalize Semester and Year text
-    if "Semester" in work.columns:
-        work["Semester"] = work["Semester"].astype(str).str.strip().str.title()
-    if "Year" in work.columns:
-        work["Year"] = work["Year"].astype(str).str.strip()
-
-    # Map a term sort order (Spring < Summer < Fall by default)
-    term_order_map = {"Spring": 1, "Summer": 2, "Fall": 3}
-    work["TermOrder"] = work["Semester"].map(lambda s: term_order_map.get(str(s).title(), 99))
-
-    # Make a combined term label like "Fall-2024"
-    work["Term"] = work["Semester"].fillna("") + "-" + work["Year"].fillna("")
-
-    # Sort by (Year asc, TermOrder asc), then Course
-    # Convert Year to numeric where possible for proper sorting
-    def _to_int(x):
-        try:
-            return int(str(x))
-        except Exception:
-            return 0
-    work["_YearInt"] = work["Year"].apply(_to_int)
-    work = work.sort_values(by=["_YearInt", "TermOrder", "Course"], ascending=[True, True, True]).reset_index(drop=True)
+    work = df.sort_values(by=["TermOrd", "Course"], na_position="first").reset_index(drop=True)
 
     # Columns for display
     display_cols = ["ID", "NAME", "Year", "Semester", "Course", "Grade"]
@@ -125,19 +98,20 @@ with st.sidebar:
     st.header("Filters")
 
     # Student selector
-    student_options = (progress_df["ID"].astype(str) + " - " + progress_df["NAME"]).unique().tolist()
+    students = progress_df[["ID", "NAME"]].drop_duplicates()
+    student_options = (students["ID"] + " - " + students["NAME"].astype(str)).unique().tolist()
     student_options = sorted(student_options, key=lambda x: x.split(" - ")[-1])  # sort by name
     selected_student_option = st.selectbox("Select Student", ["— All Students —"] + student_options, index=0)
 
     # Year filter (multi)
-    years = sorted(progress_df["Year"].unique(), key=lambda x: (str(x)))
+    years = sorted(int(y) for y in progress_df["Year"].dropna().unique())
     selected_years = st.multiselect("Filter by Year", options=years, default=years)
 
     # Course name search
     course_search = st.text_input("Search Course Code/Name", value="")
 
     # Grade filter (multi)
-    grades = sorted(progress_df["Grade"].astype(str).unique())
+    grades = sorted(progress_df["Grade"].dropna().unique())
     selected_grades = st.multiselect("Filter by Grade", options=grades, default=grades)
 
     st.caption("Tip: Use the main page to upload or reload the progress report at any time; this page updates automatically.")
@@ -148,20 +122,20 @@ filtered = progress_df.copy()
 # Student filter
 if selected_student_option != "— All Students —":
     selected_id = selected_student_option.split(" - ")[0]
-    filtered = filtered[filtered["ID"].astype(str) == selected_id]
+    filtered = filtered[filtered["ID"] == selected_id]
 
-# Year filter
-if selected_years:
+# Year filter (rows without a year are only hidden once the selection is narrowed)
+if selected_years and len(selected_years) < len(years):
     filtered = filtered[filtered["Year"].isin(selected_years)]
 
 # Course search
 if course_search.strip():
     q = course_search.strip().lower()
-    filtered = filtered[filtered["Course"].str.lower().str.contains(q)]
+    filtered = filtered[filtered["Course"].str.lower().str.contains(q, na=False)]
 
-# Grade filter
-if selected_grades:
-    filtered = filtered[filtered["Grade"].astype(str).isin(selected_grades)]
+# Grade filter (rows without a grade are only hidden once the selection is narrowed)
+if selected_grades and len(selected_grades) < len(grades):
+    filtered = filtered[filtered["Grade"].isin(selected_grades)]
 
 # Layout: top KPIs (only for a single student selection)
 if selected_student_option != "— All Students —" and not filtered.empty:
@@ -192,8 +166,8 @@ with st.expander("Grouped View (Semester-Year → Courses)"):
     else:
         grouped = (
             filtered
-            .assign(Semester_Year=filtered["Semester"] + "-" + filtered["Year"])
-            .groupby(["ID", "NAME", "Semester_Year"], as_index=False)
+            .assign(Semester_Year=filtered["Semester"].astype(str) + "-" + filtered["Year"].astype(str))
+            .groupby(["ID", "NAME", "Semester_Year"], as_index=False, observed=True)
             .agg({
                 "Course": lambda x: ", ".join(sorted(x.unique())),
                 "Grade": lambda x: ", ".join(x.astype(str))
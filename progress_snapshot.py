@@ -0,0 +1,195 @@
+"""Last engine result for a Major, patched per student when assignments or report rows change."""
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from config import get_allowed_assignment_types
+from data_processing import RuleIndex, build_progress_cells, compile_rule_index
+from grade_cells import GradeCells, replace_students
+
+
+@dataclass
+class ProgressSnapshot:
+    """
+    The Required/Intensive cells and extras computed from `df`, together with every input
+    they depend on. Everything except `assignments` is a dependency key: if any of them
+    differs the snapshot is rebuilt, otherwise only students whose slots changed are redone.
+    """
+    df: pd.DataFrame
+    target_courses: dict
+    intensive_courses: dict
+    target_rules: dict
+    intensive_rules: dict
+    equivalent_courses_mapping: dict
+    allowed_types: list
+    rule_index: RuleIndex
+    student_rows: dict      # { str(ID): positions of that student's rows in df }
+    assignments: dict       # { str(ID): { assignment_type: course } }, "_note" dropped
+    required: GradeCells
+    intensive: GradeCells
+    extra_courses_df: pd.DataFrame
+    extra_courses_list: list
+
+    def depends_on(
+        self,
+        df: pd.DataFrame,
+        target_courses: dict,
+        intensive_courses: dict,
+        target_rules: dict,
+        intensive_rules: dict,
+        equivalent_courses_mapping: dict = None
+    ) -> bool:
+        """True if the snapshot was computed from these inputs (the df by identity)."""
+        return (
+            self.df is df
+            and self.target_courses == target_courses
+            and self.intensive_courses == intensive_courses
+            and self.target_rules == target_rules
+            and self.intensive_rules == intensive_rules
+            and self.equivalent_courses_mapping == (equivalent_courses_mapping or {})
+            and self.allowed_types == list(get_allowed_assignment_types())
+        )
+
+
+def _assignment_slots(per_student_assignments: dict) -> dict:
+    """Normalizes assignments to { str(ID): slots }, without notes or empty entries."""
+    slots = {}
+    for sid, assigns in (per_student_assignments or {}).items():
+        kept = {atype: course for atype, course in assigns.items() if atype != "_note"}
+        if kept:
+            slots[str(sid)] = kept
+    return slots
+
+
+def build_progress_snapshot(
+    df: pd.DataFrame,
+    target_courses: dict,
+    intensive_courses: dict,
+    target_rules: dict,
+    intensive_rules: dict,
+    per_student_assignments: dict = None,
+    equivalent_courses_mapping: dict = None,
+    rule_index: RuleIndex = None
+) -> ProgressSnapshot:
+    """Runs `build_progress_cells` over the whole report and keeps its inputs."""
+    if rule_index is None:
+        rule_index = compile_rule_index(target_rules, intensive_rules)
+    required, intensive, extra_courses_df, extra_courses_list = build_progress_cells(
+        df,
+        target_courses,
+        intensive_courses,
+        target_rules,
+        intensive_rules,
+        per_student_assignments,
+        equivalent_courses_mapping,
+        rule_index=rule_index
+    )
+    return ProgressSnapshot(
+        df=df,
+        target_courses=target_courses,
+        intensive_courses=intensive_courses,
+        target_rules=target_rules,
+        intensive_rules=intensive_rules,
+        equivalent_courses_mapping=equivalent_courses_mapping or {},
+        allowed_types=list(get_allowed_assignment_types()),
+        rule_index=rule_index,
+        student_rows=df.groupby(df["ID"].astype(str).to_numpy()).indices,
+        assignments=_assignment_slots(per_student_assignments),
+        required=required,
+        intensive=intensive,
+        extra_courses_df=extra_courses_df,
+        extra_courses_list=extra_courses_list,
+    )
+
+
+def update_snapshot_assignments(snapshot: ProgressSnapshot, per_student_assignments: dict) -> ProgressSnapshot:
+    """
+    Returns the snapshot for new assignments. Assignments only move a student's own rows
+    between course columns and the extras, so just the students whose slots changed are
+    recomputed and patched into the Required/Intensive cells and the extras frame.
+    """
+    slots = _assignment_slots(per_student_assignments)
+    changed = {
+        sid for sid in snapshot.assignments.keys() | slots.keys()
+        if snapshot.assignments.get(sid) != slots.get(sid)
+    }
+    if not changed:
+        return snapshot
+    return _recompute_students(snapshot, snapshot.df, snapshot.student_rows, changed, slots)
+
+
+def update_snapshot_report(snapshot: ProgressSnapshot, df: pd.DataFrame, changed_students) -> ProgressSnapshot:
+    """
+    Returns the snapshot for a new report `df` that differs from the snapshot's only in the
+    rows of `changed_students` (str IDs), as produced by `merge_progress_delta`: every other
+    row must be present in `df` under the same index label and in the same relative order.
+    Only the changed students are recomputed.
+    """
+    student_rows = df.groupby(df["ID"].astype(str).to_numpy()).indices
+    return _recompute_students(snapshot, df, student_rows, set(map(str, changed_students)), snapshot.assignments)
+
+
+def _recompute_students(
+    snapshot: ProgressSnapshot,
+    df: pd.DataFrame,
+    student_rows: dict,
+    changed: set,
+    slots: dict
+) -> ProgressSnapshot:
+    """Recomputes the `changed` students from `df` and patches them into the snapshot."""
+    if not df.index.is_unique:
+        # Extras are re‐ordered by index label below, which needs unique labels
+        return build_progress_snapshot(
+            df,
+            snapshot.target_courses,
+            snapshot.intensive_courses,
+            snapshot.target_rules,
+            snapshot.intensive_rules,
+            slots,
+            snapshot.equivalent_courses_mapping,
+            rule_index=snapshot.rule_index
+        )
+
+    positions = [student_rows[sid] for sid in changed if sid in student_rows]
+    rows = df.iloc[np.sort(np.concatenate(positions))] if positions else df.iloc[:0]
+    required, intensive, extras, _ = build_progress_cells(
+        rows,
+        snapshot.target_courses,
+        snapshot.intensive_courses,
+        snapshot.target_rules,
+        snapshot.intensive_rules,
+        {sid: slots[sid] for sid in changed if sid in slots},
+        snapshot.equivalent_courses_mapping,
+        rule_index=snapshot.rule_index
+    )
+
+    def patch(cells: GradeCells, new: GradeCells) -> GradeCells:
+        drop = cells.students["ID"].astype(str).isin(changed).to_numpy()
+        return replace_students(cells, drop, new)
+
+    kept_extras = snapshot.extra_courses_df[
+        ~snapshot.extra_courses_df["ID"].astype(str).isin(changed)
+    ]
+    extra_courses_df = pd.concat([kept_extras.astype(extras.dtypes.to_dict()), extras])
+    extra_courses_df = extra_courses_df.iloc[
+        np.argsort(df.index.get_indexer(extra_courses_df.index), kind="stable")
+    ]
+
+    return ProgressSnapshot(
+        df=df,
+        target_courses=snapshot.target_courses,
+        intensive_courses=snapshot.intensive_courses,
+        target_rules=snapshot.target_rules,
+        intensive_rules=snapshot.intensive_rules,
+        equivalent_courses_mapping=snapshot.equivalent_courses_mapping,
+        allowed_types=snapshot.allowed_types,
+        rule_index=snapshot.rule_index,
+        student_rows=student_rows,
+        assignments=slots,
+        required=patch(snapshot.required, required),
+        intensive=patch(snapshot.intensive, intensive),
+        extra_courses_df=extra_courses_df,
+        extra_courses_list=sorted(extra_courses_df["Course"].unique()),
+    )
@@ -0,0 +1,105 @@
+"""Memoized View Reports tables, keyed by fingerprints of the inputs they are computed from."""
+
+import hashlib
+import json
+import weakref
+from collections import OrderedDict
+from dataclasses import dataclass
+
+import pandas as pd
+
+from grade_cells import GradeCells
+
+# Fingerprints of live DataFrames, by id(); the weakref detects a recycled id
+_frame_fingerprints: dict = {}
+
+
+def frame_fingerprint(df: pd.DataFrame) -> str:
+    """
+    SHA‐1 of a DataFrame's values, index, columns and dtypes. Computed once per object:
+    frames held in session_state are treated as immutable, so later calls are a dict lookup.
+    """
+    cached = _frame_fingerprints.get(id(df))
+    if cached is not None and cached[0]() is df:
+        return cached[1]
+
+    digest = hashlib.sha1()
+    digest.update(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+    digest.update(repr(list(zip(df.columns, map(str, df.dtypes)))).encode())
+    fingerprint = digest.hexdigest()
+
+    key = id(df)
+    _frame_fingerprints[key] = (weakref.ref(df, lambda _: _frame_fingerprints.pop(key, None)), fingerprint)
+    return fingerprint
+
+
+def value_fingerprint(value) -> str:
+    """SHA‐1 of a JSON‐like value (dicts of courses, rules, assignments), independent of key order."""
+    return hashlib.sha1(json.dumps(value, sort_keys=True, default=str).encode()).hexdigest()
+
+
+@dataclass(frozen=True)
+class ReportTables:
+    """Everything View Reports renders from one engine run. Treat the frames as read‐only."""
+    required_cells: GradeCells
+    intensive_cells: GradeCells
+    full_req_df: pd.DataFrame        # all attempts + credit columns
+    intensive_req_df: pd.DataFrame
+    primary_req_df: pd.DataFrame     # primary grade + credit columns
+    primary_int_df: pd.DataFrame
+    collapsed_req_df: pd.DataFrame   # c / cr / nc
+    collapsed_int_df: pd.DataFrame
+    req_styles: pd.DataFrame         # CSS per course cell
+    int_styles: pd.DataFrame
+    extra_courses_df: pd.DataFrame
+
+
+class ReportCache:
+    """Bounded LRU of ReportTables per Major."""
+
+    def __init__(self, max_entries_per_major: int = 4):
+        self.max_entries_per_major = max_entries_per_major
+        self._entries: dict = {}   # { major: OrderedDict({ key: ReportTables }) }
+
+    def get(self, major: str, key: tuple):
+        """Returns the cached tables for `key` (marking them most recently used), or None."""
+        entries = self._entries.get(major)
+        if entries is None or key not in entries:
+            return None
+        entries.move_to_end(key)
+        return entries[key]
+
+    def put(self, major: str, key: tuple, tables: ReportTables):
+        """Stores `tables`, evicting the Major's least recently used entry when full."""
+        entries = self._entries.setdefault(major, OrderedDict())
+        entries[key] = tables
+        entries.move_to_end(key)
+        while len(entries) > self.max_entries_per_major:
+            entries.popitem(last=False)
+
+    def clear(self, major: str = None):
+        """Drops the entries of one Major, or of all Majors."""
+        if major is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(major, None)
+
+    def __len__(self):
+        return sum(len(entries) for entries in self._entries.values())
+
+
+def report_key(
+    df: pd.DataFrame,
+    rules_fingerprint: str,
+    equivalent_courses_mapping: dict,
+    per_student_assignments: dict,
+    allowed_types: list
+) -> tuple:
+    """Cache key for the View Reports tables of one set of inputs."""
+    return (
+        frame_fingerprint(df),
+        rules_fingerprint,
+        value_fingerprint(equivalent_courses_mapping or {}),
+        value_fingerprint(per_student_assignments or {}),
+        value_fingerprint(list(allowed_types)),
+    )
@@ -0,0 +1,244 @@
+"""
+Where the app's artifacts live. Every artifact has a storage name like
+'configs/PBHL/equivalent_courses.csv' and a local copy; callers go through a StorageBackend
+rather than the Drive API:
+
+    DriveBackend   Google Drive (the default)
+    LocalBackend   a directory standing in for Drive, with optional injected latency and
+                   failures, for tests and for measuring sync throughput offline
+
+The process-wide backend is Google Drive unless the STORAGE_DIR environment variable names a
+directory; STORAGE_LATENCY (seconds per call) and STORAGE_FAILURE_RATE (0–1) then configure it.
+"""
+
+import os
+import random
+import shutil
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+from google_drive_utils import (
+    DriveFile,
+    delete_file,
+    download_file,
+    download_lock,
+    file_md5,
+    find_file,
+    get_drive_service,
+    is_current_copy,
+    record_download,
+    sync_to_drive,
+)
+from logging_utils import log_action
+
+
+class StorageError(Exception):
+    """A storage call that failed (LocalBackend raises it for injected failures)."""
+
+
+class StorageBackend(ABC):
+    """
+    The operations the app needs from its artifact store. `find` returns a DriveFile
+    (id, md5, modified_time) or None; `download` is conditional, like download_file.
+    """
+
+    @abstractmethod
+    def find(self, name: str):
+        """The stored file `name` as a DriveFile, or None."""
+
+    @abstractmethod
+    def upload(self, local_path: str, name: str) -> str:
+        """Stores `local_path` as `name`. Returns 'updated' or 'uploaded'."""
+
+    @abstractmethod
+    def download(self, name: str, local_path: str) -> bool:
+        """Brings `local_path` up to date with `name`. False if there is no such file."""
+
+    @abstractmethod
+    def delete(self, name: str) -> bool:
+        """Removes `name`. False if there was no such file."""
+
+
+class DriveBackend(StorageBackend):
+    """Google Drive through google_drive_utils; the shared client unless `service` is given."""
+
+    def __init__(self, service=None):
+        self._service = service
+
+    @property
+    def service(self):
+        return self._service or get_drive_service()
+
+    def find(self, name: str):
+        return find_file(self.service, name)
+
+    def upload(self, local_path: str, name: str) -> str:
+        return sync_to_drive(self.service, local_path, name)
+
+    def download(self, name: str, local_path: str) -> bool:
+        service = self.service
+        existing = find_file(service, name)
+        if existing is None:
+            return False
+        download_file(service, existing.id, local_path, remote=existing)
+        return True
+
+    def delete(self, name: str) -> bool:
+        service = self.service
+        existing = find_file(service, name)
+        if existing is None:
+            return False
+        delete_file(service, existing.id)
+        return True
+
+
+class LocalBackend(StorageBackend):
+    """
+    Stores each artifact at `root/<name>`. Every call first sleeps `latency` seconds and then
+    fails with StorageError at `failure_rate`; `calls` counts the calls per operation.
+    """
+
+    def __init__(self, root: str, latency: float = 0.0, failure_rate: float = 0.0, seed: int = None):
+        self.root = root
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.calls = Counter()
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def _call(self, op: str, name: str) -> str:
+        with self._lock:
+            self.calls[op] += 1
+            failed = self._random.random() < self.failure_rate
+        if self.latency:
+            time.sleep(self.latency)
+        if failed:
+            raise StorageError(f"Injected failure: {op} {name}")
+        return os.path.join(self.root, *name.split('/'))
+
+    def _stat(self, path: str):
+        if not os.path.isfile(path):
+            return None
+        modified = datetime.fromtimestamp(os.path.getmtime(path), timezone.utc)
+        return DriveFile(path, file_md5(path), modified.isoformat())
+
+    def find(self, name: str):
+        return self._stat(self._call('find', name))
+
+    def upload(self, local_path: str, name: str) -> str:
+        path = self._call('upload', name)
+        existed = os.path.exists(path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        partial = f"{path}.{threading.get_ident()}.tmp"
+        shutil.copyfile(local_path, partial)
+        os.replace(partial, path)
+        return 'updated' if existed else 'uploaded'
+
+    def download(self, name: str, local_path: str) -> bool:
+        path = self._call('download', name)
+        with download_lock(local_path):
+            remote = self._stat(path)
+            if remote is None:
+                return False
+            if not is_current_copy(local_path, remote):
+                shutil.copyfile(path, local_path)
+            record_download(local_path, remote)
+            return True
+
+    def delete(self, name: str) -> bool:
+        path = self._call('delete', name)
+        if not os.path.exists(path):
+            return False
+        os.remove(path)
+        return True
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def get_storage() -> StorageBackend:
+    """The process-wide backend, chosen from the environment on first use (see module docstring)."""
+    global _backend
+    with _backend_lock:
+        if _backend is None:
+            root = os.environ.get('STORAGE_DIR')
+            if root:
+                _backend = LocalBackend(
+                    root,
+                    latency=float(os.environ.get('STORAGE_LATENCY', 0)),
+                    failure_rate=float(os.environ.get('STORAGE_FAILURE_RATE', 0)),
+                )
+            else:
+                _backend = DriveBackend()
+        return _backend
+
+
+def set_storage(backend: StorageBackend):
+    """Replaces the process-wide backend (None: choose again on next use)."""
+    global _backend
+    with _backend_lock:
+        _backend = backend
+
+
+def fetch_artifact(name: str, local_path: str, backend: StorageBackend = None) -> bool:
+    """
+    Brings `local_path` up to date with the stored `name`; unchanged files are not
+    transferred. False if there is no such file. Local changes still queued for upload
+    (see drive_sync) win over the stored older version.
+    """
+    from drive_sync import DELETE, UPLOAD, pending_op
+
+    queued = pending_op(name)
+    if queued == UPLOAD:
+        return True
+    if queued == DELETE:
+        return False
+    return (backend or get_storage()).download(name, local_path)
+
+
+# Everything a Major's pages read, all stored under configs/{major}/. Each entry lists
+# alternatives in order of preference, of which the first one stored is fetched: the
+# progress report's Parquet snapshot (see data_processing.save_report_snapshot), else the
+# original upload.
+MAJOR_ARTIFACTS = [
+    ('progress_report.parquet', 'progress_report.xlsx', 'progress_report.xls', 'progress_report.csv'),
+    ('courses_config.csv',),
+    ('equivalent_courses.csv',),
+    ('assignment_types.json',),
+    ('sce_fec_assignments.csv',),
+]
+
+_prefetch_pool = ThreadPoolExecutor(max_workers=len(MAJOR_ARTIFACTS), thread_name_prefix='prefetch')
+
+
+def prefetch_major(major: str, backend: StorageBackend = None) -> list:
+    """
+    Starts fetching all of a Major's artifacts into configs/{major}/ concurrently and returns
+    the futures, one per MAJOR_ARTIFACTS entry, each resolving to the name fetched (or None;
+    it raises only if every alternative failed).
+    On Drive, one listing of the Major's index finds them all; missing artifacts cost
+    nothing more and unchanged ones are not downloaded.
+    """
+    backend = backend or get_storage()
+
+    def fetch_first(names):
+        # A failed alternative falls through to the next; only if all of them fail is it an error
+        errors = []
+        for name in names:
+            try:
+                if fetch_artifact(f"configs/{major}/{name}", os.path.join("configs", major, name), backend):
+                    return name
+            except Exception as e:
+                log_action(f"Prefetch of configs/{major}/{name} failed: {e}")
+                errors.append(e)
+        if len(errors) == len(names):
+            raise errors[-1]
+        return None
+
+    os.makedirs(os.path.join("configs", major), exist_ok=True)
+    return [_prefetch_pool.submit(fetch_first, names) for names in MAJOR_ARTIFACTS]
@@ -0,0 +1,77 @@
+import sqlite3
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+import assignment_utils  # noqa: E402
+from assignment_utils import load_assignments, reset_assignments, save_assignments  # noqa: E402
+
+
+def _stored(db_path):
+    with sqlite3.connect(db_path) as conn:
+        return sorted(conn.execute("SELECT student_id, assignment_type, course FROM assignments"))
+
+
+def test_save_writes_only_the_difference(tmp_path, monkeypatch):
+    queued = []
+    monkeypatch.setattr(assignment_utils, "enqueue_upload", lambda local, name: queued.append(name))
+    db, csv = str(tmp_path / "assignments.db"), str(tmp_path / "sce_fec_assignments.csv")
+    assignments = {"1001": {"S.C.E.": "MATH101", "_note": "x"}, "1002": {"F.E.C.": "ENGL201"}}
+
+    assert save_assignments(assignments, db, csv)
+    assert _stored(db) == [("1001", "S.C.E.", "MATH101"), ("1002", "F.E.C.", "ENGL201")]
+    assert len(queued) == 1
+
+    # Unchanged: neither the CSV nor Drive is touched
+    written = Path(csv).stat().st_mtime_ns
+    assert not save_assignments({sid: dict(m) for sid, m in assignments.items()}, db, csv)
+    assert Path(csv).stat().st_mtime_ns == written and len(queued) == 1
+
+    # One changed and one removed row: one statement each
+    statements = []
+    conn = assignment_utils._connection(db)
+    conn.set_trace_callback(statements.append)
+    assert save_assignments({"1001": {"S.C.E.": "MATH102"}}, db, csv)
+    conn.set_trace_callback(None)
+    assert _stored(db) == [("1001", "S.C.E.", "MATH102")]
+    assert sum("DELETE FROM" in s or "INSERT OR REPLACE" in s for s in statements) == 2
+    assert pd.read_csv(csv, dtype=str).values.tolist() == [["1001", "S.C.E.", "MATH102"]]
+    assert len(queued) == 2
+
+    with sqlite3.connect(db) as conn:
+        assert conn.execute("PRAGMA journal_mode").fetchone() == ("wal",)
+
+
+def test_save_compares_with_the_majors_csv(tmp_path, monkeypatch):
+    queued = []
+    monkeypatch.setattr(assignment_utils, "enqueue_upload", lambda local, name: queued.append(name))
+    db = str(tmp_path / "assignments.db")
+    pbhl, nurs = str(tmp_path / "pbhl.csv"), str(tmp_path / "nurs.csv")
+    assignments = {"1001": {"S.C.E.": "MATH101"}}
+
+    save_assignments(assignments, db, pbhl)
+    # The DB already holds these rows, but NURS's CSV does not
+    assert save_assignments(assignments, db, nurs)
+
+    # A CSV refreshed from Drive differs from the DB: saving the DB's state still writes it
+    Path(pbhl).write_text("student_id,assignment_type,course\n1001,S.C.E.,MATH202\n")
+    assert save_assignments(assignments, db, pbhl)
+    assert load_assignments(db, pbhl) == assignments
+    assert queued == [pbhl, nurs, pbhl]
+
+
+def test_reset_closes_shared_connection(tmp_path, monkeypatch):
+    monkeypatch.setattr(assignment_utils, "enqueue_upload", lambda local, name: None)
+    monkeypatch.setattr(assignment_utils, "enqueue_delete", lambda name: None)
+    db, csv = str(tmp_path / "assignments.db"), str(tmp_path / "sce_fec_assignments.csv")
+
+    save_assignments({"1001": {"S.C.E.": "MATH101"}}, db, csv)
+    reset_assignments(csv, db)
+    assert not list(tmp_path.iterdir())
+    assert load_assignments(db, csv) == {}
+    assert save_assignments({"1001": {"S.C.E.": "MATH101"}}, db, csv)
+    assert load_assignments(db, csv) == {"1001": {"S.C.E.": "MATH101"}}
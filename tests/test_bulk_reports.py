@@ -0,0 +1,93 @@
+import sys
+import zipfile
+from pathlib import Path
+
+import pandas as pd
+
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from bulk_reports import ReportSource, list_report_sources, load_progress_reports  # noqa: E402
+from data_processing import read_progress_report  # noqa: E402
+
+
+def _cohort_long():
+    return pd.DataFrame({
+        "Student ID": [1001, 1001, 1002],
+        "Name": ["Alice", "Alice", "Bob"],
+        "Course": ["MATH101", "PBHL201", "MATH101"],
+        "Grade": ["A", None, "C"],
+        "Year": [2019, 2020, 2019],
+        "Semester": ["Fall", "Spring", "Fall"],
+    })
+
+
+def _cohort_wide():
+    return pd.DataFrame({
+        "STUDENT ID": ["201701579", "201801669"],
+        "NAME": ["Carol", "Dan"],
+        "COURSE 1": ["PBHL201/FALL-2017/F", "MATH101/SPRING-2019/B+"],
+        "COURSE 2": ["INEG300/FALL-2018/P", "BAD CELL"],
+    })
+
+
+def _write_bundle(folder: Path):
+    workbook = folder / "cohorts.xlsx"
+    with pd.ExcelWriter(workbook) as writer:
+        _cohort_long().to_excel(writer, sheet_name="2019", index=False)
+        _cohort_wide().to_excel(writer, sheet_name="2017", index=False)
+
+    term = folder / "term.csv"
+    _cohort_long().iloc[:1].to_csv(term, index=False)
+
+    archive = folder / "archive.zip"
+    with zipfile.ZipFile(archive, "w") as z:
+        z.write(workbook, "fall/cohorts.xlsx")
+        z.write(workbook, "copy/cohorts.xlsx")
+        z.writestr("fall/equivalent_courses.csv", "Course,Equivalent\nMATH101,MATH100\n")
+        z.writestr("__MACOSX/fall/._cohorts.xlsx", b"\x00")
+    return workbook, term, archive
+
+
+def test_lists_every_sheet_and_archive_member(tmp_path):
+    workbook, term, archive = _write_bundle(tmp_path)
+    labels = [s.label for s in list_report_sources([str(workbook), str(term), str(archive)])]
+
+    assert labels == [
+        "cohorts.xlsx [2019]",
+        "cohorts.xlsx [2017]",
+        "term.csv",
+        "archive.zip/fall/cohorts.xlsx [2019]",
+        "archive.zip/fall/cohorts.xlsx [2017]",
+        "archive.zip/fall/equivalent_courses.csv",
+    ]
+
+
+def test_labels_can_show_the_uploaded_name():
+    source = ReportSource("uploads/bulk/3f2a.zip", "fall/cohorts.xlsx", "2019")
+    assert source.label == "3f2a.zip/fall/cohorts.xlsx [2019]"
+    assert source.label_for("Fall terms.zip") == "Fall terms.zip/fall/cohorts.xlsx [2019]"
+
+
+def test_bulk_load_combines_sheets(tmp_path):
+    workbook, term, archive = _write_bundle(tmp_path)
+    df, results = load_progress_reports([str(workbook), str(term), str(archive)], max_workers=1)
+
+    assert [r.rows for r in results] == [3, 3, 1, 3, 3, 0]
+    assert len(results[1].malformed) == 1 and results[-1].error
+    # Repeated rows (the CSV, the archived copy) are kept once
+    assert len(df) == 6
+    assert sorted(df["NAME"].unique()) == ["Alice", "Bob", "Carol", "Dan"]
+
+    single = read_progress_report(str(term))
+    assert list(map(str, df.dtypes)) == list(map(str, single.dtypes))
+
+
+def test_process_pool_matches_inline(tmp_path):
+    workbook, term, archive = _write_bundle(tmp_path)
+    paths = [str(workbook), str(term), str(archive)]
+
+    inline, _ = load_progress_reports(paths, max_workers=1)
+    pooled, results = load_progress_reports(paths, max_workers=2)
+    pd.testing.assert_frame_equal(pooled, inline)
+    assert [r.rows for r in results] == [3, 3, 1, 3, 3, 0]
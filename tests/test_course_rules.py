@@ -0,0 +1,85 @@
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+import config  # noqa: E402
+import course_rules  # noqa: E402
+from course_rules import compile_course_rules, load_course_rule_set  # noqa: E402
+from data_processing import process_progress_report  # noqa: E402
+
+
+CONFIG_ROWS = [
+    ("MATH101", 3, "A,B,C", "Required", "", "SUMMER-2018"),
+    ("MATH101", 3, "A,B", "Required", "FALL-2018", ""),
+    ("SEMI100", 0, "A,B,C,D", "Required", "", ""),
+    ("INEG200", 3, "A+,A,A-", "Intensive", "FALL-2015", "SUMMER-9999"),
+]
+
+
+def _config_df():
+    return pd.DataFrame(
+        CONFIG_ROWS,
+        columns=["Course", "Credits", "PassingGrades", "Type", "FromSemester", "ToSemester"],
+    )
+
+
+def test_compile_course_rules():
+    rule_set = compile_course_rules(_config_df())
+
+    assert rule_set.target_courses == {"MATH101": 3, "SEMI100": 0}
+    assert rule_set.intensive_courses == {"INEG200": 3}
+    assert [r["PassingGrades"] for r in rule_set.target_rules["MATH101"]] == ["A,B,C", "A,B"]
+    assert frozenset({"A+", "A", "A-"}) in rule_set.index.passing
+
+
+def test_compile_course_rules_rejects_missing_columns():
+    with pytest.raises(ValueError):
+        compile_course_rules(_config_df().drop(columns=["ToSemester"]))
+
+
+def test_rule_set_cached_by_content_hash(tmp_path, monkeypatch):
+    monkeypatch.setattr(course_rules, "_memory_cache", {})
+    csv_path = tmp_path / "courses_config.csv"
+    _config_df().to_csv(csv_path, index=False)
+
+    first = load_course_rule_set(str(csv_path))
+    assert load_course_rule_set(str(csv_path)) is first
+    assert [p.name for p in tmp_path.glob(".course_rules-*.pkl")] == [f".course_rules-{first.sha}.pkl"]
+
+    # A fresh process reads the pickle instead of recompiling
+    monkeypatch.setattr(course_rules, "_memory_cache", {})
+    monkeypatch.setattr(course_rules, "compile_course_rules", None)
+    assert load_course_rule_set(str(csv_path)).target_rules == first.target_rules
+
+
+def test_rule_set_pickle_is_tied_to_the_term_scale(tmp_path, monkeypatch):
+    monkeypatch.setattr(course_rules, "_memory_cache", {})
+    csv_path = tmp_path / "courses_config.csv"
+    _config_df().to_csv(csv_path, index=False)
+    first = load_course_rule_set(str(csv_path))
+
+    # Ordinals pickled on another term scale are recompiled, not reused
+    monkeypatch.setattr(course_rules, "_memory_cache", {})
+    monkeypatch.setitem(config.SEMESTER_OFFSETS, "FALL", 3)
+    second = load_course_rule_set(str(csv_path))
+    assert second is not first
+    assert second.target_rules != first.target_rules
+
+
+def test_engine_accepts_compiled_index():
+    rule_set = compile_course_rules(_config_df())
+    df = pd.DataFrame(
+        [(1, "Ann", "MATH101", "C", "2019", "Fall"), (2, "Ben", "MATH101", "C", "2017", "Fall")],
+        columns=["ID", "NAME", "Course", "Grade", "Year", "Semester"],
+    )
+    args = (rule_set.target_courses, rule_set.intensive_courses, rule_set.target_rules, rule_set.intensive_rules)
+
+    compiled = process_progress_report(df.copy(), *args, rule_index=rule_set.index)
+    legacy = process_progress_report(df.copy(), *args, engine="legacy")
+    pd.testing.assert_frame_equal(compiled[0], legacy[0])
+    assert list(compiled[0]["MATH101"]) == ["C | 0", "C | 3"]
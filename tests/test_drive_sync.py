@@ -0,0 +1,78 @@
+import sys
+import threading
+from pathlib import Path
+
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+import drive_sync  # noqa: E402
+from drive_sync import DELETE, UPLOAD, DriveSyncQueue  # noqa: E402
+
+
+class _Transfers:
+    def __init__(self, failures=0):
+        self.calls, self.failures = [], failures
+
+    def __call__(self, op, local_path, drive_name):
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("drive unavailable")
+        self.calls.append((op, Path(local_path).read_text() if op == UPLOAD else None, drive_name))
+
+
+def test_repeated_writes_coalesce(tmp_path):
+    transfers = _Transfers()
+    queue = DriveSyncQueue(str(tmp_path / "sync.db"), transfers, background=False)
+    local = tmp_path / "equivalent_courses.csv"
+
+    for text in ["v1", "v2", "v3"]:
+        local.write_text(text)
+        queue.enqueue(str(local), "configs/PBHL/equivalent_courses.csv")
+    queue.enqueue("", "configs/NURS/sce_fec_assignments.csv", DELETE)
+    assert [p.drive_name for p in queue.pending("configs/PBHL/")] == ["configs/PBHL/equivalent_courses.csv"]
+
+    assert queue.process_due() is None
+    assert transfers.calls == [
+        (UPLOAD, "v3", "configs/PBHL/equivalent_courses.csv"),
+        (DELETE, None, "configs/NURS/sce_fec_assignments.csv"),
+    ]
+    assert queue.pending() == []
+
+
+def test_failures_back_off_and_persist(tmp_path, monkeypatch):
+    db = str(tmp_path / "sync.db")
+    local = tmp_path / "courses_config.csv"
+    local.write_text("Course")
+    queue = DriveSyncQueue(db, _Transfers(failures=2), background=False)
+    queue.enqueue(str(local), "configs/PBHL/courses_config.csv")
+
+    assert queue.process_due() >= drive_sync.BACKOFF_BASE_SECONDS - 1
+    [entry] = queue.pending()
+    assert entry.attempts == 1 and "drive unavailable" in entry.last_error
+
+    # Nothing runs before the retry is due
+    assert queue.process_due() > 0 and queue.pending()[0].attempts == 1
+
+    # The queue survives a restart; due retries run until one succeeds
+    clock = [drive_sync.time.time()]
+    monkeypatch.setattr(drive_sync.time, "time", lambda: clock[0])
+    restarted = DriveSyncQueue(db, queue.transfer, background=False)
+    clock[0] += drive_sync.BACKOFF_BASE_SECONDS + 1
+    restarted.process_due()
+    assert restarted.pending()[0].attempts == 2
+    clock[0] += drive_sync.BACKOFF_BASE_SECONDS * 2 + 1
+    assert restarted.process_due() is None
+    assert restarted.transfer.calls == [(UPLOAD, "Course", "configs/PBHL/courses_config.csv")]
+
+
+def test_worker_thread_syncs_in_background(tmp_path):
+    done = threading.Event()
+
+    def transfer(op, local_path, drive_name):
+        done.set()
+
+    local = tmp_path / "a.csv"
+    local.write_text("x")
+    queue = DriveSyncQueue(str(tmp_path / "sync.db"), transfer)
+    queue.enqueue(str(local), "configs/PBHL/a.csv")
+    assert done.wait(5)
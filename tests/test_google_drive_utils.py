@@ -0,0 +1,235 @@
+import hashlib
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+from google.oauth2.credentials import Credentials
+
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+import google_drive_utils  # noqa: E402
+from google_drive_utils import (  # noqa: E402
+    DriveIndex,
+    delete_file,
+    find_file,
+    get_drive_service,
+    reset_drive_service,
+    sync_to_drive,
+)
+from storage import DriveBackend, fetch_artifact, prefetch_major  # noqa: E402
+
+
+@pytest.fixture
+def fake_auth(monkeypatch):
+    calls = []
+
+    def authenticate():
+        calls.append(1)
+        return Credentials("token", refresh_token="refresh", client_id="id", client_secret="secret",
+                           token_uri="https://oauth2.googleapis.com/token")
+
+    monkeypatch.setattr(google_drive_utils, "authenticate_google_drive", authenticate)
+    reset_drive_service()
+    yield calls
+    reset_drive_service()
+
+
+def test_service_is_built_once(fake_auth):
+    service = get_drive_service()
+    assert get_drive_service() is service
+    assert len(fake_auth) == 1
+
+    reset_drive_service()
+    assert get_drive_service() is not service
+    assert len(fake_auth) == 2
+
+
+def test_requests_use_a_connection_per_thread(fake_auth):
+    service = get_drive_service()
+    here = [service.files().list(q="x").http, service.files().get(fileId="1").http]
+
+    there = []
+    worker = threading.Thread(target=lambda: there.append(get_drive_service().files().list(q="x").http))
+    worker.start()
+    worker.join()
+
+    assert here[0] is here[1]
+    assert there[0] is not here[0]
+    assert there[0].credentials is here[0].credentials
+
+
+class _Call:
+    def __init__(self, result):
+        self.result = result
+
+    def execute(self):
+        return self.result
+
+
+class FakeDrive:
+    """In‐memory stand‐in for service.files() that counts list calls."""
+
+    def __init__(self, names=()):
+        self.items, self.lists = {}, 0
+        for name in names:
+            self._put(name)
+
+    def files(self):
+        return self
+
+    def _put(self, name, file_id=None):
+        file_id = file_id or f"id{len(self.items) + 1}"
+        version = getattr(self, "version", 0) + 1
+        self.version = version
+        self.items[file_id] = {
+            "id": file_id, "name": name, "md5Checksum": f"md5-{version}", "modifiedTime": f"t{version}"
+        }
+        return _Call(self.items[file_id])
+
+    def list(self, q, pageToken=None, pageSize=None, **kwargs):
+        self.lists += 1
+        prefix = q.split("'")[1]
+        matches = [f for f in self.items.values() if f["name"].startswith(prefix)]
+        start = int(pageToken or 0)
+        page = {"files": matches[start:start + 2]}
+        if start + 2 < len(matches):
+            page["nextPageToken"] = str(start + 2)
+        return _Call(page)
+
+    def create(self, body, media_body, fields):
+        return self._put(body["name"])
+
+    def update(self, fileId, media_body, fields):
+        return self._put(self.items[fileId]["name"], fileId)
+
+    def get_media(self, fileId):
+        self.downloads = getattr(self, "downloads", 0) + 1
+        return self.contents[fileId]
+
+    def delete(self, fileId):
+        del self.items[fileId]
+        return _Call(None)
+
+
+def test_index_lists_each_folder_once(tmp_path):
+    reset_drive_service()
+    drive = FakeDrive(["configs/PBHL/a.csv", "configs/PBHL/b.csv", "configs/PBHL/c.json", "configs/NURS/a.csv"])
+
+    assert find_file(drive, "configs/PBHL/a.csv").id == "id1"
+    assert find_file(drive, "configs/PBHL/c.json").md5 == "md5-3"
+    assert find_file(drive, "configs/PBHL/missing.csv") is None
+    assert drive.lists == 2  # one paged listing of configs/PBHL/
+
+    # Our own writes keep the index current without listing again
+    local = tmp_path / "a.csv"
+    local.write_text("x")
+    assert sync_to_drive(drive, str(local), "configs/PBHL/a.csv") == "updated"
+    assert sync_to_drive(drive, str(local), "configs/PBHL/new.csv") == "uploaded"
+    assert find_file(drive, "configs/PBHL/a.csv").md5 == "md5-5"
+    new = find_file(drive, "configs/PBHL/new.csv")
+    delete_file(drive, new.id)
+    assert find_file(drive, "configs/PBHL/new.csv") is None
+    assert drive.lists == 2
+
+    assert find_file(drive, "configs/NURS/a.csv").id == "id4"
+    assert drive.lists == 3
+    reset_drive_service()
+
+
+def test_index_expires():
+    drive = FakeDrive(["configs/PBHL/a.csv"])
+    index = DriveIndex("configs/PBHL/", ttl=0)
+    index.lookup(drive, "configs/PBHL/a.csv")
+    drive._put("configs/PBHL/b.csv")
+    assert index.lookup(drive, "configs/PBHL/b.csv").id == "id2"
+    assert drive.lists == 2
+
+
+class _FakeDownload:
+    def __init__(self, fh, content):
+        fh.write(content)
+
+    def next_chunk(self):
+        return None, True
+
+
+def test_fetch_skips_unchanged_files(tmp_path, monkeypatch):
+    reset_drive_service()
+    monkeypatch.setattr(google_drive_utils, "MediaIoBaseDownload", _FakeDownload)
+    drive = FakeDrive(["configs/PBHL/equivalent_courses.csv"])
+    drive.contents = {"id1": b"Course,Equivalent\n"}
+    local = tmp_path / "equivalent_courses.csv"
+
+    assert fetch_artifact("configs/PBHL/equivalent_courses.csv", str(local), DriveBackend(drive))
+    assert fetch_artifact("configs/PBHL/equivalent_courses.csv", str(local), DriveBackend(drive))
+    assert drive.downloads == 1 and local.read_bytes() == b"Course,Equivalent\n"
+
+    # A new version on Drive is downloaded
+    drive.update("id1", None, None)
+    drive.contents["id1"] = b"Course,Equivalent\nMATH101,MATH100\n"
+    reset_drive_service()
+    fetch_artifact("configs/PBHL/equivalent_courses.csv", str(local), DriveBackend(drive))
+    assert drive.downloads == 2 and b"MATH101" in local.read_bytes()
+
+    # So is a local copy that was changed since
+    local.write_bytes(b"edited")
+    fetch_artifact("configs/PBHL/equivalent_courses.csv", str(local), DriveBackend(drive))
+    assert drive.downloads == 3 and b"MATH101" in local.read_bytes()
+    reset_drive_service()
+
+
+def test_fetch_recognises_identical_local_copy(tmp_path, monkeypatch):
+    reset_drive_service()
+    monkeypatch.setattr(google_drive_utils, "MediaIoBaseDownload", _FakeDownload)
+    drive = FakeDrive(["configs/PBHL/a.csv"])
+    local = tmp_path / "a.csv"
+    local.write_bytes(b"same")
+    drive.items["id1"]["md5Checksum"] = hashlib.md5(b"same").hexdigest()
+
+    assert fetch_artifact("configs/PBHL/a.csv", str(local), DriveBackend(drive))
+    assert getattr(drive, "downloads", 0) == 0
+    reset_drive_service()
+
+
+def test_fetch_keeps_local_changes_queued_for_drive(tmp_path, monkeypatch):
+    import drive_sync
+
+    reset_drive_service()
+    monkeypatch.setattr(google_drive_utils, "MediaIoBaseDownload", _FakeDownload)
+    queue = drive_sync.DriveSyncQueue(str(tmp_path / "sync.db"), background=False)
+    monkeypatch.setattr(drive_sync, "_queue", queue)
+    drive = FakeDrive(["configs/PBHL/a.csv"])
+    drive.contents = {"id1": b"old"}
+    local = tmp_path / "a.csv"
+    local.write_bytes(b"new")
+
+    queue.enqueue(str(local), "configs/PBHL/a.csv")
+    assert fetch_artifact("configs/PBHL/a.csv", str(local), DriveBackend(drive))
+    assert local.read_bytes() == b"new" and getattr(drive, "downloads", 0) == 0
+
+    queue.enqueue("", "configs/PBHL/a.csv", drive_sync.DELETE)
+    assert not fetch_artifact("configs/PBHL/a.csv", str(local), DriveBackend(drive))
+    reset_drive_service()
+
+
+def test_prefetch_lands_a_majors_artifacts(tmp_path, monkeypatch):
+    reset_drive_service()
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(google_drive_utils, "MediaIoBaseDownload", _FakeDownload)
+    drive = FakeDrive(["configs/PBHL/progress_report.xlsx", "configs/PBHL/courses_config.csv",
+                       "configs/PBHL/assignment_types.json"])
+    drive.contents = {"id1": b"report", "id2": b"config", "id3": b"[]"}
+
+    backend = DriveBackend(drive)
+    fetched = [future.result() for future in prefetch_major("PBHL", backend)]
+    assert fetched == ["progress_report.xlsx", "courses_config.csv", None, "assignment_types.json", None]
+    assert (tmp_path / "configs/PBHL/progress_report.xlsx").read_bytes() == b"report"
+    assert (tmp_path / "configs/PBHL/assignment_types.json").read_bytes() == b"[]"
+    assert drive.lists == 2 and drive.downloads == 3  # one paged listing for every artifact
+
+    # A page fetching the same file afterwards finds it current
+    assert fetch_artifact("configs/PBHL/courses_config.csv", "configs/PBHL/courses_config.csv", backend)
+    assert drive.downloads == 3
+    reset_drive_service()
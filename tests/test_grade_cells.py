@@ -0,0 +1,74 @@
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from completion_utils import collapse_pass_fail_value  # noqa: E402
+from config import cell_color, extract_primary_grade_from_full_value  # noqa: E402
+from data_processing import build_progress_cells, calculate_credits_batch  # noqa: E402
+from grade_cells import (  # noqa: E402
+    CellStatus,
+    render_collapsed,
+    render_full,
+    render_primary,
+    status_styles,
+)
+
+
+@pytest.fixture
+def required_cells():
+    df = pd.DataFrame(
+        [
+            (1, "Ann", "MATH101", "F", "2018", "Fall"),
+            (1, "Ann", "MATH101", "B", "2019", "Fall"),
+            (1, "Ann", "PBHL201", None, "2020", "Fall"),
+            (1, "Ann", "SEMI100", "A", "2019", "Fall"),
+            (2, "Ben", "MATH101", "D", "2019", "Fall"),
+            (2, "Ben", "SEMI100", "F", "2019", "Fall"),
+        ],
+        columns=["ID", "NAME", "Course", "Grade", "Year", "Semester"],
+    )
+    courses = {"MATH101": 3, "PBHL201": 3, "SEMI100": 0, "ENGL201": 3}
+    rules = {
+        c: [{"Credits": v, "PassingGrades": "A,B,C", "FromOrd": float("-inf"), "ToOrd": float("inf")}]
+        for c, v in courses.items()
+    }
+    cells, *_ = build_progress_cells(df, courses, {}, rules, {})
+    return cells
+
+
+def test_status_matrix(required_cells):
+    status = pd.DataFrame(required_cells.status, columns=required_cells.courses)
+    assert list(status.loc[0]) == [CellStatus.PASSED, CellStatus.REGISTERED, CellStatus.PASSED, CellStatus.NOT_REGISTERED]
+    assert list(status.loc[1]) == [CellStatus.FAILED, CellStatus.NOT_REGISTERED, CellStatus.FAILED, CellStatus.NOT_REGISTERED]
+
+
+def test_renders_agree_with_string_helpers(required_cells):
+    full = render_full(required_cells)
+    primary = render_primary(required_cells)
+    collapsed = render_collapsed(required_cells)
+    styles = status_styles(required_cells)
+
+    assert full.loc[0, "MATH101"] == "F | 0, B | 3"
+    assert full.loc[1, "SEMI100"] == "F | FAIL"
+    assert full.loc[0, "ENGL201"] == "NR"
+    for course in required_cells.courses:
+        for row in full.index:
+            value = full.loc[row, course]
+            assert primary.loc[row, course] == extract_primary_grade_from_full_value(value)
+            assert styles.loc[row, course] == cell_color(value)
+            primary_collapsed = collapse_pass_fail_value(primary.loc[row, course])
+            assert collapsed.loc[row, course] == primary_collapsed
+
+
+def test_credits_from_status_matrix(required_cells):
+    courses = {"MATH101": 3, "PBHL201": 3, "SEMI100": 0, "ENGL201": 3}
+    full = render_full(required_cells)
+
+    from_status = calculate_credits_batch(full, courses, required_cells.status)
+    pd.testing.assert_frame_equal(from_status, calculate_credits_batch(full, courses))
+    assert list(from_status.loc[0]) == [3, 3, 3, 9]
@@ -0,0 +1,195 @@
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from config import sem_to_ord  # noqa: E402
+from data_processing import (  # noqa: E402
+    apply_report_schema,
+    assigned_course_mask,
+    calculate_credits,
+    calculate_credits_batch,
+    compile_rule_index,
+    process_progress_report,
+    select_rule,
+)
+
+
+def _rules(credits, passing="A+,A,A-,B+,B,B-,C+,C,C-"):
+    return [{"Credits": credits, "PassingGrades": passing, "FromOrd": float("-inf"), "ToOrd": float("inf")}]
+
+
+@pytest.fixture
+def report_inputs():
+    df = pd.DataFrame(
+        [
+            (1001, "Alice", "MATH101", "A", "2019", "Fall"),
+            (1001, "Alice", "MATH101", "F", "2018", "Spring"),
+            (1001, "Alice", "PBHL201", None, "2020", "Fall"),
+            (1001, "Alice", "ARTS100", "B", "2019", "Fall"),
+            (1001, "Alice", "MUSC100", "A", "2019", "Spring"),
+            (1002, "Bob", "MATH102", "C", "2019", "Fall"),
+            (1002, "Bob", "ENGL300", "P", "2019", "Fall"),
+            (1002, "Bob", "SPTH270", "F", "2020", "Spring"),
+            (1003, "Carol", "SEMI100", "D", "2021", "Fall"),
+        ],
+        columns=["ID", "NAME", "Course", "Grade", "Year", "Semester"],
+    )
+    target_courses = {"MATH101": 3, "PBHL201": 3, "SEMI100": 0, "S.C.E": 3}
+    intensive_courses = {"ENGL300": 0, "SPTH270": 3}
+    target_rules = {c: _rules(v) for c, v in target_courses.items()}
+    intensive_rules = {"ENGL300": _rules(0, "P"), "SPTH270": _rules(3)}
+    assignments = {"1001": {"S.C.E": "ARTS100", "_note": "approved"}}
+    equivalents = {"MATH102": "MATH101"}
+    return df, target_courses, intensive_courses, target_rules, intensive_rules, assignments, equivalents
+
+
+def test_vectorized_engine_matches_legacy(report_inputs):
+    df, *rest = report_inputs
+    legacy = process_progress_report(df.copy(), *rest, engine="legacy")
+    vectorized = process_progress_report(df.copy(), *rest, engine="vectorized")
+
+    for expected, actual in zip(legacy[:3], vectorized[:3]):
+        pd.testing.assert_frame_equal(expected, actual)
+    assert legacy[3] == vectorized[3]
+
+
+def test_engines_match_without_assignments(report_inputs):
+    df, target_courses, intensive_courses, target_rules, intensive_rules, _, equivalents = report_inputs
+    args = (target_courses, intensive_courses, target_rules, intensive_rules, None, equivalents)
+    legacy = process_progress_report(df.copy(), *args, engine="legacy")
+    vectorized = process_progress_report(df.copy(), *args)
+
+    pd.testing.assert_frame_equal(legacy[2], vectorized[2])
+
+
+def test_engines_match_on_schema_frames(report_inputs):
+    df, *rest = report_inputs
+    df = apply_report_schema(df)
+    legacy = process_progress_report(df.copy(), *rest, engine="legacy")
+    vectorized = process_progress_report(df.copy(), *rest)
+
+    for expected, actual in zip(legacy[:3], vectorized[:3]):
+        pd.testing.assert_frame_equal(expected, actual)
+    assert "TermOrd" not in vectorized[2].columns
+
+
+def test_vectorized_engine_values(report_inputs):
+    df, *rest = report_inputs
+    required, intensive, extras, extra_list = process_progress_report(df, *rest)
+
+    alice = required.set_index("ID").loc[1001]
+    # Attempts are listed chronologically, whatever the row order
+    assert alice["MATH101"] == "F | 0, A | 3"
+    assert alice["PBHL201"] == "CR | 3"
+    assert alice["S.C.E"] == "B | 3"
+    assert alice["SEMI100"] == "NR"
+    assert required.set_index("ID").loc[1002, "MATH101"] == "C | 3"
+    assert intensive.set_index("ID").loc[1002, "ENGL300"] == "P | PASS"
+    assert extra_list == ["MUSC100"]
+    assert list(extras["Course"]) == ["MUSC100"]
+
+
+@pytest.mark.parametrize("engine", ["legacy", "vectorized"])
+def test_output_does_not_depend_on_row_order(report_inputs, engine):
+    df, *rest = report_inputs
+    expected = process_progress_report(df.copy(), *rest, engine=engine)
+    shuffled = process_progress_report(df.sample(frac=1, random_state=7), *rest, engine=engine)
+
+    pd.testing.assert_frame_equal(expected[0], shuffled[0])
+    pd.testing.assert_frame_equal(expected[1], shuffled[1])
+
+
+def test_unknown_engine_raises(report_inputs):
+    df, *rest = report_inputs
+    with pytest.raises(ValueError):
+        process_progress_report(df, *rest, engine="spark")
+
+
+def _revised_rules():
+    return [
+        {"Credits": 3, "PassingGrades": "A,B,C,D", "FromOrd": sem_to_ord("", True), "ToOrd": sem_to_ord("SUMMER-2018", False)},
+        {"Credits": 3, "PassingGrades": "A,B", "FromOrd": sem_to_ord("FALL-2020", True), "ToOrd": sem_to_ord("", False)},
+    ]
+
+
+@pytest.mark.parametrize("engine", ["legacy", "vectorized"])
+def test_rules_resolve_by_term(engine):
+    df = pd.DataFrame(
+        [
+            (1, "Ann", "MATH101", "C", "2017", "Fall"),
+            (2, "Ben", "MATH101", "C", "2020", "Spring"),
+            (3, "Cy", "MATH101", "C", "2019", "Spring"),
+        ],
+        columns=["ID", "NAME", "Course", "Grade", "Year", "Semester"],
+    )
+    rules = {"MATH101": _revised_rules()}
+    required, *_ = process_progress_report(df, {"MATH101": 3}, {}, rules, {}, engine=engine)
+
+    values = required.set_index("ID")["MATH101"]
+    assert values[1] == "C | 3"
+    assert values[2] == "C | 0"
+    # Spring 2019 falls between the two ranges: the first rule applies
+    assert values[3] == "C | 3"
+
+
+def test_rule_index_agrees_with_select_rule():
+    rules = _revised_rules() + [
+        {"Credits": 4, "PassingGrades": "A", "FromOrd": sem_to_ord("FALL-2021", True), "ToOrd": sem_to_ord("FALL-2021", False)},
+    ]
+    index = compile_rule_index({"MATH101": rules}, {"ENGL300": rules[:1]})
+    terms = [float("nan")] + list(range(6040, 6080))
+    courses = ["MATH101"] * len(terms) + ["ENGL300", "OTHER"]
+    positions = index.resolve(pd.Series(courses), terms + [6060, 6060])
+
+    for course, term, pos in zip(courses, terms, positions):
+        assert index.rules[pos] is select_rule(rules, term)
+    assert index.rules[positions[-2]] is rules[0]
+    assert positions[-1] == -1
+
+
+def test_overlapping_rules_resolve_to_a_covering_rule():
+    base = {"Credits": 3, "PassingGrades": "A,B,C", "FromOrd": sem_to_ord("FALL-2010", True), "ToOrd": sem_to_ord("", False)}
+    revision = {"Credits": 3, "PassingGrades": "A", "FromOrd": sem_to_ord("FALL-2015", True), "ToOrd": sem_to_ord("SUMMER-2016", False)}
+    rules = [revision, base]
+    fall_2009, fall_2015, fall_2018 = (sem_to_ord(f"FALL-{year}", True) for year in (2009, 2015, 2018))
+
+    # The bounded revision has expired by Fall 2018, but the open‐ended base rule still covers it
+    assert select_rule(rules, fall_2018) is base
+    assert select_rule(rules, fall_2015) is revision
+    assert select_rule(rules, fall_2009) is revision  # covered by neither: rules_list[0]
+
+    index = compile_rule_index({"MATH101": rules}, {})
+    positions = index.resolve(pd.Series(["MATH101"] * 3), [fall_2018, fall_2015, fall_2009])
+    assert [index.rules[pos] for pos in positions] == [base, revision, revision]
+
+    df = pd.DataFrame([(1, "Ann", "MATH101", "C", "2018", "Fall")], columns=["ID", "NAME", "Course", "Grade", "Year", "Semester"])
+    for engine in ["legacy", "vectorized"]:
+        required, *_ = process_progress_report(df.copy(), {"MATH101": 3}, {}, {"MATH101": rules}, {}, engine=engine)
+        assert required.loc[0, "MATH101"] == "C | 3"
+
+
+def test_calculate_credits_batch_matches_row_wise(report_inputs):
+    df, target_courses, *rest = report_inputs
+    required, *_ = process_progress_report(df, target_courses, *rest)
+    required.loc[0, "MATH101"] = float("nan")
+    courses = dict(target_courses, ENGL999=3)
+
+    expected = required.apply(lambda r: calculate_credits(r, courses), axis=1)
+    pd.testing.assert_frame_equal(calculate_credits_batch(required, courses), expected)
+
+
+def test_assigned_course_mask(report_inputs):
+    df, *_ = report_inputs
+    assignments = {"1001": {"S.C.E": "ARTS100", "F.E.C": "MUSC100", "_note": "MATH101"}, 1002: {"S.C.E": "SPTH270"}}
+
+    mask = assigned_course_mask(df, assignments)
+    assert list(df.loc[mask, "Course"]) == ["ARTS100", "MUSC100", "SPTH270"]
+
+    only_fec = assigned_course_mask(df, assignments, ["F.E.C"])
+    assert list(df.loc[only_fec, "Course"]) == ["MUSC100"]
+    assert not assigned_course_mask(df, {}).any()
@@ -0,0 +1,103 @@
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from data_processing import apply_report_schema, merge_progress_delta  # noqa: E402
+from grade_cells import render_full  # noqa: E402
+from progress_snapshot import (  # noqa: E402
+    build_progress_snapshot,
+    update_snapshot_assignments,
+    update_snapshot_report,
+)
+
+
+def _rules(credits, passing="A+,A,A-,B+,B,B-,C+,C,C-"):
+    return [{"Credits": credits, "PassingGrades": passing, "FromOrd": float("-inf"), "ToOrd": float("inf")}]
+
+
+@pytest.fixture
+def report_inputs():
+    df = pd.DataFrame(
+        [
+            (1001, "Alice", "MATH101", "A", "2019", "Fall"),
+            (1001, "Alice", "ARTS100", "B", "2019", "Fall"),
+            (1001, "Alice", "MUSC100", "A", "2019", "Spring"),
+            (1002, "Bob", "MATH101", "C", "2019", "Fall"),
+            (1002, "Bob", "HIST210", "F", "2020", "Spring"),
+            (1003, "Carol", "SEMI100", "D", "2021", "Fall"),
+            (1003, "Carol", "ARTS100", "A-", "2021", "Fall"),
+        ],
+        columns=["ID", "NAME", "Course", "Grade", "Year", "Semester"],
+    )
+    target_courses = {"MATH101": 3, "SEMI100": 0, "S.C.E": 3}
+    intensive_courses = {"F.E.C": 3}
+    target_rules = {c: _rules(v) for c, v in target_courses.items()}
+    intensive_rules = {"F.E.C": _rules(3)}
+    return df, target_courses, intensive_courses, target_rules, intensive_rules
+
+
+def _assert_same(actual, expected):
+    pd.testing.assert_frame_equal(render_full(actual.required), render_full(expected.required))
+    pd.testing.assert_frame_equal(render_full(actual.intensive), render_full(expected.intensive))
+    pd.testing.assert_frame_equal(actual.extra_courses_df, expected.extra_courses_df)
+    assert actual.extra_courses_list == expected.extra_courses_list
+
+
+def test_update_matches_full_rebuild(report_inputs):
+    before = {"1001": {"S.C.E": "ARTS100"}, "1003": {"S.C.E": "ARTS100", "_note": "ok"}}
+    after = {
+        "1001": {"S.C.E": "MUSC100", "F.E.C": "ARTS100"},
+        "1002": {"F.E.C": "HIST210"},
+        "1003": {"S.C.E": "ARTS100"},
+    }
+    snapshot = build_progress_snapshot(*report_inputs, before)
+
+    updated = update_snapshot_assignments(snapshot, after)
+    _assert_same(updated, build_progress_snapshot(*report_inputs, after))
+    assert render_full(updated.intensive).set_index("ID").loc[1002, "F.E.C"] == "F | 0"
+
+    # Reverting restores the original tables
+    _assert_same(update_snapshot_assignments(updated, before), snapshot)
+
+
+def test_unchanged_assignments_reuse_snapshot(report_inputs):
+    snapshot = build_progress_snapshot(*report_inputs, {"1001": {"S.C.E": "ARTS100"}})
+
+    # Notes do not affect the tables
+    same = {"1001": {"S.C.E": "ARTS100", "_note": "checked"}}
+    assert update_snapshot_assignments(snapshot, same) is snapshot
+
+
+def test_depends_on(report_inputs):
+    df, target_courses, *rest = report_inputs
+    snapshot = build_progress_snapshot(df, target_courses, *rest)
+
+    assert snapshot.depends_on(df, target_courses, *rest)
+    assert not snapshot.depends_on(df.copy(), target_courses, *rest)
+    assert not snapshot.depends_on(df, target_courses, *rest, {"ARTS100": "MATH101"})
+
+
+def test_report_delta_matches_full_rebuild(report_inputs):
+    df, *rest = report_inputs
+    master = apply_report_schema(df)
+    delta = apply_report_schema(pd.DataFrame(
+        [
+            (1002, "Bob", "HIST210", "C", "2020", "Spring"),
+            (1004, "Dan", "MATH101", "B", "2022", "Fall"),
+        ],
+        columns=["ID", "NAME", "Course", "Grade", "Year", "Semester"],
+    ))
+    assignments = {"1002": {"F.E.C": "HIST210"}, "1003": {"S.C.E": "ARTS100"}}
+    snapshot = build_progress_snapshot(master, *rest, assignments)
+
+    merged, changed = merge_progress_delta(master, delta)
+    assert changed == {"1002", "1004"}
+
+    updated = update_snapshot_report(snapshot, merged, changed)
+    _assert_same(updated, build_progress_snapshot(merged, *rest, assignments))
+    assert render_full(updated.intensive).set_index("ID").loc["1002", "F.E.C"] == "C | 3"
@@ -0,0 +1,183 @@
+import os
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+import data_processing  # noqa: E402
+from config import sem_to_ord  # noqa: E402
+from data_processing import (  # noqa: E402
+    apply_report_schema,
+    frame_memory_usage,
+    load_progress_report,
+    load_report_snapshot,
+    merge_progress_delta,
+    read_progress_report,
+    save_report_snapshot,
+    transform_wide_format,
+)
+
+
+def _wide_sheet():
+    return pd.DataFrame({
+        "STUDENT ID": ["201701579", "201801669"],
+        "NAME": ["Alice", "Bob"],
+        "CURRICULUM": ["PUBHEA", "PUBHEA"],
+        "COURSE 1": ["PBHL201/FALL-2017/F", "MATH101/SPRING-2019/B+"],
+        "COURSE 2": ["INEG300/FALL-2018/P", "NULL"],
+        "COURSE 3": ["ARAB201/FALL-2019/", None],
+    })
+
+
+def _long_sheet():
+    return pd.DataFrame({
+        "Student ID": [1001, 1001, 1002],
+        "Name": ["Alice", "Alice", "Bob"],
+        "Notes": ["x", "y", "z"],
+        "Course": ["MATH101", "PBHL201", "MATH101"],
+        "Grade": ["A", None, "C"],
+        "Year": [2019, 2020, 2019],
+        "Semester": ["Fall", "Spring", "Fall"],
+    })
+
+
+@pytest.mark.parametrize("sheet", [_wide_sheet, _long_sheet])
+def test_streaming_matches_pandas_reader(tmp_path, sheet):
+    path = str(tmp_path / "report.xlsx")
+    sheet().to_excel(path, index=False)
+
+    streamed = read_progress_report(path)
+    full = read_progress_report(path, streaming=False)
+    pd.testing.assert_frame_equal(streamed.reset_index(drop=True), full.reset_index(drop=True))
+    assert list(streamed.columns) == ["ID", "NAME", "Course", "Grade", "Year", "Semester", "TermOrd"]
+
+    # Empty cells are NaN before the schema is applied too, as in pandas' reader
+    raw = data_processing._stream_xlsx_columns(path)[1]
+    expected = pd.read_excel(path)[raw.columns]
+    pd.testing.assert_frame_equal(raw, expected, check_dtype=False)
+    assert all(None not in raw[col].tolist() for col in raw.columns)
+
+
+def test_streaming_reads_progress_report_sheet(tmp_path):
+    path = str(tmp_path / "report.xlsx")
+    with pd.ExcelWriter(path) as writer:
+        _wide_sheet().to_excel(writer, sheet_name="Summary", index=False)
+        _long_sheet().to_excel(writer, sheet_name="Progress Report", index=False)
+
+    df = read_progress_report(path)
+    assert list(df["Course"]) == ["MATH101", "PBHL201", "MATH101"]
+
+
+def test_report_schema():
+    raw = pd.DataFrame({
+        "ID": [201701579.0, 201701579.0, 201801669.0],
+        "NAME": [" Alice", "Alice", "Bob"],
+        "Course": ["MATH101", "PBHL201 ", "MATH101"],
+        "Grade": ["A", None, "C"],
+        "Year": ["2019", 2020, "n/a"],
+        "Semester": ["FALL", "Spring", "Fall"],
+    })
+    df = apply_report_schema(raw)
+
+    assert list(df["ID"]) == ["201701579", "201701579", "201801669"]
+    assert list(df["NAME"].cat.categories) == ["Alice", "Bob"]
+    assert list(df["Course"]) == ["MATH101", "PBHL201", "MATH101"]
+    assert df["Grade"].isna().tolist() == [False, True, False]
+    assert list(df["Semester"]) == ["Fall", "Spring", "Fall"]
+    assert df["Year"].dtype == "Int16" and df["Year"].isna().tolist() == [False, False, True]
+    assert df["TermOrd"].tolist()[:2] == [sem_to_ord("FALL-2019", True), sem_to_ord("SPRING-2020", True)]
+    assert frame_memory_usage(df)["Total"] == df.memory_usage(deep=True).sum()
+
+
+def test_parse_cache_keyed_by_file_bytes(tmp_path, monkeypatch):
+    path = str(tmp_path / "report.xlsx")
+    _wide_sheet().to_excel(path, index=False)
+
+    parsed = load_progress_report(path)
+    [cached] = tmp_path.glob(".progress_report-*.parquet")
+
+    # Same bytes: the Parquet file is read, the spreadsheet is not parsed
+    monkeypatch.setattr(data_processing, "read_progress_report", None)
+    pd.testing.assert_frame_equal(load_progress_report(path), parsed)
+
+    # New bytes (e.g. a term update) are cached alongside; the full report's parse stays
+    monkeypatch.undo()
+    _long_sheet().to_excel(path, index=False)
+    assert list(load_progress_report(path)["NAME"]) == ["Alice", "Alice", "Bob"]
+    assert cached.exists()
+    assert len(list(tmp_path.glob(".progress_report-*.parquet"))) == 2
+
+
+def test_parse_cache_evicts_least_recently_used(tmp_path, monkeypatch):
+    monkeypatch.setattr(data_processing, "PARSE_CACHE_ENTRIES", 2)
+    paths = []
+    for i in range(3):
+        path = tmp_path / f"report{i}.csv"
+        _long_sheet().assign(Notes=str(i)).to_csv(path, index=False)
+        paths.append(str(path))
+
+    load_progress_report(paths[0])
+    load_progress_report(paths[1])
+    for age, path in enumerate(paths[:2]):
+        [entry] = tmp_path.glob(f".progress_report-*{data_processing.file_sha256(path)}.parquet")
+        os.utime(entry, (1e9 + age, 1e9 + age))
+    load_progress_report(paths[0])  # a hit makes it the most recently used again
+    load_progress_report(paths[2])
+
+    cached = {p.name.rsplit("-", 1)[1][:-len(".parquet")] for p in tmp_path.glob(".progress_report-*.parquet")}
+    assert cached == {data_processing.file_sha256(paths[0]), data_processing.file_sha256(paths[2])}
+
+
+def test_wide_format_reports_malformed_cells():
+    sheet = _wide_sheet()
+    sheet.loc[1, "COURSE 2"] = " "
+    sheet.loc[1, "COURSE 3"] = "MATH102-FALL-2019-A"
+    sheet.loc[0, "COURSE 2"] = "INEG300/FALL2018/P"
+
+    long_df, malformed = transform_wide_format(sheet, return_malformed=True)
+    assert list(long_df["Course"]) == ["PBHL201", "MATH101", "ARAB201"]
+    assert list(long_df["Grade"]) == ["F", "B+", ""]
+    assert malformed[["Row", "Column", "Value"]].values.tolist() == [
+        [0, "COURSE 2", "INEG300/FALL2018/P"],
+        [1, "COURSE 3", "MATH102-FALL-2019-A"],
+    ]
+    assert list(malformed["ID"]) == ["201701579", "201801669"]
+
+
+def test_merge_progress_delta_upserts_by_term_key():
+    master = apply_report_schema(_long_sheet().rename(columns={"Student ID": "ID", "Name": "NAME"}))
+    delta = apply_report_schema(pd.DataFrame({
+        "ID": [1001, 1001, 1002, 1003],
+        "NAME": ["Alice", "Alice", "Bob", "Carol"],
+        "Course": ["MATH101", "PBHL201", "MATH101", "MATH101"],
+        "Grade": ["A", "B", "C", "D"],
+        "Year": [2019, 2020, 2019, 2021],
+        "Semester": ["Fall", "Spring", "Fall", "Fall"],
+    }))
+
+    merged, changed = merge_progress_delta(master, delta)
+    # Alice's PBHL201 grade is new, Bob's row is unchanged and Carol is a new student
+    assert changed == {"1001", "1003"}
+    assert len(merged) == 4 and merged.index.is_unique
+    assert list(map(str, merged.dtypes)) == list(map(str, master.dtypes))
+    assert merged.set_index(["ID", "Course"])["Grade"].to_dict() == {
+        ("1001", "MATH101"): "A", ("1001", "PBHL201"): "B", ("1002", "MATH101"): "C", ("1003", "MATH101"): "D",
+    }
+
+
+def test_report_snapshot_round_trip(tmp_path, monkeypatch):
+    df = apply_report_schema(_long_sheet().rename(columns={"Student ID": "ID", "Name": "NAME"}))
+    path = str(tmp_path / "progress_report.parquet")
+    save_report_snapshot(df, path)
+    pd.testing.assert_frame_equal(load_report_snapshot(path), df)
+
+    # A snapshot from another parser version, or a damaged one, is not used
+    monkeypatch.setattr(data_processing, "_PARSE_CACHE_VERSION", data_processing._PARSE_CACHE_VERSION + 1)
+    assert load_report_snapshot(path) is None
+    monkeypatch.undo()
+    (tmp_path / "progress_report.parquet").write_bytes(b"not parquet")
+    assert load_report_snapshot(path) is None
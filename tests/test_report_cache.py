@@ -0,0 +1,57 @@
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from report_cache import ReportCache, frame_fingerprint, report_key, value_fingerprint  # noqa: E402
+
+
+def _df():
+    return pd.DataFrame(
+        [(1001, "Alice", "MATH101", "A", "2019", "Fall"), (1002, "Bob", "MATH101", "C", "2019", "Fall")],
+        columns=["ID", "NAME", "Course", "Grade", "Year", "Semester"],
+    )
+
+
+def test_frame_fingerprint_follows_content():
+    df = _df()
+    assert frame_fingerprint(df) == frame_fingerprint(df.copy())
+
+    changed = df.copy()
+    changed.loc[1, "Grade"] = "B"
+    assert frame_fingerprint(changed) != frame_fingerprint(df)
+    assert frame_fingerprint(df.rename(columns={"Grade": "GRADE"})) != frame_fingerprint(df)
+
+
+def test_value_fingerprint_ignores_key_order():
+    rules = {"Credits": 3, "FromOrd": float("-inf"), "ToOrd": float("inf")}
+    assert value_fingerprint({"a": rules, "b": {}}) == value_fingerprint({"b": {}, "a": dict(reversed(rules.items()))})
+    assert value_fingerprint({"1001": {"S.C.E": "ARTS100"}}) != value_fingerprint({"1001": {"F.E.C": "ARTS100"}})
+
+
+def test_report_key_changes_with_assignments():
+    df = _df()
+    key = report_key(df, "rules", {}, {"1001": {"S.C.E": "ARTS100"}}, ["S.C.E", "F.E.C"])
+
+    assert key == report_key(df.copy(), "rules", None, {"1001": {"S.C.E": "ARTS100"}}, ("S.C.E", "F.E.C"))
+    assert key != report_key(df, "rules", {}, {}, ["S.C.E", "F.E.C"])
+
+
+def test_lru_per_major():
+    cache = ReportCache(max_entries_per_major=2)
+    cache.put("PBHL", "k1", "t1")
+    cache.put("PBHL", "k2", "t2")
+    cache.put("SPTH", "k1", "s1")
+
+    assert cache.get("PBHL", "k1") == "t1"   # k2 is now least recently used
+    cache.put("PBHL", "k3", "t3")
+    assert cache.get("PBHL", "k2") is None
+    assert cache.get("PBHL", "k1") == "t1"
+    assert cache.get("SPTH", "k1") == "s1"
+    assert len(cache) == 3
+
+    cache.clear("PBHL")
+    assert len(cache) == 1
@@ -0,0 +1,125 @@
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+import storage  # noqa: E402
+from drive_sync import DELETE, UPLOAD, DriveSyncQueue, storage_transfer  # noqa: E402
+from storage import LocalBackend, StorageBackend, StorageError, fetch_artifact, get_storage  # noqa: E402
+
+
+def test_backends_implement_every_operation():
+    class Partial(StorageBackend):
+        def find(self, name):
+            return None
+
+    with pytest.raises(TypeError):
+        Partial()
+
+
+def test_local_backend_round_trip(tmp_path):
+    backend = LocalBackend(str(tmp_path / "store"))
+    local = tmp_path / "courses_config.csv"
+    local.write_text("Course,Credits\n")
+
+    assert backend.find("configs/PBHL/courses_config.csv") is None
+    assert backend.upload(str(local), "configs/PBHL/courses_config.csv") == "uploaded"
+    assert backend.upload(str(local), "configs/PBHL/courses_config.csv") == "updated"
+    assert (tmp_path / "store/configs/PBHL/courses_config.csv").read_text() == "Course,Credits\n"
+
+    copy = tmp_path / "copy.csv"
+    assert backend.download("configs/PBHL/courses_config.csv", str(copy))
+    assert copy.read_text() == "Course,Credits\n"
+    assert not backend.download("configs/PBHL/missing.csv", str(tmp_path / "missing.csv"))
+
+    assert backend.delete("configs/PBHL/courses_config.csv")
+    assert not backend.delete("configs/PBHL/courses_config.csv")
+    assert backend.calls == {"find": 1, "upload": 2, "download": 2, "delete": 2}
+
+
+def test_local_backend_skips_current_copies(tmp_path):
+    backend = LocalBackend(str(tmp_path / "store"))
+    source = tmp_path / "a.csv"
+    source.write_text("v1")
+    backend.upload(str(source), "configs/PBHL/a.csv")
+
+    local = tmp_path / "local.csv"
+    backend.download("configs/PBHL/a.csv", str(local))
+    copied = local.stat().st_mtime_ns
+    time.sleep(0.01)
+    backend.download("configs/PBHL/a.csv", str(local))
+    assert local.stat().st_mtime_ns == copied
+
+    source.write_text("v2")
+    backend.upload(str(source), "configs/PBHL/a.csv")
+    backend.download("configs/PBHL/a.csv", str(local))
+    assert local.read_text() == "v2"
+
+
+def test_injected_latency_and_failures(tmp_path):
+    slow = LocalBackend(str(tmp_path), latency=0.05)
+    start = time.perf_counter()
+    slow.find("configs/PBHL/a.csv")
+    assert time.perf_counter() - start >= 0.05
+
+    failing = LocalBackend(str(tmp_path), failure_rate=1.0)
+    with pytest.raises(StorageError):
+        failing.find("configs/PBHL/a.csv")
+
+    flaky = LocalBackend(str(tmp_path), failure_rate=0.5, seed=1)
+    outcomes = []
+    for _ in range(40):
+        try:
+            flaky.find("configs/PBHL/a.csv")
+            outcomes.append(True)
+        except StorageError:
+            outcomes.append(False)
+    assert 0 < outcomes.count(False) < 40
+
+
+def test_sync_queue_and_fetch_through_configured_backend(tmp_path, monkeypatch):
+    monkeypatch.setenv("STORAGE_DIR", str(tmp_path / "store"))
+    monkeypatch.setattr(storage, "_backend", None)
+    backend = get_storage()
+    assert isinstance(backend, LocalBackend)
+
+    queue = DriveSyncQueue(str(tmp_path / "sync.db"), storage_transfer, background=False)
+    local = tmp_path / "a.csv"
+    local.write_text("saved")
+    queue.enqueue(str(local), "configs/PBHL/a.csv", UPLOAD)
+    queue.process_due()
+    assert (tmp_path / "store/configs/PBHL/a.csv").read_text() == "saved"
+
+    assert fetch_artifact("configs/PBHL/a.csv", str(tmp_path / "fetched.csv"))
+    assert (tmp_path / "fetched.csv").read_text() == "saved"
+
+    queue.enqueue("", "configs/PBHL/a.csv", DELETE)
+    queue.process_due()
+    assert backend.find("configs/PBHL/a.csv") is None
+    monkeypatch.setattr(storage, "_backend", None)
+
+
+def test_prefetch_falls_back_past_failed_alternatives(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    backend = LocalBackend(str(tmp_path / "store"))
+    report = tmp_path / "report.xlsx"
+    report.write_bytes(b"report")
+    backend.upload(str(report), "configs/PBHL/progress_report.xlsx")
+
+    download = backend.download
+
+    def flaky_download(name, local_path):
+        if name.endswith((".parquet", "courses_config.csv")):
+            raise StorageError(f"Injected failure: download {name}")
+        return download(name, local_path)
+
+    monkeypatch.setattr(backend, "download", flaky_download)
+    futures = storage.prefetch_major("PBHL", backend)
+    assert futures[0].result() == "progress_report.xlsx"
+    with pytest.raises(StorageError):
+        futures[1].result()
+    assert futures[2].result() is None
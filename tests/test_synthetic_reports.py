@@ -0,0 +1,40 @@
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+sys.path.append(str(Path(__file__).resolve().parents[1] / "benchmarks"))
+
+from data_processing import process_progress_report, transform_wide_format  # noqa: E402
+from synthetic import SyntheticConfig, generate_long, generate_rules, to_wide  # noqa: E402
+
+
+def test_wide_sheet_round_trips():
+    cfg = SyntheticConfig(students=40, courses=12, attempts_per_student=6)
+    long_df = generate_long(cfg)
+
+    parsed = transform_wide_format(to_wide(long_df))
+    key = ["ID", "Course", "Year", "Semester", "Grade"]
+    expected = long_df.drop_duplicates().sort_values(key, ignore_index=True)
+    pd.testing.assert_frame_equal(
+        parsed.sort_values(key, ignore_index=True), expected, check_dtype=False
+    )
+
+
+def test_rules_cover_every_term():
+    cfg = SyntheticConfig(students=30, courses=12, rule_ranges=3)
+    target_courses, intensive_courses, target_rules, intensive_rules = generate_rules(cfg)
+
+    assert set(target_rules) == set(target_courses) and set(intensive_rules) == set(intensive_courses)
+    for rules in {**target_rules, **intensive_rules}.values():
+        assert len(rules) == 3
+        assert rules[0]["FromOrd"] == float("-inf") and rules[-1]["ToOrd"] == float("inf")
+        for earlier, later in zip(rules, rules[1:]):
+            assert later["FromOrd"] == earlier["ToOrd"] + 1
+
+    required, *_ = process_progress_report(
+        generate_long(cfg), target_courses, intensive_courses, target_rules, intensive_rules
+    )
+    assert len(required) == cfg.students
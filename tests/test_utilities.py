@@ -0,0 +1,49 @@
+import hashlib
+import io
+import os
+import sys
+from pathlib import Path
+
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from utilities import file_sha256, store_upload  # noqa: E402
+
+
+class _Upload(io.BytesIO):
+    """Stands in for Streamlit's UploadedFile (a BytesIO with a name)."""
+
+    def __init__(self, data: bytes, name: str):
+        super().__init__(data)
+        self.name = name
+
+
+def test_store_upload_is_content_addressed(tmp_path):
+    data = os.urandom(3 << 20)
+    path, sha = store_upload(_Upload(data, "Report.XLSX"), str(tmp_path))
+
+    assert sha == hashlib.sha256(data).hexdigest() == file_sha256(path)
+    assert os.path.basename(path) == f"{sha}.xlsx"
+
+    # The same bytes under another name land on the same file
+    again, _ = store_upload(_Upload(data, "copy.xlsx"), str(tmp_path))
+    assert again == path
+    assert sorted(os.listdir(tmp_path)) == [f"{sha}.xlsx"]
+
+
+def test_store_upload_keeps_recent_files(tmp_path):
+    paths = [store_upload(_Upload(bytes([i]), "r.csv"), str(tmp_path))[0] for i in range(3)]
+    for age, path in enumerate(reversed(paths), start=1):
+        os.utime(path, (1e9 - age, 1e9 - age))
+    latest, _ = store_upload(_Upload(b"new", "r.csv"), str(tmp_path), keep=2)
+
+    assert sorted(os.listdir(tmp_path)) == sorted(os.path.basename(p) for p in (paths[2], latest))
+
+
+def test_store_upload_keeps_pinned_files(tmp_path):
+    paths = [store_upload(_Upload(bytes([i]), "r.csv"), str(tmp_path))[0] for i in range(3)]
+    for age, path in enumerate(reversed(paths), start=1):
+        os.utime(path, (1e9 - age, 1e9 - age))
+    latest, _ = store_upload(_Upload(b"new", "r.csv"), str(tmp_path), keep=1, pinned=[paths[0]])
+
+    assert sorted(os.listdir(tmp_path)) == sorted(os.path.basename(p) for p in (paths[0], latest))
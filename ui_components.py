@@ -1,6 +1,8 @@
+import os
 import streamlit as st
 import pandas as pd
 from config import get_allowed_assignment_types
+from drive_sync import sync_queue
 
 def _active_assignment_types():
     """
@@ -14,6 +16,21 @@ def _active_assignment_types():
     # Fallback to global/default
     return [str(x) for x in get_allowed_assignment_types()]
 
+def show_sync_status(major: str):
+    """Sidebar note on this Major's changes still waiting to reach Google Drive (see drive_sync)."""
+    pending = sync_queue().pending(f"configs/{major}/")
+    with st.sidebar:
+        if not pending:
+            st.caption("Google Drive: all changes synced.")
+            return
+        st.caption(f"Google Drive: {len(pending)} change(s) waiting to sync.")
+        for entry in pending:
+            if entry.last_error:
+                st.caption(
+                    f"⚠ {os.path.basename(entry.drive_name)}: {entry.last_error} "
+                    f"(retrying, attempt {entry.attempts + 1})"
+                )
+
 def display_dataframes(styled_df, intensive_styled_df, extra_courses_df, raw_df):
     tab1, tab2, tab3 = st.tabs(["Required Courses", "Intensive Courses", "Extra Courses"])
     with tab1:
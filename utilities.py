@@ -1,5 +1,6 @@
 # utilities.py
 
+import hashlib
 import pandas as pd
 import os
 import streamlit as st
@@ -13,6 +14,51 @@ def save_uploaded_file(uploaded_file, folder='uploads'):
         f.write(uploaded_file.getbuffer())
     return filepath
 
+def store_upload(uploaded_file, folder: str, keep: int = 5, pinned=()):
+    """
+    Writes an uploaded file into a content‐addressed store, hashing the bytes as they are
+    written: the file ends up as `<folder>/<sha256>.<ext>`, and bytes already in the store
+    are not stored twice. Only the `keep` most recently stored files are kept, plus any
+    in `pinned` (e.g. files still queued for Drive sync).
+    Returns (path, sha256).
+    """
+    os.makedirs(folder, exist_ok=True)
+    ext = os.path.splitext(uploaded_file.name)[1].lower()
+    digest = hashlib.sha256()
+    buffer = uploaded_file.getbuffer()
+    partial = os.path.join(folder, f".upload-{os.getpid()}.tmp")
+    with open(partial, "wb") as f:
+        for start in range(0, len(buffer), 1 << 20):
+            chunk = buffer[start:start + (1 << 20)]
+            digest.update(chunk)
+            f.write(chunk)
+    sha = digest.hexdigest()
+    path = os.path.join(folder, f"{sha}{ext}")
+    if os.path.exists(path):
+        os.remove(partial)
+        os.utime(path)
+    else:
+        os.replace(partial, path)
+
+    stored = sorted(
+        (entry.path for entry in os.scandir(folder) if entry.is_file() and not entry.name.startswith(".")),
+        key=os.path.getmtime,
+        reverse=True
+    )
+    pinned = {os.path.abspath(p) for p in pinned}
+    for old in stored[keep:]:
+        if os.path.abspath(old) not in pinned:
+            os.remove(old)
+    return path, sha
+
+def file_sha256(path: str) -> str:
+    """Hex SHA‐256 of a file's bytes."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
 def load_csv(filepath):
     try:
         return pd.read_csv(filepath)